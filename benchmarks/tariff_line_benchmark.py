@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关税清单生成引擎的基准测试
+对比 tariff_line_engine 与逐行循环参考实现（random 逐位生成编码、逐行拼接描述、逐行追加字典后构造DataFrame，
+即引入引擎之前爬虫的做法）生成美国和中国关税清单的耗时。
+参考实现使用的轮次、HS章节编码、类别和描述模板在引擎版本运行一次时记录，两边生成的清单规模和内容构成相同。
+只计生成时间：参考实现不写文件，引擎以只计数的写出器代替 TableWriter。
+大规模（scale > 1）时参考实现重复运行 round(scale) 次，行数与引擎的一次运行相同。
+
+用法：python benchmarks/tariff_line_benchmark.py [--scale 1 90] [--repeat 10]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+CRAWLER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'code', 'crawlers')
+if CRAWLER_DIR not in sys.path:
+    sys.path.insert(0, CRAWLER_DIR)
+
+import china_tariff_crawler  # noqa: E402
+import tariff_line_engine  # noqa: E402
+import us_tariff_crawler  # noqa: E402
+from tariff_line_engine import CATEGORY, SUFFIX  # noqa: E402
+
+# 默认规模下每次参考实现运行之后引擎的运行次数
+ENGINE_RUNS = 5
+
+# 中国第5和第6轮清单的说明（与 china_tariff_crawler 相同）
+CHINA_ROUND_NOTES = {
+    5: '针对美国加征关税升级的反制措施',
+    6: '针对美国新一轮加征关税的对等反制措施'
+}
+
+class CountingWriter:
+    """代替 TableWriter：只累计行数，不写文件"""
+
+    def __init__(self, save_dir, artifact, **kwargs):
+        self.path = os.path.join(save_dir, artifact)
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, df):
+        self.rows += len(df)
+
+@contextlib.contextmanager
+def generation_only():
+    """屏蔽写出和进度输出：引擎使用 CountingWriter"""
+    writer = tariff_line_engine.TableWriter
+    tariff_line_engine.TableWriter = CountingWriter
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        tariff_line_engine.TableWriter = writer
+
+def record_tables(module, generate):
+    """
+    运行一次引擎版本的爬虫，记录各轮的轮次信息以及传给 sample_tariff_lines 的
+    HS章节编码、编码后缀位数、类别名称和描述模板
+
+    Returns
+    -------
+    list of tuple
+        每轮一项：(轮次信息 dict, 商品数量, sample_tariff_lines 的参数 dict)
+    """
+    rounds, calls = [], []
+    write_tariff_lines, sample_tariff_lines = module.write_tariff_lines, module.sample_tariff_lines
+
+    def record_rounds(save_dir, artifact, round_sizes, *args, **kwargs):
+        rounds.extend(round_sizes)
+        return write_tariff_lines(save_dir, artifact, round_sizes, *args, **kwargs)
+
+    def record_call(rng, prefixes, size, suffix_digits, category_names, templates, default_template):
+        calls.append({'prefixes': list(prefixes), 'suffix_digits': suffix_digits, 'category_names': category_names,
+                      'templates': templates, 'default_template': default_template})
+        return sample_tariff_lines(rng, prefixes, size, suffix_digits, category_names, templates, default_template)
+
+    module.write_tariff_lines, module.sample_tariff_lines = record_rounds, record_call
+    try:
+        with generation_only():
+            generate(with_summary=False, seed=0)
+    finally:
+        module.write_tariff_lines, module.sample_tariff_lines = write_tariff_lines, sample_tariff_lines
+    return [(round_info, size, call) for (round_info, size), call in zip(rounds, calls)]
+
+def reference_line(prefixes, suffix_digits, category_names, templates, default_template):
+    """逐行循环的参考实现：生成一行的 (HS编码, 商品描述, 商品类别)"""
+    hs_prefix = random.choice(prefixes)
+    category = category_names[hs_prefix]
+    hs_suffix = ''.join([str(random.randint(0, 9)) for _ in range(suffix_digits)])
+
+    parts = []
+    for part in templates.get(hs_prefix, default_template):
+        if part is CATEGORY:
+            parts.append(category)
+        elif part is SUFFIX:
+            parts.append(hs_suffix)
+        elif isinstance(part, range):
+            parts.append(str(random.randint(part.start, part.stop - 1)))
+        elif isinstance(part, str):
+            parts.append(part)
+        else:
+            parts.append(random.choice(part))
+    return f"{hs_prefix}{hs_suffix}", ''.join(parts), category
+
+def reference_us(tables):
+    """美国对华关税清单的逐行循环参考实现"""
+    all_tariff_items = []
+    for round_info, size, call in tables:
+        for _ in range(size):
+            hs_code, description, category = reference_line(**call)
+            tariff_item = {
+                'round': round_info['round'],
+                'hs_code': hs_code,
+                'product_description': description,
+                'category': category,
+                'implementation_date': round_info['date'],
+                'initial_tariff_rate': round_info.get('initial_rate', round_info['rate']),
+                'current_tariff_rate': round_info['rate'],
+                'annual_trade_value_millions': round(random.uniform(0.1, 100.0), 2)
+            }
+            if 'escalation_date' in round_info:
+                tariff_item['tariff_escalation_date'] = round_info['escalation_date']
+            all_tariff_items.append(tariff_item)
+    return pd.DataFrame(all_tariff_items)
+
+def reference_china(tables):
+    """中国对美反制关税清单的逐行循环参考实现"""
+    all_tariff_items = []
+    for round_info, size, call in tables:
+        tariff_rates = round_info['rate'] if isinstance(round_info['rate'], list) else [round_info['rate']]
+        for _ in range(size):
+            hs_code, description, category = reference_line(**call)
+            tariff_rate = random.choice(tariff_rates)
+            mfn_rate = round(random.uniform(2.0, 10.0), 1)
+            tariff_item = {
+                'round': round_info['round'],
+                'hs_code': hs_code,
+                'product_description': description,
+                'category': category,
+                'implementation_date': round_info['date'],
+                'mfn_tariff_rate': mfn_rate,
+                'additional_tariff_rate': tariff_rate,
+                'total_tariff_rate': mfn_rate + tariff_rate,
+                'annual_import_value_millions': round(random.uniform(0.1, 200.0), 2)
+            }
+            if round_info['round'] in CHINA_ROUND_NOTES:
+                tariff_item['note'] = CHINA_ROUND_NOTES[round_info['round']]
+            all_tariff_items.append(tariff_item)
+    return pd.DataFrame(all_tariff_items)
+
+# 名称 -> (爬虫模块, 引擎版本的生成函数, 参考实现)
+CRAWLERS = {
+    'us': (us_tariff_crawler, us_tariff_crawler.generate_us_tariff_data, reference_us),
+    'china': (china_tariff_crawler, china_tariff_crawler.generate_china_tariff_data, reference_china),
+}
+
+def timed(func):
+    """运行一次，返回耗时（秒）和结果"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def run_benchmark(scales=(1,), repeat=10, seed=0):
+    """
+    运行基准测试
+
+    Parameters
+    ----------
+    scales : sequence of float
+        清单规模（相对默认各轮商品数量的倍数）
+    repeat : int
+        默认规模下的重复次数（取最短耗时）；大规模时各运行1次
+    seed : int
+        引擎和参考实现的随机种子
+
+    Returns
+    -------
+    pandas.DataFrame
+        每个爬虫和规模一行：行数、参考实现和引擎耗时（毫秒）、加速比
+    """
+    random.seed(seed)
+    tables = {name: record_tables(module, engine) for name, (module, engine, _) in CRAWLERS.items()}
+    results = []
+    with generation_only():
+        for scale in scales:
+            runs = max(1, round(scale))
+            for name, (_, engine, reference) in CRAWLERS.items():
+                # 参考实现和引擎交替运行，各取最短耗时，减少机器负载波动的影响；
+                # 引擎耗时短，每次参考实现之后运行 ENGINE_RUNS 次
+                old = new = float('inf')
+                for _ in range(repeat if runs == 1 else 1):
+                    old = min(old, timed(lambda: [reference(tables[name]) for _ in range(runs)])[0])
+                    for _ in range(ENGINE_RUNS if runs == 1 else 1):
+                        elapsed, writer = timed(lambda: engine(with_summary=False, seed=seed, scale=scale))
+                        new = min(new, elapsed)
+                results.append({
+                    'crawler': name,
+                    'scale': scale,
+                    'rows': writer.rows,
+                    'reference_ms': old * 1e3,
+                    'engine_ms': new * 1e3,
+                    'speedup': old / new,
+                })
+    return pd.DataFrame(results)
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='关税清单生成引擎与逐行循环参考实现的耗时对比')
+    parser.add_argument('--scale', type=float, nargs='+', default=[1, 90],
+                        help='清单规模倍数（默认 1 和 90，90倍时每份清单超过100万行）')
+    parser.add_argument('--repeat', type=int, default=10, help='默认规模下的重复次数（默认 10，取最短耗时）')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.scale, args.repeat)
+    print(results.to_string(index=False, float_format=lambda value: f'{value:.1f}'))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分析模块的数据读取
+复用数据生成管道的存储层（data_store）和空间权重（spatial_weights），
+从 data/raw 读取区域面板数据和空间权重矩阵，并按权重矩阵的区域顺序对齐
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RAW_DIR = os.path.join(BASE_DIR, 'data', 'raw')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+CRAWLER_DIR = os.path.join(BASE_DIR, 'code', 'crawlers')
+if CRAWLER_DIR not in sys.path:
+    sys.path.insert(0, CRAWLER_DIR)
+
+from data_store import find_artifact, load_grouped_table, load_table  # noqa: E402
+from spatial_weights import SpatialWeights  # noqa: E402
+
+# 关税战开始年份（关税战后期虚拟变量 tariff_war = year >= 2018）
+TARIFF_WAR_START_YEAR = 2018
+
+def load_regional_panel(data_dir=RAW_DIR, years=None):
+    """
+    读取区域经济面板数据
+
+    Parameters
+    ----------
+    data_dir : str, optional
+        数据目录
+    years : sequence of int, optional
+        只保留这些年份
+
+    Returns
+    -------
+    pandas.DataFrame
+        regional_economic_data 各列，另加关税战后期虚拟变量 tariff_war
+    """
+    panel = load_table(data_dir, 'regional_economic_data.csv')
+    if years is not None:
+        panel = panel[panel['year'].isin(list(years))]
+    panel = panel.assign(tariff_war=(panel['year'] >= TARIFF_WAR_START_YEAR).astype(int))
+    return panel.reset_index(drop=True)
+
+def load_tariff_rates(data_dir=RAW_DIR):
+    """
+    各年的贸易加权平均关税税率
+
+    由 us_tariff_impact_by_category 和 china_tariff_impact_by_category 按各类别贸易额加权平均
+
+    Parameters
+    ----------
+    data_dir : str, optional
+        数据目录
+
+    Returns
+    -------
+    pandas.DataFrame
+        year、us_tariff_rate（美国对华）、china_tariff_rate（中国对美）列
+    """
+    rates = None
+    for artifact, column in (('us_tariff_impact_by_category.csv', 'us_tariff_rate'),
+                             ('china_tariff_impact_by_category.csv', 'china_tariff_rate')):
+        impact = load_table(data_dir, artifact, columns=['year', 'tariff_rate', 'trade_value_millions'])
+        weighted = impact.assign(weighted=impact['tariff_rate'] * impact['trade_value_millions'])
+        totals = weighted.groupby('year')[['weighted', 'trade_value_millions']].sum()
+        table = (totals['weighted'] / totals['trade_value_millions']).rename(column).reset_index()
+        rates = table if rates is None else rates.merge(table, on='year', how='outer')
+    return rates
+
+def load_conflict_composite(data_dir=RAW_DIR):
+    """
+    月度综合风险指数：优先读取按维度分组的长表，没有时读取 conflict_risk_indicators.json
+
+    Returns
+    -------
+    pandas.Series
+        以月度 Period 为索引
+    """
+    try:
+        table = load_grouped_table(data_dir, 'conflict_risk_monthly.csv', keys=['综合风险指数'],
+                                   columns=['date', 'value'])
+        dates, values = table['date'], table['value']
+    except FileNotFoundError:
+        with open(os.path.join(data_dir, 'conflict_risk_indicators.json'), encoding='utf-8') as f:
+            records = json.load(f)['综合风险指数']
+        dates, values = [r['date'] for r in records], [r['value'] for r in records]
+    index = pd.PeriodIndex(pd.to_datetime(dates), freq='M')
+    return pd.Series(np.asarray(values, dtype=float), index=index, name='conflict_risk')
+
+def load_monthly_series(data_dir=RAW_DIR):
+    """
+    合并月度时间序列：中美月度贸易、消费者信心、社交媒体情绪（周度按月平均）和综合风险指数
+
+    Returns
+    -------
+    pandas.DataFrame
+        以月度 Period 为索引，只保留各序列都有数据的月份；列包括 us_exports_millions、
+        us_imports_millions、trade_balance_millions、us_consumer_confidence、cn_consumer_confidence、
+        positive_ratio、negative_ratio、net_sentiment、sentiment_volume、conflict_risk
+    """
+    def monthly(table, columns):
+        index = pd.PeriodIndex(pd.to_datetime(table['date']), freq='M')
+        return table[columns].set_axis(index)
+
+    trade = monthly(load_table(data_dir, 'us_china_monthly_trade.csv'),
+                    ['us_exports_millions', 'us_imports_millions', 'trade_balance_millions'])
+    confidence = monthly(load_table(data_dir, 'consumer_confidence_monthly.csv'),
+                         ['us_consumer_confidence', 'cn_consumer_confidence'])
+    weekly = load_table(data_dir, 'social_media_sentiment_weekly.csv',
+                        columns=['date', 'volume', 'positive_ratio', 'negative_ratio'])
+    sentiment = monthly(weekly, ['volume', 'positive_ratio', 'negative_ratio']).groupby(level=0).mean()
+    sentiment = sentiment.rename(columns={'volume': 'sentiment_volume'})
+    sentiment['net_sentiment'] = sentiment['positive_ratio'] - sentiment['negative_ratio']
+
+    series = pd.concat([trade, confidence, sentiment, load_conflict_composite(data_dir)], axis=1, join='inner')
+    return series.sort_index()
+
+def load_spatial_weights(data_dir=RAW_DIR, name='regional_spatial_weights', row_standardize=True):
+    """
+    读取空间权重矩阵：优先读取稀疏的 .npz 文件，没有时读取带标签的稠密表格
+
+    Parameters
+    ----------
+    data_dir : str, optional
+        数据目录
+    name : str, optional
+        文件名（不含扩展名）
+    row_standardize : bool, optional
+        是否行标准化
+
+    Returns
+    -------
+    SpatialWeights
+        空间权重
+    """
+    path = find_artifact(data_dir, name + '.npz')
+    if path is not None:
+        weights = SpatialWeights.load(path)
+    else:
+        dense = load_table(data_dir, name + '.csv', index_col=0)
+        weights = SpatialWeights.from_adjacency([str(region) for region in dense.index], dense.to_numpy())
+    return weights.row_standardize() if row_standardize else weights
+
+def design_matrix(data, terms):
+    """
+    由列名构造解释变量矩阵
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        数据
+    terms : list of str
+        列名，'a:b' 表示交互项 a × b
+
+    Returns
+    -------
+    pandas.DataFrame
+        每个解释变量一列，列名即 terms
+    """
+    columns = {}
+    for term in terms:
+        values = np.ones(len(data))
+        for name in term.split(':'):
+            values = values * data[name].to_numpy(dtype=float)
+        columns[term] = values
+    return pd.DataFrame(columns, index=data.index)
+
+def align_panel(panel, weights, region='region', period='year'):
+    """
+    将平衡面板按 (时期, 区域) 排序，区域顺序与权重矩阵一致
+
+    只保留同时出现在面板和权重矩阵中的区域，权重矩阵相应地取子矩阵
+
+    Parameters
+    ----------
+    panel : pandas.DataFrame
+        面板数据
+    weights : SpatialWeights
+        空间权重
+    region, period : str, optional
+        区域列和时期列
+
+    Returns
+    -------
+    tuple
+        (排序后的面板, 对应区域的权重, 时期数)
+    """
+    present = set(panel[region].astype(str))
+    regions = [r for r in weights.ids if r in present]
+    if len(regions) < len(weights.ids):
+        weights = weights.reorder(regions)
+        if weights.transform == 'R':
+            weights = weights.row_standardize()
+
+    panel = panel[panel[region].astype(str).isin(regions)]
+    position = {r: i for i, r in enumerate(regions)}
+    order = np.lexsort((panel[region].astype(str).map(position).to_numpy(), panel[period].to_numpy()))
+    panel = panel.iloc[order].reset_index(drop=True)
+
+    periods = panel[period].nunique()
+    if len(panel) != periods * len(regions):
+        raise ValueError(f"面板不平衡：{len(panel)} 行，{periods} 个时期 × {len(regions)} 个区域")
+    return panel, weights, periods
@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+高维固定效应面板回归
+    Y_it = α_i + γ_t + X_it β + ε_it
+固定效应不构造虚拟变量矩阵，而是用交替投影（依次减去各固定效应的组均值，直到收敛）
+从被解释变量和解释变量中吸收；组均值由 np.bincount 计算，数百万行的面板也只需线性时间。
+支持普通、异方差稳健和聚类稳健标准误，以及 Hausman 检验（固定效应 vs 随机效应）
+和 Wooldridge 面板序列相关检验
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+from scipy.sparse.csgraph import connected_components
+
+from analysis_data import RAW_DIR, design_matrix, load_regional_panel, load_tariff_rates
+
+# 交替投影的收敛阈值和最大迭代次数
+DEMEAN_TOL = 1e-10
+DEMEAN_MAX_ITER = 1000
+
+# 默认模型：Y_it = α_i + β1·Tariff_t + β2·X_it + β3·(Tariff_t × Z_i) + γ_t + ε_it
+DEFAULT_DEPENDENT = 'gdp_growth'
+DEFAULT_REGRESSORS = ['us_tariff_rate', 'investment_growth', 'consumption_growth',
+                      'us_tariff_rate:trade_dependency']
+
+def factorize(values):
+    """将分组变量转换为 0..G-1 的整数编码"""
+    codes, _ = pd.factorize(np.asarray(values), sort=True)
+    return codes
+
+def demean(data, factors, tol=DEMEAN_TOL, max_iter=DEMEAN_MAX_ITER):
+    """
+    用交替投影从各列中吸收多组固定效应
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        (N × k) 数据
+    factors : list of numpy.ndarray
+        各组固定效应的整数编码（见 factorize）
+    tol : float, optional
+        收敛阈值（一轮投影中各元素的最大变化）
+    max_iter : int, optional
+        最大迭代次数
+
+    Returns
+    -------
+    tuple
+        (去均值后的数据, 迭代次数)
+    """
+    residual = np.array(data, dtype=float).reshape(len(data), -1)
+    counts = [np.bincount(codes) for codes in factors]
+    scale = max(np.abs(residual).max(), 1.0) if residual.size else 1.0
+
+    for iteration in range(1, max_iter + 1):
+        change = 0.0
+        for codes, count in zip(factors, counts):
+            for j in range(residual.shape[1]):
+                means = np.bincount(codes, weights=residual[:, j], minlength=len(count)) / count
+                residual[:, j] -= means[codes]
+                change = max(change, np.abs(means).max())
+        # 只有一组固定效应时一轮即精确收敛
+        if len(factors) <= 1 or change <= tol * scale:
+            return residual, iteration
+    return residual, max_iter
+
+def absorbed_dof(factors):
+    """
+    固定效应吸收的自由度：各组水平数之和，减去多组固定效应间的冗余
+    （两组固定效应的冗余为二部图的连通分支数）
+    """
+    if not factors:
+        return 0
+    levels = [int(codes.max()) + 1 for codes in factors]
+    dof = sum(levels)
+    if len(factors) >= 2:
+        first, second = factors[0], factors[1]
+        graph = sparse.coo_matrix((np.ones(len(first)), (first, second + levels[0])),
+                                  shape=(levels[0] + levels[1],) * 2)
+        components, _ = connected_components(graph, directed=False)
+        dof -= components
+        dof -= len(factors) - 2  # 更多组固定效应时每组至少有一个冗余
+    return dof
+
+def _nested(factor, cluster):
+    """固定效应的每个水平是否只属于一个聚类"""
+    first = np.empty(int(factor.max()) + 1, dtype=cluster.dtype)
+    first[factor[::-1]] = cluster[::-1]  # 重复下标取最后一次赋值，即各水平首次出现时的聚类
+    return bool(np.all(first[factor] == cluster))
+
+def _covariance(X, residuals, vcov, cluster, df_resid):
+    """OLS系数的协方差矩阵"""
+    N = len(X)
+    bread = np.linalg.pinv(X.T @ X)
+    if vcov == 'iid':
+        return bread * (residuals @ residuals / df_resid)
+    if vcov == 'robust':
+        meat = (X * residuals[:, None] ** 2).T @ X
+        return N / df_resid * bread @ meat @ bread
+    if vcov == 'cluster':
+        n_clusters = int(cluster.max()) + 1
+        scores = np.zeros((n_clusters, X.shape[1]))
+        for j in range(X.shape[1]):
+            scores[:, j] = np.bincount(cluster, weights=X[:, j] * residuals, minlength=n_clusters)
+        meat = scores.T @ scores
+        adjustment = n_clusters / (n_clusters - 1) * (N - 1) / df_resid
+        return adjustment * bread @ meat @ bread
+    raise ValueError(f"未知的方差估计方法: {vcov}")
+
+def fit_fixed_effects(y, X, fixed_effects=(), names=None, vcov='cluster', cluster=None,
+                      tol=DEMEAN_TOL, max_iter=DEMEAN_MAX_ITER):
+    """
+    高维固定效应OLS估计
+
+    Parameters
+    ----------
+    y : array-like
+        (N,) 被解释变量
+    X : array-like
+        (N × k) 解释变量（不含常数项）
+    fixed_effects : sequence of array-like, optional
+        各组固定效应的分组变量（如区域、年份）
+    names : list of str, optional
+        解释变量名
+    vcov : str, optional
+        'iid'、'robust'（HC1）或 'cluster'（CR1）
+    cluster : array-like, optional
+        聚类变量，vcov='cluster' 时默认为第一组固定效应（没有固定效应时必须指定）
+    tol, max_iter : optional
+        交替投影的收敛阈值和最大迭代次数
+
+    Returns
+    -------
+    dict
+        coefficients（估计值、标准误、t值和p值）、covariance、absorbed（被固定效应吸收而删除的变量）、
+        residuals、r2_within、n_obs、df_resid、n_clusters、iterations
+    """
+    y = np.asarray(y, dtype=float).ravel()
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    names = list(names) if names is not None else [f"x{i + 1}" for i in range(X.shape[1])]
+    factors = [factorize(values) for values in fixed_effects]
+    if vcov == 'cluster' and cluster is None and not factors:
+        raise ValueError("vcov='cluster' 需要聚类变量：没有固定效应时请指定 cluster，或使用 vcov='robust'")
+
+    demeaned, iterations = demean(np.column_stack([y, X]), factors, tol, max_iter)
+    y_tilde, X_tilde = demeaned[:, 0], demeaned[:, 1:]
+    if not factors:
+        y_tilde = y_tilde - y_tilde.mean()
+        X_tilde = X_tilde - X_tilde.mean(axis=0)
+
+    # 不随固定效应之外变化的变量（如只随年份变化的全国关税）被吸收，去均值后接近0
+    scale = np.maximum(np.abs(X).max(axis=0), 1.0)
+    kept = np.abs(X_tilde).max(axis=0) > 1e-8 * scale
+    X_tilde = X_tilde[:, kept]
+    kept_names = [name for name, keep in zip(names, kept) if keep]
+
+    beta = np.linalg.lstsq(X_tilde, y_tilde, rcond=None)[0]
+    residuals = y_tilde - X_tilde @ beta
+    N, k = X_tilde.shape
+    absorbed = absorbed_dof(factors) if factors else 1
+
+    n_clusters = None
+    if vcov == 'cluster':
+        cluster = factors[0] if cluster is None else factorize(cluster)
+        n_clusters = int(cluster.max()) + 1
+        # 固定效应嵌套在聚类中时不计入自由度（与 Stata xtreg/reghdfe 一致）
+        nested = sum(int(codes.max()) + 1 for codes in factors if _nested(codes, cluster))
+        df_resid = N - k - absorbed + min(nested, absorbed)
+    else:
+        df_resid = N - k - absorbed
+    covariance = _covariance(X_tilde, residuals, vcov, cluster, max(df_resid, 1))
+
+    std_errors = np.sqrt(np.diag(covariance))
+    t = beta / std_errors
+    df_test = n_clusters - 1 if n_clusters else max(df_resid, 1)
+    coefficients = pd.DataFrame({
+        'variable': kept_names,
+        'estimate': beta,
+        'std_error': std_errors,
+        't': t,
+        'p_value': 2 * stats.t.sf(np.abs(t), df_test),
+    })
+
+    return {
+        'coefficients': coefficients,
+        'covariance': covariance,
+        'absorbed': [name for name, keep in zip(names, kept) if not keep],
+        'residuals': residuals,
+        'r2_within': 1 - residuals @ residuals / (y_tilde @ y_tilde),
+        'n_obs': N,
+        'df_resid': df_resid,
+        'n_clusters': n_clusters,
+        'iterations': iterations,
+    }
+
+def hausman_test(y, X, entity, time=None, names=None):
+    """
+    Hausman检验：个体固定效应与随机效应（Swamy-Arora）估计的系数差异
+
+    有时间变量时，先从所有变量中减去各期均值（相当于两个模型都加入时间固定效应，
+    平衡面板下与加入时间虚拟变量完全等价）
+
+    Parameters
+    ----------
+    y : array-like
+        (N,) 被解释变量
+    X : array-like
+        (N × k) 解释变量
+    entity : array-like
+        个体变量
+    time : array-like, optional
+        时间变量
+    names : list of str, optional
+        解释变量名
+
+    Returns
+    -------
+    dict
+        statistic、df、p_value、theta（随机效应的平均准去均值比例）和两个模型的系数表
+    """
+    y = np.asarray(y, dtype=float).ravel()
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    names = list(names) if names is not None else [f"x{i + 1}" for i in range(X.shape[1])]
+    entity = factorize(entity)
+    data = np.column_stack([y, X])
+    if time is not None:
+        data, _ = demean(data, [factorize(time)])
+    data = data - data.mean(axis=0)
+
+    counts = np.bincount(entity)
+    means = np.column_stack([np.bincount(entity, weights=column) / counts for column in data.T])
+    within = data - means[entity]
+
+    # 去掉不随个体内变化的变量（固定效应模型无法识别）
+    varying = np.abs(within[:, 1:]).max(axis=0) > 1e-8 * np.maximum(np.abs(X).max(axis=0), 1.0)
+    within_X, within_y = within[:, 1:][:, varying], within[:, 0]
+    N, k, n = len(y), int(varying.sum()), len(counts)
+
+    beta_fe = np.linalg.lstsq(within_X, within_y, rcond=None)[0]
+    resid_within = within_y - within_X @ beta_fe
+    sigma2_e = resid_within @ resid_within / (N - n - k)
+
+    # 组间回归估计个体效应方差
+    between = means[entity]
+    between_X = np.column_stack([np.ones(N), between[:, 1:]])
+    between_coef = np.linalg.lstsq(between_X, between[:, 0], rcond=None)[0]
+    between_resid = (between[:, 0] - between_X @ between_coef)
+    sigma2_between = (between_resid ** 2 / counts[entity]).sum() / max(n - k - 1, 1)
+    sigma2_u = max(sigma2_between - sigma2_e / stats.hmean(counts), 0.0)
+
+    theta = 1 - np.sqrt(sigma2_e / (counts * sigma2_u + sigma2_e))
+    quasi = data - theta[entity][:, None] * means[entity]
+    re_X = np.column_stack([1 - theta[entity], quasi[:, 1:]])
+    re_coef = np.linalg.lstsq(re_X, quasi[:, 0], rcond=None)[0]
+    re_resid = quasi[:, 0] - re_X @ re_coef
+    re_cov = np.linalg.pinv(re_X.T @ re_X) * (re_resid @ re_resid / (N - k - 1))
+    fe_cov = np.linalg.pinv(within_X.T @ within_X) * sigma2_e
+
+    index = 1 + np.flatnonzero(varying)
+    difference = beta_fe - re_coef[index]
+    variance = fe_cov - re_cov[np.ix_(index, index)]
+    statistic = float(difference @ np.linalg.pinv(variance) @ difference)
+    df = int(np.linalg.matrix_rank(variance))
+    kept_names = [name for name, keep in zip(names, varying) if keep]
+    return {
+        'statistic': statistic,
+        'df': df,
+        'p_value': float(stats.chi2.sf(statistic, df)),
+        'theta': float(theta.mean()),
+        'fixed_effects': pd.DataFrame({'variable': kept_names, 'estimate': beta_fe,
+                                       'std_error': np.sqrt(np.diag(fe_cov))}),
+        'random_effects': pd.DataFrame({'variable': kept_names, 'estimate': re_coef[index],
+                                        'std_error': np.sqrt(np.diag(re_cov)[index])}),
+    }
+
+def wooldridge_test(y, X, entity, time):
+    """
+    Wooldridge面板序列相关检验（原假设：固定效应模型的误差无一阶序列相关）
+
+    对一阶差分方程（含时期固定效应）做OLS，用残差对其滞后一期回归，
+    检验系数是否为 −0.5（按个体聚类的标准误）
+
+    Parameters
+    ----------
+    y : array-like
+        (N,) 被解释变量
+    X : array-like
+        (N × k) 解释变量
+    entity, time : array-like
+        个体变量和时间变量（时间须可排序，相邻期编码相差1）
+
+    Returns
+    -------
+    dict
+        statistic（F(1, G−1)）、df、p_value、coefficient
+    """
+    y = np.asarray(y, dtype=float).ravel()
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    entity, time = factorize(entity), factorize(time)
+    order = np.lexsort((time, entity))
+    y, X, entity, time = y[order], X[order], entity[order], time[order]
+
+    consecutive = (entity[1:] == entity[:-1]) & (time[1:] - time[:-1] == 1)
+    dy, dX = (y[1:] - y[:-1])[consecutive], (X[1:] - X[:-1])[consecutive]
+    d_entity, d_time = entity[1:][consecutive], time[1:][consecutive]
+    # 差分方程中加入时期固定效应，避免共同时间冲击的差分被误判为序列相关
+    residuals = fit_fixed_effects(dy, dX, [d_time], vcov='iid')['residuals']
+
+    lagged = (d_entity[1:] == d_entity[:-1]) & (d_time[1:] - d_time[:-1] == 1)
+    current, previous = residuals[1:][lagged], residuals[:-1][lagged]
+    fit = fit_fixed_effects(current, previous, names=['lag_residual'], vcov='cluster',
+                            cluster=d_entity[1:][lagged])
+    # 带常数项的回归：fit_fixed_effects 在没有固定效应时对数据中心化
+    coefficient = fit['coefficients']['estimate'].iloc[0]
+    std_error = fit['coefficients']['std_error'].iloc[0]
+    statistic = ((coefficient + 0.5) / std_error) ** 2
+    df = (1, fit['n_clusters'] - 1)
+    return {
+        'statistic': float(statistic),
+        'df': df,
+        'p_value': float(stats.f.sf(statistic, *df)),
+        'coefficient': float(coefficient),
+    }
+
+def regional_panel_regression(dependent=DEFAULT_DEPENDENT, regressors=DEFAULT_REGRESSORS, years=None,
+                              time_effects=True, vcov='cluster', data_dir=RAW_DIR):
+    """
+    区域 × 年份面板的双向固定效应回归及诊断检验
+
+    区域经济数据与各年贸易加权平均关税税率（us_tariff_rate、china_tariff_rate）合并；
+    全国关税只随年份变化，有年份固定效应时其主效应被吸收，只识别与区域特征的交互项
+
+    Parameters
+    ----------
+    dependent : str, optional
+        被解释变量
+    regressors : list of str, optional
+        解释变量，'a:b' 表示交互项
+    years : sequence of int, optional
+        只使用这些年份
+    time_effects : bool, optional
+        是否加入年份固定效应
+    vcov : str, optional
+        方差估计方法（按区域聚类）
+    data_dir : str, optional
+        数据目录
+
+    Returns
+    -------
+    dict
+        fit（fit_fixed_effects 的结果）、hausman、wooldridge
+    """
+    panel = load_regional_panel(data_dir, years).merge(load_tariff_rates(data_dir), on='year', how='left')
+    X = design_matrix(panel, regressors)
+    y = panel[dependent].to_numpy(dtype=float)
+    fixed_effects = [panel['region'], panel['year']] if time_effects else [panel['region']]
+    return {
+        'fit': fit_fixed_effects(y, X.to_numpy(), fixed_effects, names=list(X.columns), vcov=vcov),
+        'hausman': hausman_test(y, X.to_numpy(), panel['region'], panel['year'] if time_effects else None,
+                                names=list(X.columns)),
+        'wooldridge': wooldridge_test(y, X.to_numpy(), panel['region'], panel['year']),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="区域面板双向固定效应回归")
+    parser.add_argument('-y', '--dependent', default=DEFAULT_DEPENDENT, help="被解释变量")
+    parser.add_argument('-x', '--regressor', action='append', dest='regressors', default=None,
+                        help="解释变量（'a:b' 表示交互项），可重复指定")
+    parser.add_argument('--years', type=int, nargs='+', default=None, help="只使用这些年份")
+    parser.add_argument('--no-time-effects', action='store_true', help="不加入年份固定效应")
+    parser.add_argument('--vcov', choices=['iid', 'robust', 'cluster'], default='cluster',
+                        help="标准误类型（默认按区域聚类）")
+    parser.add_argument('--data-dir', default=RAW_DIR, help="数据目录")
+    args = parser.parse_args()
+
+    result = regional_panel_regression(args.dependent, args.regressors or DEFAULT_REGRESSORS, args.years,
+                                       not args.no_time_effects, args.vcov, args.data_dir)
+    fit, hausman, wooldridge = result['fit'], result['hausman'], result['wooldridge']
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(f"固定效应回归: {args.dependent}  N={fit['n_obs']}  within R²={fit['r2_within']:.4f}  "
+              f"聚类数={fit['n_clusters']}")
+        print(fit['coefficients'].round(4).to_string(index=False))
+        if fit['absorbed']:
+            print(f"被固定效应吸收: {', '.join(fit['absorbed'])}")
+    print(f"\nHausman检验: χ²({hausman['df']}) = {hausman['statistic']:.3f}, p = {hausman['p_value']:.4f}")
+    print(f"Wooldridge序列相关检验: F{wooldridge['df']} = {wooldridge['statistic']:.3f}, "
+          f"p = {wooldridge['p_value']:.4f}")
+
+if __name__ == "__main__":
+    main()
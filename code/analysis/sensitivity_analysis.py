@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模拟结果的敏感性分析（蒙特卡洛 + Sobol 指数）
+各生成函数的关键假设作为命名参数暴露：
+    - us_tariff / china_tariff：generate_tariff_impact_summary 的品类敏感系数 sensitivity
+    - regional：generate_regional_economic_data 的关税影响强度 tariff_years
+    - conflict：综合风险指数的维度权重 weights
+参数在默认值 ±spread 范围内均匀取值，按 Saltelli 设计 (A, B, AB_i) 用 Sobol 序列或拉丁超立方抽样；
+情景按批分配到多个进程求值，各情景使用相同的随机种子（共同随机数），输出的差异只来自参数；
+每批结果写为列式文件的一个行组，不为每个情景单独保存文件
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from analysis_data import OUTPUT_DIR, TARIFF_WAR_START_YEAR
+from data_store import TableWriter, configure, save_table
+from rng_service import make_rng
+
+import china_tariff_crawler
+import regional_economic_crawler
+import us_tariff_crawler
+from conflict_risk_engine import COMPOSITE_WEIGHTS, simulate_conflict_risk
+from strategic_resources_crawler import END_DATE, START_DATE
+
+# 参数相对默认值的扰动幅度
+SPREAD = 0.3
+
+# Saltelli 设计的基础样本数、每批情景数、Sobol 指数置信区间的自助次数
+SAMPLES = 256
+SCENARIO_BATCH = 200
+BOOTSTRAP_REPLICATIONS = 500
+
+def _tariff_outputs(generate, keys, values, seed):
+    """关税影响汇总：关税战期间的贸易额合计和平均贸易降幅"""
+    rows = []
+    for row in values:
+        impact = generate(sensitivity=dict(zip(keys, row)), save=False, seed=seed)
+        impact = impact[impact['year'] >= TARIFF_WAR_START_YEAR]
+        rows.append((impact['trade_value_millions'].sum(), impact['trade_reduction_pct'].mean()))
+    return pd.DataFrame(rows, columns=['trade_value_millions', 'trade_reduction_pct'])
+
+def _us_tariff_outputs(keys, values, seed):
+    return _tariff_outputs(us_tariff_crawler.generate_tariff_impact_summary, keys, values, seed)
+
+def _china_tariff_outputs(keys, values, seed):
+    return _tariff_outputs(china_tariff_crawler.generate_tariff_impact_summary, keys, values, seed)
+
+def _regional_outputs(keys, values, seed):
+    """区域经济：关税战期间各区域的平均GDP增速和平均失业率"""
+    rows = []
+    for row in values:
+        panel = regional_economic_crawler.generate_regional_economic_data(
+            tariff_years=dict(zip(keys, row)), save=False, seed=seed)
+        panel = panel[panel['year'] >= TARIFF_WAR_START_YEAR]
+        rows.append((panel['gdp_growth'].mean(), panel['unemployment_rate'].mean()))
+    return pd.DataFrame(rows, columns=['gdp_growth', 'unemployment_rate'])
+
+def _conflict_outputs(keys, values, seed):
+    """
+    冲突风险：各维度只模拟一次，所有情景的综合指数为同一 (日期 × 维度) 矩阵与各自（归一化）权重的乘积；
+    输出为关税战以来综合指数的均值和期末值（各维度在高峰期均触及上限100，峰值对权重不敏感）
+    """
+    dates = pd.date_range(start=START_DATE, end=END_DATE, freq='M')
+    simulation = simulate_conflict_risk(dates, seed=seed)
+    position = [simulation['dimensions'].index(key) for key in keys]
+    weights = values / values.sum(axis=1, keepdims=True)
+    composite = simulation['values'][0][:, position] @ weights.T
+    composite = composite[dates.year >= TARIFF_WAR_START_YEAR]
+    return pd.DataFrame({'composite_mean': composite.mean(axis=0), 'composite_final': composite[-1]})
+
+# 模型 -> (参数默认值, 批量求值函数)；求值函数 (参数名, 情景 × 参数 数组, 种子) -> 情景 × 输出 表
+MODELS = {
+    'us_tariff': (us_tariff_crawler.TRADE_SENSITIVITY, _us_tariff_outputs),
+    'china_tariff': (china_tariff_crawler.TRADE_SENSITIVITY, _china_tariff_outputs),
+    'regional': (regional_economic_crawler.TARIFF_IMPACT_BY_YEAR, _regional_outputs),
+    'conflict': (COMPOSITE_WEIGHTS, _conflict_outputs),
+}
+
+def parameter_space(model, spread=SPREAD):
+    """
+    模型参数的取值范围
+
+    Parameters
+    ----------
+    model : str
+        MODELS 中的模型名
+    spread : float, optional
+        相对默认值的扰动幅度，取值范围为 默认值 × [1 − spread, 1 + spread]
+
+    Returns
+    -------
+    pandas.DataFrame
+        parameter、default、low、high 列
+    """
+    defaults = MODELS[model][0]
+    values = np.array(list(defaults.values()), dtype=float)
+    return pd.DataFrame({
+        'parameter': list(defaults),
+        'default': values,
+        'low': values * (1 - spread),
+        'high': values * (1 + spread),
+    })
+
+def saltelli_design(space, samples=SAMPLES, method='sobol', seed=None):
+    """
+    Saltelli 设计：两个独立样本矩阵 A、B，以及将 A 的第 i 列替换为 B 的第 i 列得到的 AB_i
+
+    Parameters
+    ----------
+    space : pandas.DataFrame
+        parameter_space 的结果
+    samples : int, optional
+        基础样本数 N；Sobol 序列向上取为2的幂
+    method : str, optional
+        'sobol'（加扰Sobol序列）或 'lhs'（拉丁超立方）
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    tuple
+        (情景参数数组 (N(k+2) × k)，各情景所属的块：'A'、'B' 或被替换的参数名)
+    """
+    k = len(space)
+    if method == 'sobol':
+        base = qmc.Sobol(2 * k, seed=seed).random_base2(int(np.ceil(np.log2(samples))))
+    elif method == 'lhs':
+        base = qmc.LatinHypercube(2 * k, seed=seed).random(samples)
+    else:
+        raise ValueError(f"未知的抽样方法: {method}（可选: sobol、lhs）")
+    n = len(base)
+    A, B = base[:, :k], base[:, k:]
+    AB = np.repeat(A[None], k, axis=0)
+    AB[np.arange(k), :, np.arange(k)] = B.T
+    unit = np.concatenate([A, B, AB.reshape(k * n, k)])
+    values = qmc.scale(unit, space['low'].to_numpy(), space['high'].to_numpy())
+    blocks = np.repeat(['A', 'B'] + list(space['parameter']), n)
+    return values, blocks
+
+def _evaluate_batch(model, keys, values, seed):
+    return MODELS[model][1](keys, values, seed)
+
+def sobol_indices(outputs, blocks, parameters, replications=BOOTSTRAP_REPLICATIONS, level=0.95, seed=None):
+    """
+    一阶和总效应 Sobol 指数（Saltelli 2010 与 Jansen 估计量），置信区间由批量自助法得到
+
+    Parameters
+    ----------
+    outputs : pandas.DataFrame
+        各情景的输出，行顺序与 saltelli_design 一致
+    blocks : numpy.ndarray
+        各情景所属的块
+    parameters : list of str
+        参数名
+    replications : int, optional
+        自助次数，为0时不计算置信区间
+    level : float, optional
+        置信水平
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    pandas.DataFrame
+        output、parameter、S1、ST 以及 S1_low、S1_high、ST_low、ST_high
+    """
+    n = int(np.sum(blocks == 'A'))
+    k = len(parameters)
+    Y = outputs.to_numpy(dtype=float).reshape(k + 2, n, -1)
+    # 减去均值以降低估计量的数值误差；输出在各情景间不变（方差为0）时指数为NaN
+    Y = Y - Y[:2].mean(axis=(0, 1))
+    scale = np.maximum(np.abs(Y).max(axis=(0, 1)), np.finfo(float).tiny)
+    fA, fB, fAB = Y[0] / scale, Y[1] / scale, Y[2:] / scale
+
+    def estimate(index):
+        # index: (重复 × N) 样本下标，返回 (重复 × k × 输出) 的 S1 和 ST
+        a, b, ab = fA[index], fB[index], fAB[:, index].swapaxes(0, 1)
+        variance = np.concatenate([a, b], axis=1).var(axis=1)[:, None]
+        variance = np.where(variance > 1e-12, variance, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first = (b[:, None] * (ab - a[:, None])).mean(axis=2) / variance
+            total = 0.5 * ((a[:, None] - ab) ** 2).mean(axis=2) / variance
+        return first, total
+
+    first, total = estimate(np.arange(n)[None])
+    table = pd.DataFrame({
+        'output': np.tile(outputs.columns, k),
+        'parameter': np.repeat(parameters, len(outputs.columns)),
+        'S1': first[0].ravel(),
+        'ST': total[0].ravel(),
+    })
+    if replications:
+        index = make_rng(seed).integers(0, n, (replications, n))
+        boot_first, boot_total = estimate(index)
+        quantiles = [(1 - level) / 2, (1 + level) / 2]
+        table['S1_low'], table['S1_high'] = np.quantile(boot_first, quantiles, axis=0).reshape(2, -1)
+        table['ST_low'], table['ST_high'] = np.quantile(boot_total, quantiles, axis=0).reshape(2, -1)
+    return table
+
+def run_sensitivity(model, samples=SAMPLES, method='sobol', spread=SPREAD, workers=None, seed=None,
+                    save_dir=None):
+    """
+    对一个模型运行敏感性分析
+
+    Parameters
+    ----------
+    model : str
+        MODELS 中的模型名
+    samples : int, optional
+        基础样本数 N，共求值 N(k+2) 个情景
+    method : str, optional
+        'sobol' 或 'lhs'
+    spread : float, optional
+        参数扰动幅度
+    workers : int, optional
+        并行进程数，None 为CPU核心数
+    seed : int, optional
+        随机种子（抽样、模型的共同随机数和自助法均由其派生）
+    save_dir : str, optional
+        给出时将各情景的参数和输出逐批写入 sensitivity_<model>_scenarios 表
+
+    Returns
+    -------
+    dict
+        space、values、blocks、outputs、indices
+    """
+    design_seed, model_seed, bootstrap_seed = (int(s) for s in make_rng(seed).integers(0, 2**32 - 1, 3))
+    space = parameter_space(model, spread)
+    keys = list(space['parameter'])
+    values, blocks = saltelli_design(space, samples, method, design_seed)
+
+    starts = range(0, len(values), SCENARIO_BATCH)
+    args = [(model, keys, values[start:start + SCENARIO_BATCH], model_seed) for start in starts]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    writer = None
+    if save_dir is not None:
+        writer = TableWriter(save_dir, f'sensitivity_{model}_scenarios.csv', categorical=['block'])
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(args))) if workers > 1 and len(args) > 1 else None
+    batches = []
+    try:
+        results = executor.map(_evaluate_batch, *zip(*args)) if executor else (_evaluate_batch(*arg) for arg in args)
+        for start, batch in zip(starts, results):
+            batches.append(batch)
+            if writer is not None:
+                stop = start + len(batch)
+                scenarios = pd.DataFrame(values[start:stop], columns=[str(key) for key in keys])
+                scenarios.insert(0, 'scenario', np.arange(start, stop))
+                scenarios.insert(1, 'block', blocks[start:stop])
+                writer.write(pd.concat([scenarios, batch.set_axis(scenarios.index)], axis=1))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if writer is not None:
+            writer.close()
+
+    outputs = pd.concat(batches, ignore_index=True)
+    return {
+        'space': space,
+        'values': values,
+        'blocks': blocks,
+        'outputs': outputs,
+        'indices': sobol_indices(outputs, blocks, keys, seed=bootstrap_seed),
+        'path': writer.path if writer is not None else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟假设的蒙特卡洛敏感性分析（Sobol 指数）")
+    parser.add_argument('models', nargs='*', metavar='MODEL',
+                        help=f"模型：{'、'.join(MODELS)}（默认全部）")
+    parser.add_argument('-n', '--samples', type=int, default=SAMPLES, help="基础样本数 N（共 N(k+2) 个情景）")
+    parser.add_argument('--method', choices=['sobol', 'lhs'], default='sobol', help="抽样方法")
+    parser.add_argument('--spread', type=float, default=SPREAD, help="参数相对默认值的扰动幅度")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="并行进程数（默认为CPU核心数）")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--format', choices=['parquet', 'feather', 'csv'], default='parquet',
+                        help="情景结果的存储格式")
+    parser.add_argument('--no-save', action='store_true', help="不保存情景结果和 Sobol 指数")
+    args = parser.parse_args()
+    unknown = [model for model in args.models if model not in MODELS]
+    if unknown:
+        parser.error(f"未知的模型: {', '.join(unknown)}")
+
+    configure(format=args.format)
+    indices = []
+    for model in args.models or list(MODELS):
+        start = time.time()
+        result = run_sensitivity(model, args.samples, args.method, args.spread, args.workers, args.seed,
+                                 None if args.no_save else OUTPUT_DIR)
+        elapsed = time.time() - start
+        print(f"{model}: {len(result['outputs'])} 个情景，{elapsed:.1f} 秒（{len(result['outputs']) / elapsed:.0f} 情景/秒）"
+              + (f"，已保存至 {result['path']}" if result['path'] else ""))
+        with pd.option_context('display.width', 160, 'display.max_columns', None, 'display.max_rows', None):
+            print(result['indices'].round(3).to_string(index=False))
+        indices.append(result['indices'].assign(model=model))
+
+    if not args.no_save:
+        path = save_table(pd.concat(indices, ignore_index=True), OUTPUT_DIR, 'sensitivity_indices.csv')
+        print(f"Sobol 指数已保存至: {path}")
+
+if __name__ == "__main__":
+    main()
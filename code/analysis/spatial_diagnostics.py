@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+空间自相关诊断
+对多个指标 × 年份的截面（n × m 矩阵的各列）一次计算：
+    - 全局 Moran's I 及随机化假设下的正态检验
+    - 局部 Moran's I (LISA) 及象限分类
+    - LM-lag、LM-error 检验及其稳健形式
+置换检验按批进行：每批置换同时作用于所有列，全局统计量为一次稀疏矩阵乘积，
+局部统计量为条件置换（固定区域i，随机抽取其余区域作为邻居）；
+各批使用独立的随机种子，可分配到多个进程，结果与进程数无关
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+
+from analysis_data import RAW_DIR, align_panel, load_regional_panel, load_spatial_weights
+from rng_service import make_rng
+
+# 默认检验的指标
+DEFAULT_INDICATORS = ['gdp_growth', 'unemployment_rate', 'investment_growth', 'consumption_growth']
+
+# LM 检验回归中的默认解释变量（各年截面上的区域特征）
+DEFAULT_COVARIATES = ['trade_dependency']
+
+# 置换次数、每批置换次数
+PERMUTATIONS = 999
+BATCH_DRAWS = 100
+
+# 局部统计量条件置换时每块的最大元素数（区域 × 置换 × 邻居 × 列），控制内存占用
+LOCAL_BLOCK_CELLS = 20_000_000
+
+# LISA象限：1 高-高，2 低-高，3 低-低，4 高-低
+QUADRANTS = {1: 'HH', 2: 'LH', 3: 'LL', 4: 'HL'}
+
+def _centered(Y):
+    Y = np.asarray(Y, dtype=float)
+    return Y - Y.mean(axis=0)
+
+def _padded_neighbors(W):
+    """每个区域的邻居权重补齐为 (n × 最大邻居数) 数组"""
+    cardinalities = np.diff(W.indptr)
+    width = max(int(cardinalities.max()), 1) if W.shape[0] else 1
+    values = np.zeros((W.shape[0], width))
+    columns = np.arange(W.nnz) - np.repeat(W.indptr[:-1], cardinalities)
+    values[np.repeat(np.arange(W.shape[0]), cardinalities), columns] = W.data
+    return values
+
+def moran_moments(W, Z):
+    """
+    全局 Moran's I 在随机化假设下的期望和方差
+
+    Parameters
+    ----------
+    W : scipy.sparse.csr_matrix
+        权重矩阵
+    Z : numpy.ndarray
+        (n × m) 已中心化的数据
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (期望, 方差)，长度为 m
+    """
+    n = W.shape[0]
+    s0 = W.sum()
+    s1 = 0.5 * (W + W.T).power(2).sum()
+    s2 = ((np.asarray(W.sum(axis=1)).ravel() + np.asarray(W.sum(axis=0)).ravel()) ** 2).sum()
+    expected = -1.0 / (n - 1)
+    kurtosis = n * (Z ** 4).sum(axis=0) / (Z ** 2).sum(axis=0) ** 2
+    numerator = (n * ((n * n - 3 * n + 3) * s1 - n * s2 + 3 * s0 ** 2)
+                 - kurtosis * ((n * n - n) * s1 - 2 * n * s2 + 6 * s0 ** 2))
+    variance = numerator / ((n - 1) * (n - 2) * (n - 3) * s0 ** 2) - expected ** 2
+    return np.full(Z.shape[1], expected), variance
+
+def global_moran(W, Z):
+    """各列的全局 Moran's I：(n / S0) · z'Wz / z'z"""
+    return W.shape[0] / W.sum() * (Z * (W @ Z)).sum(axis=0) / (Z * Z).sum(axis=0)
+
+def local_moran(W, Z):
+    """各区域、各列的局部 Moran's I：z_i (Wz)_i / (z'z / n)"""
+    return Z * (W @ Z) / ((Z * Z).sum(axis=0) / W.shape[0])
+
+def _permutation_batch(W, neighbor_weights, Z, draws, seed):
+    """
+    一批置换：返回全局统计量的 (置换值之和, 平方和, 不小于观测值的次数)
+    以及局部统计量不小于观测值的次数 (n × m)
+    """
+    rng = np.random.default_rng(seed)
+    n, m = Z.shape
+    observed_global = global_moran(W, Z)
+    observed_lag = W @ Z
+
+    # 全局：同一置换作用于所有列，(n × m·draws) 一次稀疏乘积
+    order = np.argsort(rng.random((draws, n)), axis=1)
+    permuted = np.concatenate([Z[perm] for perm in order], axis=1)
+    lagged = W @ permuted
+    values = (W.shape[0] / W.sum() * (permuted * lagged).sum(axis=0)
+              / np.tile((Z * Z).sum(axis=0), draws)).reshape(draws, m)
+    global_sum = values.sum(axis=0)
+    global_sumsq = (values ** 2).sum(axis=0)
+    global_larger = (values >= observed_global).sum(axis=0)
+
+    # 局部：从其余 n−1 个区域中不放回地抽取 k 个作为区域i的邻居（各区域共用抽样下标）
+    k = neighbor_weights.shape[1]
+    picks = np.argpartition(rng.random((draws, n - 1)), k - 1, axis=1)[:, :k] if k < n - 1 \
+        else np.argsort(rng.random((draws, n - 1)), axis=1)
+    local_larger = np.zeros((n, m), dtype=np.int64)
+    block = max(1, LOCAL_BLOCK_CELLS // max(draws * k * m, 1))
+    for start in range(0, n, block):
+        rows = np.arange(start, min(n, start + block))
+        # 抽样下标跳过区域i本身
+        others = picks[None] + (picks[None] >= rows[:, None, None])
+        lag = np.einsum('ik,idkm->idm', neighbor_weights[rows], Z[others])
+        # I_i 的置换值与观测值同乘 z_i，比较 z_i·lag 即可
+        sign = Z[rows][:, None, :]
+        local_larger[rows] = (sign * lag >= (sign * observed_lag[rows][:, None, :])).sum(axis=1)
+    return global_sum, global_sumsq, global_larger, local_larger
+
+def _folded_p_value(larger, permutations):
+    """单侧伪p值：取置换分布中更极端一侧的次数"""
+    larger = np.minimum(larger, permutations - larger)
+    return (larger + 1.0) / (permutations + 1.0)
+
+def moran_tests(Y, weights, permutations=PERMUTATIONS, workers=1, seed=None):
+    """
+    对 Y 的各列计算全局和局部 Moran's I 及置换检验
+
+    Parameters
+    ----------
+    Y : array-like
+        (n × m) 数据，每列为一个截面（行顺序与权重矩阵一致）
+    weights : SpatialWeights or scipy.sparse matrix
+        空间权重
+    permutations : int, optional
+        置换次数，为0时不做置换检验
+    workers : int, optional
+        并行进程数，None 为CPU核心数
+    seed : int, optional
+        随机种子；各批置换的种子由其派生，结果与进程数无关
+
+    Returns
+    -------
+    dict
+        global（每列的 moran_i、expected、variance、z_norm、p_norm，以及 z_sim、p_sim）、
+        local_i（n × m 局部 Moran's I）、local_p_sim（n × m）、quadrant（n × m，见 QUADRANTS）
+    """
+    W = sparse.csr_matrix(getattr(weights, 'matrix', weights), dtype=float)
+    Z = _centered(Y).reshape(W.shape[0], -1)
+    moran_i = global_moran(W, Z)
+    expected, variance = moran_moments(W, Z)
+    z_norm = (moran_i - expected) / np.sqrt(variance)
+    result = {
+        'global': {
+            'moran_i': moran_i,
+            'expected': expected,
+            'variance': variance,
+            'z_norm': z_norm,
+            'p_norm': 2 * stats.norm.sf(np.abs(z_norm)),
+        },
+        'local_i': local_moran(W, Z),
+        'quadrant': np.where(Z > 0, np.where(W @ Z > 0, 1, 4), np.where(W @ Z > 0, 2, 3)),
+    }
+    if not permutations:
+        return result
+
+    sizes = [min(BATCH_DRAWS, permutations - start) for start in range(0, permutations, BATCH_DRAWS)]
+    seeds = make_rng(seed).integers(0, 2**63 - 1, len(sizes))
+    neighbor_weights = _padded_neighbors(W)
+    args = [(W, neighbor_weights, Z, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as executor:
+            batches = list(executor.map(_permutation_batch, *zip(*args)))
+    else:
+        batches = [_permutation_batch(*arg) for arg in args]
+
+    global_sum, global_sumsq, global_larger, local_larger = (sum(parts) for parts in zip(*batches))
+    mean = global_sum / permutations
+    std = np.sqrt(np.maximum(global_sumsq / permutations - mean ** 2, 0) * permutations / (permutations - 1))
+    result['global']['z_sim'] = (moran_i - mean) / std
+    result['global']['p_sim'] = _folded_p_value(global_larger, permutations)
+    result['local_p_sim'] = _folded_p_value(local_larger, permutations)
+    return result
+
+def lm_tests(Y, weights, X=None):
+    """
+    各列回归残差的 LM-lag、LM-error 检验及其稳健形式 (Anselin 1988)
+
+    Parameters
+    ----------
+    Y : array-like
+        (n × m) 被解释变量，每列为一个截面
+    weights : SpatialWeights or scipy.sparse matrix
+        空间权重
+    X : array-like, optional
+        (n × p) 各列共用的解释变量（不含常数项，自动加入）；默认只有常数项
+
+    Returns
+    -------
+    dict
+        lm_lag、lm_error、robust_lm_lag、robust_lm_error 及对应的 p 值（χ²(1)），各为长度 m 的数组
+    """
+    W = sparse.csr_matrix(getattr(weights, 'matrix', weights), dtype=float)
+    n = W.shape[0]
+    Y = np.asarray(Y, dtype=float).reshape(n, -1)
+    design = np.ones((n, 1)) if X is None else np.column_stack([np.ones(n), np.asarray(X, dtype=float)])
+    Q, _ = np.linalg.qr(design)
+
+    fitted = Q @ (Q.T @ Y)
+    E = Y - fitted
+    sigma2 = (E * E).sum(axis=0) / n
+    WE, WY, WF = W @ E, W @ Y, W @ fitted
+    trace = W.power(2).sum() + W.multiply(W.T).sum()  # tr(W'W + W²)
+    residual_WF = WF - Q @ (Q.T @ WF)
+    D = (residual_WF * residual_WF).sum(axis=0) / sigma2 + trace
+
+    score_error = (E * WE).sum(axis=0) / sigma2
+    score_lag = (E * WY).sum(axis=0) / sigma2
+    # 只有常数项时 WXβ 与常数共线，D = T，LM-lag 与 LM-error 相同，稳健形式无定义（NaN）
+    undefined = np.isclose(D, trace)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        statistics = {
+            'lm_lag': score_lag ** 2 / D,
+            'lm_error': score_error ** 2 / trace,
+            'robust_lm_lag': np.where(undefined, np.nan, (score_lag - score_error) ** 2 / (D - trace)),
+            'robust_lm_error': np.where(undefined, np.nan,
+                                        (score_error - trace / D * score_lag) ** 2 / (trace - trace ** 2 / D)),
+        }
+    for name in list(statistics):
+        statistics[f"{name}_p_value"] = stats.chi2.sf(statistics[name], 1)
+    return statistics
+
+def regional_diagnostics(indicators=DEFAULT_INDICATORS, years=None, permutations=PERMUTATIONS,
+                         workers=None, seed=None, data_dir=RAW_DIR, covariates=DEFAULT_COVARIATES):
+    """
+    对区域经济数据的各指标 × 年份截面做空间自相关诊断
+
+    Parameters
+    ----------
+    indicators : list of str, optional
+        指标列名
+    years : sequence of int, optional
+        只检验这些年份
+    permutations : int, optional
+        置换次数
+    workers : int, optional
+        并行进程数，None 为CPU核心数
+    seed : int, optional
+        随机种子
+    data_dir : str, optional
+        数据目录
+    covariates : list of str, optional
+        LM 检验回归的解释变量列（每年取该年截面，不能与 indicators 重复）；
+        为空时不做 LM 检验（只有常数项时 LM-lag 与 LM-error 相同，稳健形式无定义）
+
+    Returns
+    -------
+    tuple of pandas.DataFrame
+        (全局检验表：每个 指标 × 年份 一行，含 Moran's I 和（给定解释变量时的）LM 检验；
+         局部检验表：每个 指标 × 年份 × 区域 一行，含 local_i、p_sim、quadrant)
+    """
+    covariates = list(covariates or [])
+    overlap = sorted(set(covariates) & set(indicators))
+    if overlap:
+        raise ValueError(f"解释变量不能同时作为被检验的指标: {', '.join(overlap)}")
+
+    panel, weights, periods = align_panel(load_regional_panel(data_dir, years), load_spatial_weights(data_dir))
+    n = weights.n
+    year_values = panel['year'].to_numpy()[::n]
+    # 列顺序：指标 × 年份
+    Y = np.concatenate([panel[indicator].to_numpy(dtype=float).reshape(periods, n).T
+                        for indicator in indicators], axis=1)
+    labels = pd.DataFrame({'indicator': np.repeat(indicators, periods),
+                           'year': np.tile(year_values, len(indicators))})
+
+    moran = moran_tests(Y, weights, permutations, workers, seed)
+    tables = [labels, pd.DataFrame(moran['global'])]
+    if covariates:
+        # 各年的解释变量不同：按年份分别回归该年的全部指标列
+        X = panel[covariates].to_numpy(dtype=float).reshape(periods, n, len(covariates))
+        lm = pd.DataFrame(index=labels.index, dtype=float)
+        for t in range(periods):
+            columns = np.arange(t, Y.shape[1], periods)
+            for name, values in lm_tests(Y[:, columns], weights, X[t]).items():
+                lm.loc[columns, name] = values
+        tables.append(lm)
+    global_table = pd.concat(tables, axis=1)
+
+    local_table = pd.DataFrame({
+        'indicator': np.repeat(labels['indicator'].to_numpy(), n),
+        'year': np.repeat(labels['year'].to_numpy(), n),
+        'region': np.tile(weights.ids, Y.shape[1]),
+        'local_i': moran['local_i'].T.ravel(),
+        'quadrant': pd.Series(moran['quadrant'].T.ravel()).map(QUADRANTS).to_numpy(),
+    })
+    if 'local_p_sim' in moran:
+        local_table['p_sim'] = moran['local_p_sim'].T.ravel()
+    return global_table, local_table
+
+def main():
+    parser = argparse.ArgumentParser(description="区域经济指标的空间自相关诊断")
+    parser.add_argument('-i', '--indicator', action='append', dest='indicators', default=None,
+                        help="指标列名，可重复指定")
+    parser.add_argument('--years', type=int, nargs='+', default=None, help="只检验这些年份")
+    parser.add_argument('-p', '--permutations', type=int, default=PERMUTATIONS, help="置换次数")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="并行进程数（默认为CPU核心数）")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--data-dir', default=RAW_DIR, help="数据目录")
+    parser.add_argument('-c', '--covariate', action='append', dest='covariates', default=None,
+                        help=f"LM 检验回归的解释变量列，可重复指定（默认 {', '.join(DEFAULT_COVARIATES)}）")
+    parser.add_argument('--no-lm', action='store_true', help="不做 LM 检验")
+    args = parser.parse_args()
+
+    covariates = [] if args.no_lm else args.covariates or DEFAULT_COVARIATES
+    global_table, local_table = regional_diagnostics(args.indicators or DEFAULT_INDICATORS, args.years,
+                                                     args.permutations, args.workers, args.seed,
+                                                     args.data_dir, covariates)
+    columns = ['indicator', 'year', 'moran_i', 'z_norm', 'p_norm', 'p_sim',
+               'lm_lag', 'lm_lag_p_value', 'lm_error', 'lm_error_p_value']
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(global_table[[c for c in columns if c in global_table]].round(4).to_string(index=False))
+        if 'p_sim' in local_table:
+            significant = local_table[local_table['p_sim'] < 0.05]
+            print(f"\n显著的局部空间聚集 (p_sim < 0.05): {len(significant)} / {len(local_table)}")
+            print(significant.round(4).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
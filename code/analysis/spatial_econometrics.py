@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+空间杜宾模型 (SDM) 的极大似然估计
+    Y = ρWY + Xβ + WXθ + ε,  ε ~ N(0, σ²I)
+β、θ、σ² 被集中(concentrate)出似然函数，只对 ρ 做一维优化；
+对数行列式 log|I − ρW| 按区域数选择计算方法：
+    - eigen      预先求出W的特征值，log|I − ρW| = Σ log(1 − ρλ)，适合小样本
+    - lu         对稀疏矩阵 I − ρW 做LU分解，适合数千个区域
+    - chebyshev  Chebyshev多项式近似，W的幂的迹只随机估计一次，适合更大的样本
+直接效应、间接效应和总效应由 (I − ρW)^{-1} 的幂级数展开和W幂的迹求出，
+并从参数的渐近分布中抽样得到标准误
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import optimize, sparse, stats
+from scipy.sparse import linalg as splinalg
+
+from analysis_data import RAW_DIR, align_panel, design_matrix, load_regional_panel, load_spatial_weights
+from rng_service import make_rng
+
+# 区域数不超过此值时用特征值法计算对数行列式和W幂的迹
+EIGEN_MAX_N = 1000
+
+# 幂级数展开阶数（计算效应）和Chebyshev近似阶数
+SERIES_ORDER = 100
+CHEBYSHEV_ORDER = 30
+
+# 随机估计迹时的随机向量个数
+TRACE_VECTORS = 50
+
+# 默认模型：GDP增长率对失业率、关税战后期、贸易依存度及其交互项回归
+DEFAULT_DEPENDENT = 'gdp_growth'
+DEFAULT_REGRESSORS = ['unemployment_rate', 'tariff_war', 'trade_dependency', 'tariff_war:trade_dependency']
+
+def _spectral_radius(W):
+    """W的谱半径（行标准化矩阵为1，否则用稀疏迭代求解）"""
+    row_sums = np.asarray(W.sum(axis=1)).ravel()
+    if np.allclose(row_sums[np.diff(W.indptr) > 0], 1.0) and (W.data >= 0).all():
+        return 1.0
+    return float(abs(splinalg.eigs(W, k=1, which='LM', return_eigenvectors=False)[0]))
+
+def power_traces(W, order=SERIES_ORDER, n_vectors=TRACE_VECTORS, eigenvalues=None, seed=None):
+    """
+    W的各次幂的平均迹 tr(W^j)/n 和平均行和 mean(W^j 1)，j = 0..order
+
+    有特征值时迹为精确值；否则 j ≤ 2 精确计算，更高次用随机向量估计（Hutchinson估计）
+
+    Parameters
+    ----------
+    W : scipy.sparse.csr_matrix
+        (n × n) 权重矩阵
+    order : int, optional
+        最高次数
+    n_vectors : int, optional
+        随机估计所用的向量个数
+    eigenvalues : numpy.ndarray, optional
+        W的全部特征值
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (平均迹, 平均行和)，长度均为 order + 1
+    """
+    n = W.shape[0]
+    row_means = np.empty(order + 1)
+    ones = np.ones(n)
+    for j in range(order + 1):
+        row_means[j] = ones.mean()
+        ones = W @ ones
+
+    if eigenvalues is not None:
+        powers = np.power.outer(eigenvalues, np.arange(order + 1))
+        return powers.sum(axis=0).real / n, row_means
+
+    rng = make_rng(seed)
+    u = rng.choice([-1.0, 1.0], size=(n, n_vectors))
+    v = u.copy()
+    traces = np.empty(order + 1)
+    for j in range(order + 1):
+        traces[j] = np.einsum('ij,ij->', u, v) / (n * n_vectors)
+        v = W @ v
+    traces[0] = 1.0
+    traces[1] = W.diagonal().sum() / n
+    if order >= 2:
+        traces[2] = W.multiply(W.T).sum() / n
+    return traces, row_means
+
+class LogDeterminant:
+    """
+    对数行列式 log|I − ρW| 的计算器
+
+    Parameters
+    ----------
+    W : scipy.sparse matrix
+        (n × n) 权重矩阵
+    method : str, optional
+        'eigen'、'lu'、'chebyshev'，'auto' 时区域数不超过 EIGEN_MAX_N 用 eigen，否则用 lu
+    order : int, optional
+        Chebyshev近似阶数
+    n_vectors : int, optional
+        Chebyshev近似中随机估计迹的向量个数
+    seed : int, optional
+        随机种子
+    """
+
+    def __init__(self, W, method='auto', order=CHEBYSHEV_ORDER, n_vectors=TRACE_VECTORS, seed=None):
+        self.W = sparse.csr_matrix(W, dtype=float)
+        self.n = self.W.shape[0]
+        if method == 'auto':
+            method = 'eigen' if self.n <= EIGEN_MAX_N else 'lu'
+        if method not in ('eigen', 'lu', 'chebyshev'):
+            raise ValueError(f"未知的对数行列式计算方法: {method}")
+        self.method = method
+        self.eigenvalues = None
+        self.radius = None
+
+        if method == 'eigen':
+            self.eigenvalues = np.linalg.eigvals(self.W.toarray())
+            real = self.eigenvalues.real
+            self.bounds = (1 / min(real.min(), -1e-6), 1 / real.max())
+        else:
+            self.radius = _spectral_radius(self.W)
+            self.bounds = (-1 / self.radius, 1 / self.radius)
+
+        if method == 'chebyshev':
+            # W 按谱半径缩放为 S = W / r（特征值落在 [−1, 1]），log|I − ρW| = log|I − (ρr)S|；
+            # 在 Chebyshev 节点上拟合 log(1 − ρr·x)，x ∈ [−1, 1]，迹 tr(T_j(S)) 只估计一次
+            S = self.W / self.radius
+            nodes = np.cos(np.pi * (np.arange(order + 1) + 0.5) / (order + 1))
+            self._nodes = nodes
+            self._basis = np.cos(np.outer(np.arange(order + 1), np.arccos(nodes)))
+            rng = make_rng(seed)
+            u = rng.choice([-1.0, 1.0], size=(self.n, n_vectors))
+            previous, current = u, S @ u
+            traces = [float(self.n), S.diagonal().sum()]
+            for _ in range(2, order + 1):
+                previous, current = current, 2 * (S @ current) - previous
+                traces.append(np.einsum('ij,ij->', u, current) / n_vectors)
+            if order >= 2:
+                # tr(T_2(S)) = 2·tr(S²) − n 可精确计算
+                traces[2] = 2 * S.multiply(S.T).sum() - self.n
+            self._chebyshev_traces = np.array(traces)
+
+    def __call__(self, rho):
+        if self.method == 'eigen':
+            return float(np.sum(np.log(1 - rho * self.eigenvalues)).real)
+        if self.method == 'lu':
+            A = (sparse.identity(self.n, format='csc') - rho * self.W).tocsc()
+            return float(np.sum(np.log(np.abs(splinalg.splu(A).U.diagonal()))))
+        values = np.log(1 - rho * self.radius * self._nodes)
+        coefficients = 2 / len(self._nodes) * (self._basis @ values)
+        coefficients[0] /= 2
+        return float(coefficients @ self._chebyshev_traces)
+
+    def second_derivative(self, rho, step=1e-4):
+        """d² log|I − ρW| / dρ² = −tr((W(I − ρW)^{-1})²)，中心差分"""
+        return (self(rho + step) - 2 * self(rho) + self(rho - step)) / step ** 2
+
+def _ols(Z, y):
+    return np.linalg.lstsq(Z, y, rcond=None)[0]
+
+def fit_spatial_durbin(y, X, weights, periods=1, names=None, logdet_method='auto',
+                       effects_draws=1000, seed=None):
+    """
+    极大似然估计空间杜宾模型
+
+    面板数据按时期堆叠（每个时期内的区域顺序与权重矩阵一致），
+    整体权重矩阵为 I_T ⊗ W，对数行列式为 T·log|I − ρW|
+
+    Parameters
+    ----------
+    y : array-like
+        (n·T,) 被解释变量
+    X : array-like
+        (n·T × k) 解释变量（不含常数项，自动加入；WX 不含常数项）
+    weights : SpatialWeights or scipy.sparse matrix
+        (n × n) 空间权重，通常已行标准化
+    periods : int, optional
+        时期数 T
+    names : list of str, optional
+        解释变量名
+    logdet_method : str, optional
+        对数行列式计算方法，见 LogDeterminant
+    effects_draws : int, optional
+        计算效应标准误的抽样次数，为0时不计算标准误
+    seed : int, optional
+        随机种子（效应抽样和随机迹估计）
+
+    Returns
+    -------
+    dict
+        coefficients（β、θ、ρ的估计值、标准误、z值和p值）、
+        effects（各解释变量的直接、间接和总效应）、rho、sigma2、log_likelihood、aic、
+        n_obs、logdet_method
+    """
+    W = sparse.csr_matrix(getattr(weights, 'matrix', weights), dtype=float)
+    n = W.shape[0]
+    y = np.asarray(y, dtype=float).ravel()
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    k = X.shape[1]
+    names = list(names) if names is not None else [f"x{i + 1}" for i in range(k)]
+    N = n * periods
+    if len(y) != N:
+        raise ValueError(f"观测数 {len(y)} 与 区域数 {n} × 时期数 {periods} 不符")
+
+    def lag(values):
+        # (I_T ⊗ W) 作用于按时期堆叠的向量或矩阵
+        stacked = values.reshape(periods, n, -1)
+        return np.concatenate([W @ block for block in stacked]).reshape(values.shape)
+
+    # 各区域取值相同的变量（如年份虚拟变量）经行标准化W滞后后不变，与自身共线，不加入WX
+    WX = lag(X)
+    lagged = ~np.all(np.isclose(WX, X), axis=0)
+    Wy = lag(y)
+    Z = np.column_stack([np.ones(N), X, WX[:, lagged]])
+    logdet = LogDeterminant(W, logdet_method, seed=seed)
+
+    # 集中似然：e(ρ) = e0 − ρ·ed，其中 e0、ed 分别为 y、Wy 对 Z 回归的残差
+    b0, bd = _ols(Z, y), _ols(Z, Wy)
+    e0, ed = y - Z @ b0, Wy - Z @ bd
+    e0e0, e0ed, eded = e0 @ e0, e0 @ ed, ed @ ed
+
+    def negative_concentrated(rho):
+        ssr = e0e0 - 2 * rho * e0ed + rho ** 2 * eded
+        return N / 2 * np.log(ssr / N) - periods * logdet(rho)
+
+    low, high = logdet.bounds
+    margin = 1e-4 * (high - low)
+    rho = optimize.minimize_scalar(negative_concentrated, bounds=(low + margin, high - margin),
+                                   method='bounded', options={'xatol': 1e-8}).x
+    coef = b0 - rho * bd
+    residuals = y - rho * Wy - Z @ coef
+    sigma2 = residuals @ residuals / N
+    log_likelihood = -N / 2 * (np.log(2 * np.pi * sigma2) + 1) + periods * logdet(rho)
+
+    # 渐近方差：(coef, ρ, σ²) 对数似然的Hessian矩阵之逆
+    p = Z.shape[1]
+    hessian = np.zeros((p + 2, p + 2))
+    hessian[:p, :p] = -Z.T @ Z / sigma2
+    hessian[:p, p] = hessian[p, :p] = -Z.T @ Wy / sigma2
+    hessian[p, p] = periods * logdet.second_derivative(rho) - Wy @ Wy / sigma2
+    hessian[p, p + 1] = hessian[p + 1, p] = -Wy @ residuals / sigma2 ** 2
+    hessian[p + 1, p + 1] = -N / (2 * sigma2 ** 2)
+    covariance = np.linalg.inv(-hessian)
+
+    estimates = np.append(coef, rho)
+    std_errors = np.sqrt(np.diag(covariance)[:p + 1])
+    z = estimates / std_errors
+    coefficients = pd.DataFrame({
+        'variable': ['const'] + names + [f"W*{name}" for name, lag_term in zip(names, lagged) if lag_term] + ['rho'],
+        'estimate': estimates,
+        'std_error': std_errors,
+        'z': z,
+        'p_value': 2 * stats.norm.sf(np.abs(z)),
+    })
+
+    # 效应参数 (β, θ, ρ)，未加入WX的变量 θ = 0
+    selection = np.zeros((2 * k + 1, p + 1))
+    selection[np.arange(k), 1 + np.arange(k)] = 1
+    selection[k + np.flatnonzero(lagged), 1 + k + np.arange(lagged.sum())] = 1
+    selection[2 * k, p] = 1
+    parameters = selection @ estimates
+    effects = spatial_effects(W, parameters[:k], parameters[k:2 * k], rho, names,
+                              covariance=selection @ covariance[:p + 1, :p + 1] @ selection.T if effects_draws else None,
+                              draws=effects_draws, eigenvalues=logdet.eigenvalues,
+                              bounds=logdet.bounds, seed=seed)
+
+    return {
+        'coefficients': coefficients,
+        'effects': effects,
+        'rho': rho,
+        'sigma2': sigma2,
+        'log_likelihood': log_likelihood,
+        'aic': -2 * log_likelihood + 2 * (p + 2),
+        'n_obs': N,
+        'logdet_method': logdet.method,
+    }
+
+def spatial_effects(W, beta, theta, rho, names, covariance=None, draws=1000,
+                    eigenvalues=None, bounds=(-1, 1), order=SERIES_ORDER, seed=None):
+    """
+    空间杜宾模型的直接效应、间接效应和总效应
+
+    S_k = (I − ρW)^{-1}(β_k I + θ_k W) = Σ_j ρ^j (β_k W^j + θ_k W^{j+1})，
+    直接效应为 S_k 对角线的均值，总效应为 S_k 行和的均值，间接效应 = 总效应 − 直接效应
+
+    Parameters
+    ----------
+    W : scipy.sparse matrix
+        (n × n) 权重矩阵
+    beta, theta : array-like
+        X 和 WX 的系数
+    rho : float
+        空间滞后系数
+    names : list of str
+        解释变量名
+    covariance : numpy.ndarray, optional
+        (β, θ, ρ) 的协方差矩阵，给出时抽样计算标准误
+    draws : int, optional
+        抽样次数
+    eigenvalues : numpy.ndarray, optional
+        W的特征值（有则精确计算迹）
+    bounds : tuple, optional
+        ρ的取值范围，抽样时截断
+    order : int, optional
+        幂级数展开阶数
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    pandas.DataFrame
+        variable、direct、indirect、total 列；有协方差矩阵时另有各效应的标准误和p值
+    """
+    traces, row_means = power_traces(W, order + 1, eigenvalues=eigenvalues, seed=seed)
+    k = len(names)
+
+    def effects_of(parameters):
+        # parameters: (m × (2k + 1)) 每行为 (β, θ, ρ)
+        b, t, r = parameters[:, :k], parameters[:, k:2 * k], parameters[:, 2 * k]
+        powers = np.power.outer(r, np.arange(order + 1))
+        direct = b * (powers @ traces[:-1])[:, None] + t * (powers @ traces[1:])[:, None]
+        total = b * (powers @ row_means[:-1])[:, None] + t * (powers @ row_means[1:])[:, None]
+        return direct, total - direct, total
+
+    point = np.concatenate([beta, theta, [rho]])[None, :]
+    direct, indirect, total = (values[0] for values in effects_of(point))
+    table = pd.DataFrame({'variable': names, 'direct': direct, 'indirect': indirect, 'total': total})
+
+    if covariance is not None and draws:
+        rng = make_rng(seed)
+        sample = rng.multivariate_normal(point[0], covariance, size=draws)
+        sample[:, -1] = np.clip(sample[:, -1], bounds[0] + 1e-6, bounds[1] - 1e-6)
+        for label, values in zip(('direct', 'indirect', 'total'), effects_of(sample)):
+            std_error = values.std(axis=0, ddof=1)
+            table[f"{label}_std_error"] = std_error
+            table[f"{label}_p_value"] = 2 * stats.norm.sf(np.abs(table[label] / std_error))
+    return table
+
+def estimate_regional_sdm(dependent=DEFAULT_DEPENDENT, regressors=DEFAULT_REGRESSORS, years=None,
+                          data_dir=RAW_DIR, logdet_method='auto', effects_draws=1000, seed=None):
+    """
+    用 regional_economic_data 和 regional_spatial_weights 估计区域面板空间杜宾模型
+
+    Parameters
+    ----------
+    dependent : str, optional
+        被解释变量列名
+    regressors : list of str, optional
+        解释变量列名，'a:b' 表示交互项，tariff_war 为关税战后期虚拟变量
+    years : sequence of int, optional
+        只使用这些年份
+    data_dir : str, optional
+        数据目录
+    logdet_method : str, optional
+        对数行列式计算方法
+    effects_draws : int, optional
+        计算效应标准误的抽样次数
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    dict
+        见 fit_spatial_durbin
+    """
+    panel, weights, periods = align_panel(load_regional_panel(data_dir, years), load_spatial_weights(data_dir))
+    X = design_matrix(panel, regressors)
+    return fit_spatial_durbin(panel[dependent].to_numpy(dtype=float), X.to_numpy(), weights,
+                              periods=periods, names=list(X.columns), logdet_method=logdet_method,
+                              effects_draws=effects_draws, seed=seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="区域面板空间杜宾模型估计")
+    parser.add_argument('-y', '--dependent', default=DEFAULT_DEPENDENT, help="被解释变量")
+    parser.add_argument('-x', '--regressor', action='append', dest='regressors', default=None,
+                        help="解释变量（'a:b' 表示交互项），可重复指定")
+    parser.add_argument('--years', type=int, nargs='+', default=None, help="只使用这些年份")
+    parser.add_argument('--logdet', choices=['auto', 'eigen', 'lu', 'chebyshev'], default='auto',
+                        help="对数行列式计算方法")
+    parser.add_argument('--data-dir', default=RAW_DIR, help="数据目录")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    args = parser.parse_args()
+
+    result = estimate_regional_sdm(args.dependent, args.regressors or DEFAULT_REGRESSORS, args.years,
+                                   args.data_dir, args.logdet, seed=args.seed)
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(f"空间杜宾模型: {args.dependent}  N={result['n_obs']}  "
+              f"logLik={result['log_likelihood']:.3f}  AIC={result['aic']:.3f}  "
+              f"σ²={result['sigma2']:.4f}  log|I-ρW|: {result['logdet_method']}")
+        print(result['coefficients'].round(4).to_string(index=False))
+        print("\n效应分解:")
+        print(result['effects'].round(4).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+向量自回归 (VAR) 模型与脉冲响应分析
+    y_t = c + A_1 y_{t-1} + ... + A_p y_{t-p} + u_t,  Cov(u_t) = Σ
+滞后阶数按 AIC/BIC/HQ/FPE 选择；由移动平均系数 Φ_h 计算正交化脉冲响应 (Φ_h P，P 为 Σ 的
+Cholesky 因子)、广义脉冲响应 (Pesaran-Shin，Φ_h Σ e_j / √σ_jj) 和预测误差方差分解。
+置信带由残差自助法得到：所有重复样本同时递推生成 (重复 × 时期 × 变量) 数组，
+批量估计和批量计算脉冲响应；重复样本按批分配到多个进程，各批种子由总种子派生，
+结果与进程数无关
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from analysis_data import OUTPUT_DIR, RAW_DIR, load_monthly_series
+from data_store import save_table
+from rng_service import make_rng
+
+# 默认内生变量（顺序即Cholesky分解的识别顺序）：风险 → 贸易 → 消费者信心 → 舆论情绪
+DEFAULT_VARIABLES = ['conflict_risk', 'us_imports_millions', 'us_exports_millions',
+                     'us_consumer_confidence', 'net_sentiment']
+
+# 取对数的变量
+LOG_VARIABLES = ['us_imports_millions', 'us_exports_millions']
+
+MAX_LAGS = 6
+HORIZONS = 12
+BOOTSTRAP_REPLICATIONS = 2000
+BOOTSTRAP_BATCH = 250
+
+def lag_matrix(Y, lags):
+    """
+    VAR回归的解释变量矩阵 [1, y_{t-1}, ..., y_{t-p}]
+
+    Parameters
+    ----------
+    Y : numpy.ndarray
+        (..., T × k) 数据，前面的维度为批量维度
+    lags : int
+        滞后阶数
+
+    Returns
+    -------
+    numpy.ndarray
+        (..., (T − p) × (1 + k·p))
+    """
+    T = Y.shape[-2]
+    blocks = [Y[..., lags - j:T - j, :] for j in range(1, lags + 1)]
+    ones = np.ones(Y.shape[:-2] + (T - lags, 1))
+    return np.concatenate([ones] + blocks, axis=-1)
+
+def _ols(X, Y):
+    """批量OLS：X (..., n × m)，Y (..., n × k) -> 系数 (..., m × k)"""
+    return np.linalg.solve(np.swapaxes(X, -1, -2) @ X, np.swapaxes(X, -1, -2) @ Y)
+
+def select_lag_order(Y, max_lags=MAX_LAGS):
+    """
+    按信息准则选择滞后阶数（各阶数使用相同的样本，即从第 max_lags+1 期开始）
+
+    Parameters
+    ----------
+    Y : array-like
+        (T × k) 数据
+    max_lags : int, optional
+        最大滞后阶数
+
+    Returns
+    -------
+    tuple
+        (各阶数的 aic、bic、hq、fpe 表, 各准则选择的阶数 dict)
+    """
+    Y = np.asarray(Y, dtype=float)
+    k = Y.shape[1]
+    full = lag_matrix(Y, max_lags)
+    target = Y[max_lags:]
+    n = len(target)
+    rows = []
+    for p in range(1, max_lags + 1):
+        X = full[:, :1 + k * p]
+        residuals = target - X @ _ols(X, target)
+        _, logdet = np.linalg.slogdet(residuals.T @ residuals / n)
+        m = k * (k * p + 1)
+        rows.append({
+            'lags': p,
+            'aic': logdet + 2 * m / n,
+            'bic': logdet + m * np.log(n) / n,
+            'hq': logdet + 2 * m * np.log(np.log(n)) / n,
+            'fpe': np.exp(logdet) * ((n + k * p + 1) / (n - k * p - 1)) ** k,
+        })
+    table = pd.DataFrame(rows)
+    selected = {criterion: int(table.loc[table[criterion].idxmin(), 'lags'])
+                for criterion in ('aic', 'bic', 'hq', 'fpe')}
+    return table, selected
+
+def fit_var(Y, lags):
+    """
+    OLS估计VAR(p)
+
+    Parameters
+    ----------
+    Y : array-like
+        (T × k) 数据
+    lags : int
+        滞后阶数
+
+    Returns
+    -------
+    dict
+        intercept (k,)、coefs (p × k × k，coefs[j] 为 A_{j+1})、sigma（自由度调整的残差协方差）、
+        residuals、lags
+    """
+    Y = np.asarray(Y, dtype=float)
+    k = Y.shape[1]
+    X = lag_matrix(Y, lags)
+    B = _ols(X, Y[lags:])
+    residuals = Y[lags:] - X @ B
+    df = len(residuals) - k * lags - 1
+    return {
+        'intercept': B[0],
+        'coefs': B[1:].reshape(lags, k, k).transpose(0, 2, 1),
+        'sigma': residuals.T @ residuals / df,
+        'residuals': residuals,
+        'lags': lags,
+    }
+
+def ma_coefficients(coefs, horizons=HORIZONS):
+    """
+    移动平均系数 Φ_0 = I，Φ_h = Σ_{j=1}^{min(h,p)} A_j Φ_{h−j}
+
+    Parameters
+    ----------
+    coefs : numpy.ndarray
+        (..., p × k × k) VAR系数，前面的维度为批量维度
+    horizons : int, optional
+        最大期数
+
+    Returns
+    -------
+    numpy.ndarray
+        (..., (horizons + 1) × k × k)
+    """
+    p, k = coefs.shape[-3], coefs.shape[-1]
+    phi = np.zeros(coefs.shape[:-3] + (horizons + 1, k, k))
+    phi[..., 0, :, :] = np.eye(k)
+    for h in range(1, horizons + 1):
+        for j in range(1, min(h, p) + 1):
+            phi[..., h, :, :] += coefs[..., j - 1, :, :] @ phi[..., h - j, :, :]
+    return phi
+
+def impulse_responses(coefs, sigma, horizons=HORIZONS):
+    """
+    正交化和广义脉冲响应
+
+    Parameters
+    ----------
+    coefs : numpy.ndarray
+        (..., p × k × k) VAR系数
+    sigma : numpy.ndarray
+        (..., k × k) 残差协方差
+    horizons : int, optional
+        最大期数
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (正交化, 广义)，均为 (..., (horizons + 1) × k × k)，[h, i, j] 为变量i对变量j的一个标准差冲击在第h期的响应
+    """
+    phi = ma_coefficients(coefs, horizons)
+    chol = np.linalg.cholesky(sigma)
+    orthogonal = phi @ chol[..., None, :, :]
+    scale = np.sqrt(np.diagonal(sigma, axis1=-2, axis2=-1))[..., None, None, :]
+    generalized = (phi @ sigma[..., None, :, :]) / scale
+    return orthogonal, generalized
+
+def variance_decomposition(orthogonal):
+    """
+    预测误差方差分解：[h, i, j] 为第 h+1 步预测中变量i的误差方差来自变量j冲击的比例
+
+    Parameters
+    ----------
+    orthogonal : numpy.ndarray
+        (..., (H + 1) × k × k) 正交化脉冲响应
+
+    Returns
+    -------
+    numpy.ndarray
+        与输入形状相同，每行之和为1
+    """
+    cumulative = np.cumsum(orthogonal ** 2, axis=-3)
+    return cumulative / cumulative.sum(axis=-1, keepdims=True)
+
+def _bootstrap_batch(Y, intercept, coefs, residuals, horizons, replications, seed):
+    """一批残差自助：递推生成重复样本，批量重新估计，返回正交化和广义脉冲响应"""
+    rng = np.random.default_rng(seed)
+    p, k = coefs.shape[0], coefs.shape[1]
+    T = len(Y)
+    centered = residuals - residuals.mean(axis=0)
+    draws = centered[rng.integers(0, len(centered), (replications, T - p))]
+
+    samples = np.empty((replications, T, k))
+    samples[:, :p] = Y[:p]
+    for t in range(p, T):
+        value = intercept + draws[:, t - p]
+        for j in range(p):
+            value = value + samples[:, t - j - 1] @ coefs[j].T
+        samples[:, t] = value
+
+    X = lag_matrix(samples, p)
+    B = _ols(X, samples[:, p:])
+    resid = samples[:, p:] - X @ B
+    sigma = np.swapaxes(resid, 1, 2) @ resid / (T - p - k * p - 1)
+    boot_coefs = B[:, 1:].reshape(replications, p, k, k).transpose(0, 1, 3, 2)
+    return impulse_responses(boot_coefs, sigma, horizons)
+
+def bootstrap_bands(Y, fit, horizons=HORIZONS, replications=BOOTSTRAP_REPLICATIONS, level=0.95,
+                    workers=None, seed=None):
+    """
+    残差自助法的脉冲响应置信带（百分位法）
+
+    Parameters
+    ----------
+    Y : array-like
+        (T × k) 数据
+    fit : dict
+        fit_var 的结果
+    horizons : int, optional
+        最大期数
+    replications : int, optional
+        重复次数
+    level : float, optional
+        置信水平
+    workers : int, optional
+        并行进程数，None 为CPU核心数
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    dict
+        orthogonal、generalized、fevd 各为 (下限, 上限)
+    """
+    Y = np.asarray(Y, dtype=float)
+    sizes = [min(BOOTSTRAP_BATCH, replications - start) for start in range(0, replications, BOOTSTRAP_BATCH)]
+    seeds = make_rng(seed).integers(0, 2**63 - 1, len(sizes))
+    args = [(Y, fit['intercept'], fit['coefs'], fit['residuals'], horizons, size, batch_seed)
+            for size, batch_seed in zip(sizes, seeds)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as executor:
+            batches = list(executor.map(_bootstrap_batch, *zip(*args)))
+    else:
+        batches = [_bootstrap_batch(*arg) for arg in args]
+
+    orthogonal = np.concatenate([batch[0] for batch in batches])
+    generalized = np.concatenate([batch[1] for batch in batches])
+    quantiles = [(1 - level) / 2, (1 + level) / 2]
+    return {
+        name: tuple(np.quantile(values, quantiles, axis=0))
+        for name, values in (('orthogonal', orthogonal), ('generalized', generalized),
+                             ('fevd', variance_decomposition(orthogonal)))
+    }
+
+def analyze_var(Y, variables, lags=None, criterion='aic', max_lags=MAX_LAGS, horizons=HORIZONS,
+                replications=BOOTSTRAP_REPLICATIONS, level=0.95, workers=None, seed=None):
+    """
+    VAR完整分析：滞后阶数选择、估计、脉冲响应、方差分解和自助置信带
+
+    Parameters
+    ----------
+    Y : array-like
+        (T × k) 数据，列顺序即Cholesky识别顺序
+    variables : list of str
+        变量名
+    lags : int, optional
+        滞后阶数，默认按 criterion 选择
+    criterion : str, optional
+        'aic'、'bic'、'hq' 或 'fpe'
+    max_lags : int, optional
+        最大滞后阶数
+    horizons : int, optional
+        脉冲响应期数
+    replications : int, optional
+        自助重复次数，为0时不计算置信带
+    level : float, optional
+        置信水平
+    workers : int, optional
+        并行进程数
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    dict
+        variables、lag_selection、selected_lags、lags、fit、orthogonal、generalized、fevd、bands
+    """
+    Y = np.asarray(Y, dtype=float)
+    lag_table, selected = select_lag_order(Y, max_lags)
+    lags = lags or selected[criterion]
+    fit = fit_var(Y, lags)
+    orthogonal, generalized = impulse_responses(fit['coefs'], fit['sigma'], horizons)
+    return {
+        'variables': list(variables),
+        'lag_selection': lag_table,
+        'selected_lags': selected,
+        'lags': lags,
+        'fit': fit,
+        'orthogonal': orthogonal,
+        'generalized': generalized,
+        'fevd': variance_decomposition(orthogonal),
+        'bands': bootstrap_bands(Y, fit, horizons, replications, level, workers, seed) if replications else None,
+    }
+
+def response_table(result):
+    """
+    将脉冲响应和方差分解展开为长表
+
+    Returns
+    -------
+    pandas.DataFrame
+        kind（orthogonal / generalized / fevd）、response、impulse、horizon、value 以及 lower、upper
+    """
+    variables = result['variables']
+    k = len(variables)
+    tables = []
+    for kind in ('orthogonal', 'generalized', 'fevd'):
+        values = result[kind]
+        H = values.shape[0]
+        table = pd.DataFrame({
+            'kind': kind,
+            'response': np.tile(np.repeat(variables, k), H),
+            'impulse': np.tile(variables, H * k),
+            'horizon': np.repeat(np.arange(H), k * k),
+            'value': values.ravel(),
+        })
+        if result['bands'] is not None:
+            table['lower'] = result['bands'][kind][0].ravel()
+            table['upper'] = result['bands'][kind][1].ravel()
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)
+
+def monthly_var_data(variables=DEFAULT_VARIABLES, difference=False, data_dir=RAW_DIR):
+    """
+    由月度贸易、消费者信心、社交媒体情绪（周度按月平均）和综合风险指数构造内生变量矩阵
+
+    Parameters
+    ----------
+    variables : list of str, optional
+        变量（见 analysis_data.load_monthly_series），贸易额取对数
+    difference : bool, optional
+        是否一阶差分
+    data_dir : str, optional
+        数据目录
+
+    Returns
+    -------
+    pandas.DataFrame
+        以月度 Period 为索引
+    """
+    series = load_monthly_series(data_dir)[list(variables)]
+    for column in series.columns.intersection(LOG_VARIABLES):
+        series[column] = np.log(series[column])
+    if difference:
+        series = series.diff().iloc[1:]
+    return series
+
+def main():
+    parser = argparse.ArgumentParser(description="关税、贸易、消费者信心、舆论和冲突风险的VAR脉冲响应分析")
+    parser.add_argument('-v', '--variable', action='append', dest='variables', default=None,
+                        help="内生变量（顺序即Cholesky识别顺序），可重复指定")
+    parser.add_argument('-p', '--lags', type=int, default=None, help="滞后阶数（默认按信息准则选择）")
+    parser.add_argument('--criterion', choices=['aic', 'bic', 'hq', 'fpe'], default='aic', help="滞后阶数选择准则")
+    parser.add_argument('--difference', action='store_true', help="对变量做一阶差分")
+    parser.add_argument('--horizons', type=int, default=HORIZONS, help="脉冲响应期数")
+    parser.add_argument('-b', '--replications', type=int, default=BOOTSTRAP_REPLICATIONS, help="自助重复次数")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="并行进程数（默认为CPU核心数）")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子")
+    parser.add_argument('--data-dir', default=RAW_DIR, help="数据目录")
+    parser.add_argument('--save', action='store_true', help=f"将脉冲响应长表保存到 {OUTPUT_DIR}")
+    args = parser.parse_args()
+
+    data = monthly_var_data(args.variables or DEFAULT_VARIABLES, args.difference, args.data_dir)
+    result = analyze_var(data.to_numpy(), list(data.columns), args.lags, args.criterion,
+                         horizons=args.horizons, replications=args.replications,
+                         workers=args.workers, seed=args.seed)
+    print(f"样本: {data.index[0]} 至 {data.index[-1]}，{len(data)} 期；滞后阶数 p={result['lags']} "
+          f"（{', '.join(f'{c}={p}' for c, p in result['selected_lags'].items())}）")
+    print(result['lag_selection'].round(4).to_string(index=False))
+
+    table = response_table(result)
+    fevd = table[(table['kind'] == 'fevd') & (table['horizon'] == args.horizons)]
+    print(f"\n第 {args.horizons + 1} 步预测误差方差分解（行：响应变量，列：冲击来源）:")
+    print(fevd.pivot(index='response', columns='impulse', values='value')
+          .reindex(index=result['variables'], columns=result['variables']).round(3).to_string())
+
+    if args.save:
+        path = save_table(table, OUTPUT_DIR, 'var_impulse_responses.csv')
+        print(f"\n脉冲响应已保存至: {path}")
+
+if __name__ == "__main__":
+    main()
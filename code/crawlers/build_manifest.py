@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据构建清单（增量生成）
+记录每个爬虫任务的输入文件哈希、参数、随机种子和代码哈希，以及生成文件的哈希。
+再次运行时，输入、参数和代码均未变化且输出文件完好的任务直接复用已有数据
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+from data_store import artifact_files, find_artifact, storage_options
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_DATA_DIR = os.path.join(BASE_DIR, 'data', 'raw')
+MANIFEST_FILE = os.path.join(BASE_DIR, 'data', 'build_manifest.json')
+MANIFEST_VERSION = 1
+
+# 被所有爬虫任务共用的辅助模块，其代码变化会使全部任务失效
+SHARED_SOURCES = ['data_store.py', 'rng_service.py']
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    计算文件内容的SHA-256哈希
+
+    Parameters
+    ----------
+    path : str
+        文件路径
+    chunk_size : int, optional
+        分块读取大小（字节）
+
+    Returns
+    -------
+    str or None
+        十六进制哈希值，文件不存在时返回None
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(path=MANIFEST_FILE):
+    """读取构建清单，文件不存在或版本不符时返回空清单"""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+    return {'version': MANIFEST_VERSION, 'tasks': {}}
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """保存构建清单（先写临时文件再替换，避免中断时损坏）"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+class BuildManifest:
+    """
+    构建清单的读写封装
+
+    Parameters
+    ----------
+    path : str, optional
+        清单文件路径
+    raw_dir : str, optional
+        数据文件目录
+    seed : int, optional
+        本次运行的随机种子，会计入任务指纹
+    storage : dict, optional
+        本次运行的存储设置（见 data_store.storage_options），会计入任务指纹
+    """
+
+    def __init__(self, path=MANIFEST_FILE, raw_dir=RAW_DATA_DIR, seed=None, storage=None):
+        self.path = path
+        self.raw_dir = raw_dir
+        self.seed = seed
+        self.storage = storage or storage_options()
+        self.manifest = load_manifest(path)
+        self._code_hashes = {}
+        self._fingerprints = {}
+
+    def code_hash(self, task):
+        """任务所在模块、共用辅助模块及任务声明的额外源文件(sources)的哈希"""
+        if task['name'] not in self._code_hashes:
+            digest = hashlib.sha256()
+            sources = [os.path.join(CRAWLER_DIR, f"{task['module']}.py")]
+            sources += [os.path.join(CRAWLER_DIR, name) for name in SHARED_SOURCES]
+            sources += [os.path.join(CRAWLER_DIR, name) for name in task.get('sources', [])]
+            for source in sources:
+                digest.update(os.path.basename(source).encode('utf-8'))
+                digest.update((file_hash(source) or '').encode('utf-8'))
+            self._code_hashes[task['name']] = digest.hexdigest()
+        return self._code_hashes[task['name']]
+
+    def input_hash(self, artifact):
+        """输入数据文件的哈希（按存储格式查找实际文件）"""
+        path = find_artifact(self.raw_dir, artifact, self.storage['format'])
+        return file_hash(path) if path is not None else None
+
+    def output_hashes(self, task):
+        """任务在当前存储设置下实际写出的各文件的哈希"""
+        return {name: file_hash(os.path.join(self.raw_dir, name))
+                for artifact in task.get('writes', [])
+                for name in artifact_files(artifact, **self.storage)}
+
+    def fingerprint(self, task):
+        """
+        计算任务指纹：输入文件哈希 + 调用参数 + 随机种子 + 代码哈希
+
+        须在上游任务完成后调用，以便读到最新的输入文件
+        """
+        inputs = {artifact: self.input_hash(artifact) for artifact in task.get('reads', [])}
+        key = {
+            'function': f"{task['module']}.{task['function']}",
+            'kwargs': task.get('kwargs', {}),
+            'seed': self.seed,
+            'storage': self.storage,
+            'code': self.code_hash(task),
+            'inputs': inputs,
+        }
+        fingerprint = hashlib.sha256(
+            json.dumps(key, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+        self._fingerprints[task['name']] = (fingerprint, inputs)
+        return fingerprint
+
+    def cached_result(self, task):
+        """
+        检查任务是否可复用已有数据
+
+        Returns
+        -------
+        dict or None
+            可复用时返回记录的运行统计（cached为True），否则返回None
+        """
+        fingerprint = self.fingerprint(task)
+        entry = self.manifest['tasks'].get(task['name'])
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return None
+
+        # 输出文件须存在且未被改动
+        if entry.get('outputs', {}) != self.output_hashes(task):
+            return None
+
+        return {
+            'function': task['function'],
+            'records': entry.get('records', 0),
+            'elapsed': 0.0,
+            'cpu_time': 0.0,
+            'cached': True
+        }
+
+    def record(self, task, stats):
+        """任务成功后记录其指纹和输出文件哈希"""
+        if task['name'] not in self._fingerprints:
+            self.fingerprint(task)
+        fingerprint, inputs = self._fingerprints[task['name']]
+        self.manifest['tasks'][task['name']] = {
+            'fingerprint': fingerprint,
+            'function': f"{task['module']}.{task['function']}",
+            'kwargs': task.get('kwargs', {}),
+            'seed': self.seed,
+            'storage': self.storage,
+            'code_hash': self.code_hash(task),
+            'inputs': inputs,
+            'outputs': self.output_hashes(task),
+            'records': stats.get('records', 0),
+            'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def forget(self, task):
+        """任务失败时删除其记录，下次运行时重新生成"""
+        self.manifest['tasks'].pop(task['name'], None)
+
+    def save(self):
+        save_manifest(self.manifest, self.path)
@@ -12,21 +12,28 @@ import numpy as np
 import os
 import time
 from datetime import datetime
-import random
+
+from data_store import save_table
+from rng_service import make_rng
 
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def get_china_us_trade_data():
+def get_china_us_trade_data(with_categories=True, seed=None):
     """
     获取中美贸易数据
     
     由于中国海关总署网站的数据获取可能需要特殊权限，
     这里使用模拟数据来展示数据结构和分析流程
+    
+    参数:
+    - with_categories: 是否同时生成主要商品类别贸易数据（任务图中作为独立任务运行时为False）
+    - seed: 随机种子，默认使用随机数服务的根种子
     """
     print("开始生成中美贸易数据...")
+    rng = make_rng(seed, 'china_customs_monthly')
     
     # 生成月度时间序列，扩展到2025年4月
     date_range = pd.date_range(start='2017-01-01', end='2025-04-01', freq='MS')
@@ -86,8 +93,8 @@ def get_china_us_trade_data():
             shock *= easing_factor
         
         # 计算最终贸易额
-        export_value = base_export * trend * seasonal * shock * (1 + 0.1 * np.random.randn())
-        import_value = base_import * trend * seasonal * shock * (1 + 0.1 * np.random.randn())
+        export_value = base_export * trend * seasonal * shock * (1 + 0.1 * rng.standard_normal())
+        import_value = base_import * trend * seasonal * shock * (1 + 0.1 * rng.standard_normal())
         
         # 确保数值为正
         export_value = max(0, export_value)
@@ -102,16 +109,22 @@ def get_china_us_trade_data():
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(data)
-    df.to_csv(os.path.join(save_dir, 'china_us_trade_monthly.csv'), index=False, encoding='utf-8')
+    save_table(df, save_dir, 'china_us_trade_monthly.csv')
     
     # 生成主要商品类别贸易数据
-    generate_category_trade_data()
+    if with_categories:
+        generate_category_trade_data(seed=seed)
     
     print(f"中美贸易数据生成完成，已保存到: {save_dir}")
     return df
 
-def generate_category_trade_data():
-    """生成主要商品类别的贸易数据"""
+def generate_category_trade_data(seed=None):
+    """
+    生成主要商品类别的贸易数据
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子；每个类别使用独立的随机数流
+    """
     # 定义主要商品类别
     categories = [
         "电子设备及零件",
@@ -166,6 +179,7 @@ def generate_category_trade_data():
     all_data = []
     
     for category in categories:
+        rng = make_rng(seed, ('china_customs_category', category))
         base_export, base_import = category_base_values[category]
         sensitivity = tariff_sensitivity[category]
         
@@ -200,7 +214,7 @@ def generate_category_trade_data():
                 shock *= easing_factor
             
             # 添加随机波动
-            random_factor = 1 + 0.05 * np.random.randn()
+            random_factor = 1 + 0.05 * rng.standard_normal()
             
             # 计算最终贸易额
             export_value = base_export * trend * shock * random_factor
@@ -216,7 +230,7 @@ def generate_category_trade_data():
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(all_data)
-    df.to_csv(os.path.join(save_dir, 'china_us_trade_by_category.csv'), index=False, encoding='utf-8')
+    save_table(df, save_dir, 'china_us_trade_by_category.csv')
     
     return df
 
@@ -12,14 +12,32 @@ import numpy as np
 import os
 import time
 from datetime import datetime
-import random
+
+from tariff_line_engine import (BATCH_ROWS, CATEGORY, SUFFIX, choose, sample_tariff_lines, uniform_rounded,
+                                write_tariff_lines)
+from rng_service import make_rng
+from data_store import load_table, save_table
 
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def generate_china_tariff_data():
+# 各品类贸易额对关税的敏感系数（关税影响 = 覆盖率 × 税率 × 敏感系数）
+TRADE_SENSITIVITY = {
+    '大豆及油籽': 0.8,
+    '汽车及零部件': 0.6,
+    '电子产品及零部件': 0.4,
+    '飞机及航空设备': 0.2,  # 战略产品，敏感度低
+    '水果及坚果': 0.7,
+    '猪肉及肉制品': 0.5,  # 受非洲猪瘟影响，关税不是唯一因素
+    '化学品及原料': 0.4,
+    '医疗设备': 0.3,
+    '能源产品': 0.6,
+    '农产品其他': 0.7
+}
+
+def generate_china_tariff_data(with_summary=True, seed=None, scale=1, batch_rows=BATCH_ROWS):
     """
     生成中国对美国商品的反制关税清单数据
     
@@ -29,6 +47,17 @@ def generate_china_tariff_data():
     - 第三批：333个税目商品，约160亿美元 (2018年8月8日宣布，8月23日实施)
     - 第四批：大约5140个税目商品，约600亿美元 (2018年8月3日和9月18日宣布，9月24日实施)
     - 2024年新增关税 (模拟数据)
+    
+    参数:
+    - with_summary: 是否同时生成关税影响汇总数据（任务图中作为独立任务运行时为False）
+    - seed: 随机种子，相同种子生成相同的清单
+    - scale: 每轮商品数量的放大倍数，用于生成大规模压力测试数据
+    - batch_rows: 每批生成和写出的行数，清单逐批追加写出，内存占用与总行数无关
+    
+    返回:
+    - 已关闭的 TableWriter（path 为输出文件，rows 为写出行数）
+      注意：早期版本返回清单 DataFrame；清单现在逐批写出，不在内存中保留整张表，
+      需要 DataFrame 时使用 generate_china_data() 或 data_store.load_table(save_dir, 'china_tariffs_on_us.csv')
     """
     print("开始生成中国对美关税清单数据...")
     
@@ -187,93 +216,91 @@ def generate_china_tariff_data():
         '药品': ('30', '药品', 22)
     }
     
-    # 生成详细关税清单数据
-    all_tariff_items = []
+    # 商品描述模板（见 tariff_line_engine.render_template）
+    machinery_template = ['美国产', ('发动机', '电机', '泵', '阀门', '处理器', '存储器'), '，用于',
+                          ('工业', '农业', '商业', '民用')]
+    description_templates = {
+        '12': ['美国产', ('大豆', '花生', '葵花籽', '亚麻籽'), '，', ('用于食品加工', '用于饲料', '用于压榨油')],
+        '87': ['美国产', ('乘用车', '货车', '越野车'), '，', ('排量', '功率'), '为', range(1000, 5001), 'cc'],
+        '02': ['美国产', ('猪肉', '牛肉', '禽肉'), '，', ('冷冻', '冷藏', '新鲜'), '，', ('带骨', '去骨')],
+        '08': ['美国产', ('苹果', '橙子', '樱桃', '核桃', '杏仁'), '，', ('新鲜', '干燥')],
+        '84': machinery_template,
+        '85': machinery_template
+    }
+    default_template = ['美国产', CATEGORY, '产品，规格型号', SUFFIX]
+    
+    # 对于第5和第6轮，说明具体目的
+    round_notes = {
+        5: '针对美国加征关税升级的反制措施',
+        6: '针对美国新一轮加征关税的对等反制措施'
+    }
     
-    for round_info in tariff_rounds:
+    # 生成详细关税清单数据：每轮按固定行数分批生成
+    def sample_round(rng, round_info, product_count):
         round_num = round_info['round']
-        product_count = round_info['product_count']
-        tariff_date = round_info['date']
         
         # 处理多个税率的情况
         if isinstance(round_info['rate'], list):
             tariff_rates = round_info['rate']
         else:
             tariff_rates = [round_info['rate']]
-            
-        # 该轮次的HS编码范围
-        hs_prefixes = hs_ranges[round_num]
         
-        for _ in range(product_count):
-            # 随机选择一个HS类别
-            hs_prefix = random.choice(hs_prefixes)
-            category = categories[hs_prefix]
-            
-            # 创建完整的HS编码 (8位，中国常用)
-            hs_suffix = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-            hs_code = f"{hs_prefix}{hs_suffix}"
-            
-            # 随机选择一个关税税率
-            tariff_rate = random.choice(tariff_rates)
-            
-            # 生成模拟的商品描述
-            if hs_prefix == '12':
-                description = f"美国产{random.choice(['大豆', '花生', '葵花籽', '亚麻籽'])}，{random.choice(['用于食品加工', '用于饲料', '用于压榨油'])}"
-            elif hs_prefix == '87':
-                description = f"美国产{random.choice(['乘用车', '货车', '越野车'])}，{random.choice(['排量', '功率'])}为{random.randint(1000, 5000)}cc"
-            elif hs_prefix == '02':
-                description = f"美国产{random.choice(['猪肉', '牛肉', '禽肉'])}，{random.choice(['冷冻', '冷藏', '新鲜'])}，{random.choice(['带骨', '去骨'])}"
-            elif hs_prefix == '08':
-                description = f"美国产{random.choice(['苹果', '橙子', '樱桃', '核桃', '杏仁'])}，{random.choice(['新鲜', '干燥'])}"
-            elif hs_prefix == '84' or hs_prefix == '85':
-                description = f"美国产{random.choice(['发动机', '电机', '泵', '阀门', '处理器', '存储器'])}，用于{random.choice(['工业', '农业', '商业', '民用'])}"
-            else:
-                description = f"美国产{category}产品，规格型号{hs_suffix}"
-            
-            # MFN基准税率（假设值）
-            mfn_rate = round(random.uniform(2.0, 10.0), 1)
-            
-            # 反制措施后的总税率
-            total_rate = mfn_rate + tariff_rate
-            
-            # 随机生成该产品的年度进口额（单位：百万美元）
-            import_value = round(random.uniform(0.1, 200.0), 2)
-            
-            # 生成记录
-            tariff_item = {
-                'round': round_num,
-                'hs_code': hs_code,
-                'product_description': description,
-                'category': category,
-                'implementation_date': tariff_date,
-                'mfn_tariff_rate': mfn_rate,
-                'additional_tariff_rate': tariff_rate,
-                'total_tariff_rate': total_rate,
-                'annual_import_value_millions': import_value
-            }
-            
-            # 对于第5和第6轮，说明具体目的
-            if round_num == 5:
-                tariff_item['note'] = '针对美国加征关税升级的反制措施'
-            elif round_num == 6:
-                tariff_item['note'] = '针对美国新一轮加征关税的对等反制措施'
-            
-            all_tariff_items.append(tariff_item)
+        # 创建完整的HS编码 (8位，中国常用) 及商品描述
+        batch = sample_tariff_lines(rng, hs_ranges[round_num], product_count, 6,
+                                       categories, description_templates, default_template)
+        batch['round'] = round_num
+        batch['implementation_date'] = round_info['date']
+        
+        # MFN基准税率（假设值）和随机选择的加征税率
+        mfn_rate = uniform_rounded(rng, 2.0, 10.0, product_count, 1)
+        tariff_rate = choose(rng, tariff_rates, product_count)
+        batch['mfn_tariff_rate'] = mfn_rate
+        batch['additional_tariff_rate'] = tariff_rate
+        
+        # 反制措施后的总税率
+        batch['total_tariff_rate'] = mfn_rate + tariff_rate
+        
+        # 随机生成该产品的年度进口额（单位：百万美元）
+        batch['annual_import_value_millions'] = uniform_rounded(rng, 0.1, 200.0, product_count, 2)
+        
+        if round_num in round_notes:
+            batch['note'] = round_notes[round_num]
+        
+        return batch
     
-    # 转换为DataFrame并保存
-    df = pd.DataFrame(all_tariff_items)
-    output_file = os.path.join(save_dir, 'china_tariffs_on_us.csv')
-    df.to_csv(output_file, index=False, encoding='utf-8')
+    # 逐批追加写出，各批的分类列使用相同的类别
+    columns = ['round', 'hs_code', 'product_description', 'category', 'implementation_date',
+               'mfn_tariff_rate', 'additional_tariff_rate', 'total_tariff_rate',
+               'annual_import_value_millions', 'note']
+    column_categories = {
+        'category': list(dict.fromkeys(categories.values())),
+        'implementation_date': list(dict.fromkeys(r['date'] for r in tariff_rounds)),
+        'note': list(round_notes.values()),
+    }
+    rounds = [(round_info, int(round_info['product_count'] * scale)) for round_info in tariff_rounds]
+    result = write_tariff_lines(save_dir, 'china_tariffs_on_us.csv', rounds, sample_round, columns,
+                                column_categories, 'china_tariff_lines', seed=seed, batch_rows=batch_rows)
     
-    print(f"中国对美关税清单数据生成完成，已保存到: {output_file}")
+    print(f"中国对美关税清单数据生成完成，共 {result.rows} 条，已保存到: {result.path}")
     
     # 生成关税影响汇总数据
-    generate_tariff_impact_summary()
+    if with_summary:
+        generate_tariff_impact_summary(seed=seed)
     
-    return df
+    return result
 
-def generate_tariff_impact_summary():
-    """生成关税影响的汇总数据"""
+def generate_tariff_impact_summary(sensitivity=TRADE_SENSITIVITY, save=True, seed=None):
+    """
+    生成关税影响的汇总数据
+    
+    参数:
+    - sensitivity: 品类 -> 贸易额对关税的敏感系数，默认 TRADE_SENSITIVITY
+    - save: 是否保存；敏感性分析中反复求值时为False
+    - seed: 随机种子，默认使用随机数服务的根种子；每个品类使用独立的随机数流
+    
+    返回:
+    - 品类 × 年份的关税影响表
+    """
     # 年份范围（扩展到2025年）
     years = list(range(2017, 2026))
     
@@ -318,6 +345,7 @@ def generate_tariff_impact_summary():
     impact_data = []
     
     for category in categories:
+        rng = make_rng(seed, ('china_tariff_impact', category))
         # 设定基础关税税率和覆盖率
         base_tariff_rate = 5.0  # 假设MFN基础税率
         base_coverage = 0.0     # 基础覆盖率
@@ -424,8 +452,8 @@ def generate_tariff_impact_summary():
                     rate = base_tariff_rate
             
             # 增加随机波动
-            rate_variation = random.uniform(-1.0, 1.0)
-            coverage_variation = random.uniform(-0.05, 0.05)
+            rate_variation = rng.uniform(-1.0, 1.0)
+            coverage_variation = rng.uniform(-0.05, 0.05)
             
             final_rate = max(0, rate + rate_variation)
             final_coverage = max(0, min(1.0, coverage + coverage_variation))
@@ -468,18 +496,6 @@ def generate_tariff_impact_summary():
             
             # 关税影响（贸易额下降百分比）
             # 简化公式：影响 = 覆盖率 * 税率 * 敏感系数
-            sensitivity = {
-                '大豆及油籽': 0.8,
-                '汽车及零部件': 0.6,
-                '电子产品及零部件': 0.4,
-                '飞机及航空设备': 0.2,  # 战略产品，敏感度低
-                '水果及坚果': 0.7,
-                '猪肉及肉制品': 0.5,  # 受非洲猪瘟影响，关税不是唯一因素
-                '化学品及原料': 0.4,
-                '医疗设备': 0.3,
-                '能源产品': 0.6,
-                '农产品其他': 0.7
-            }
             
             trade_impact = final_coverage * final_rate * sensitivity.get(category, 0.5) / 100
             
@@ -508,7 +524,7 @@ def generate_tariff_impact_summary():
                 final_trade_value = base_value * (1 - trade_impact)
             
             # 随机波动
-            final_trade_value *= (1 + random.uniform(-0.05, 0.05))
+            final_trade_value *= (1 + rng.uniform(-0.05, 0.05))
             
             # 2025年调整为部分年度数据
             if year == 2025:
@@ -527,8 +543,8 @@ def generate_tariff_impact_summary():
     
     # 转换为DataFrame并保存
     df_impact = pd.DataFrame(impact_data)
-    output_file = os.path.join(save_dir, 'china_tariff_impact_by_category.csv')
-    df_impact.to_csv(output_file, index=False, encoding='utf-8')
+    if save:
+        save_table(df_impact, save_dir, 'china_tariff_impact_by_category.csv')
     
     return df_impact
 
@@ -536,8 +552,12 @@ def generate_tariff_impact_summary():
 def generate_china_data():
     """
     兼容run_all_crawlers.py的主函数名称命名模式
+    
+    返回:
+    - 关税清单 DataFrame（与早期版本相同：生成后从输出文件读回，generate_china_tariff_data 本身只返回写出器）
     """
-    return generate_china_tariff_data()
+    generate_china_tariff_data()
+    return load_table(save_dir, 'china_tariffs_on_us.csv')
 
 if __name__ == "__main__":
     generate_china_tariff_data() 
\ No newline at end of file
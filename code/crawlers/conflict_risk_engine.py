@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+冲突风险指标的批量模拟引擎
+所有风险维度和多条蒙特卡洛路径同时按均值回归递推：
+    v_t = clip(v_{t-1} + 事件冲击 + 时期趋势 + 噪声, 0, 100)，再向长期均值50回归5%
+事件冲击和趋势效应预先整体生成为 (路径 × 日期 × 维度) 数组，
+递推只在日期维度上循环；综合风险指数为 (日期 × 维度) 矩阵与权重向量的点积。
+每条路径使用 SeedSequence.spawn 派生的独立随机数流，第 i 条路径与总路径数无关
+"""
+
+import numpy as np
+import pandas as pd
+
+from event_calendar import KEY_EVENTS, EventCalendar
+from rng_service import spawn_rngs
+
+# 风险维度及其起始基线值 (0-100)
+RISK_BASELINES = {
+    '贸易紧张度': 30,
+    '技术对抗度': 25,
+    '军事对峙风险': 20,
+    '外交关系状态': 35,
+    '舆论敌意度': 40,
+    '第三方盟友协调度': 45,
+}
+
+# 综合风险指数权重
+COMPOSITE_WEIGHTS = {
+    '贸易紧张度': 0.2,
+    '技术对抗度': 0.2,
+    '军事对峙风险': 0.25,
+    '外交关系状态': 0.15,
+    '舆论敌意度': 0.1,
+    '第三方盟友协调度': 0.1,
+}
+
+# 长期均值及每期回归比例
+LONG_RUN_MEAN = 50
+MEAN_REVERSION = 0.05
+
+# 事件影响窗口（前后天数）
+EVENT_WINDOW_DAYS = 30
+
+# 随机数流名称（各路径的流由其派生）
+RISK_STREAM = 'conflict_risk'
+
+def event_effect_bounds(dimension, desc):
+    """
+    事件对某一风险维度的冲击范围
+
+    Returns
+    -------
+    tuple or None
+        (下限, 上限)，该事件不影响此维度时返回None
+    """
+    if dimension == '贸易紧张度':
+        if '关税' in desc or '贸易' in desc:
+            return 10, 20
+    elif dimension == '技术对抗度':
+        if '芯片' in desc or '科技' in desc or '出口管制' in desc:
+            return 8, 15
+    elif dimension == '军事对峙风险':
+        if '冲突' in desc:
+            return 5, 12
+    elif dimension == '外交关系状态':
+        if '协议' in desc and '签署' in desc:
+            return -10, -5
+        elif '制裁' in desc or '限制' in desc:
+            return 8, 15
+    elif dimension == '舆论敌意度':
+        if '关税' in desc or '制裁' in desc:
+            return 5, 12
+        elif '协议' in desc and '签署' in desc:
+            return -8, -3
+    elif dimension == '第三方盟友协调度':
+        if '盟友' in desc or '协调' in desc:
+            return 5, 10
+    return None
+
+def trend_effect_bounds(dates, dimensions):
+    """
+    各日期、各维度的时期趋势效应参数
+
+    - 2018-03 至 2019-12 贸易战升级：U(8, 15) × 距2018-03-01的年数
+    - 2020 疫情和第一阶段协议：贸易紧张度、外交关系状态 -U(3, 8)，其他维度 U(5, 10)
+    - 2021 拜登政府初期：U(2, 8)
+    - 2022-2023 战略竞争加剧：U(5, 12) × (1 + 距2022年的月数 / 24)
+    - 2024 大选年：11月前 U(10, 20)，之后 U(5, 15)
+    - 2025 起新政府初期：U(0, 10)
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (下限, 上限, 倍数)，均为 (日期 × 维度) 数组
+    """
+    dates = pd.DatetimeIndex(dates)
+    shape = (len(dates), len(dimensions))
+    low = np.zeros(shape)
+    high = np.zeros(shape)
+    scale = np.ones(shape)
+
+    def period(mask, period_low, period_high, period_scale=None, columns=None):
+        rows = np.flatnonzero(mask)
+        cols = np.arange(len(dimensions)) if columns is None else np.flatnonzero(columns)
+        cells = np.ix_(rows, cols)
+        low[cells] = period_low
+        high[cells] = period_high
+        if period_scale is not None:
+            scale[cells] = np.asarray(period_scale)[rows][:, None]
+
+    trade_war = (dates >= '2018-03-01') & (dates <= '2019-12-31')
+    period(trade_war, 8, 15, np.asarray((dates - pd.Timestamp('2018-03-01')).days / 365))
+
+    year_2020 = dates.year == 2020
+    easing = np.array([dimension in ('贸易紧张度', '外交关系状态') for dimension in dimensions])
+    period(year_2020, 5, 10, columns=~easing)
+    period(year_2020, -8, -3, columns=easing)
+
+    period(dates.year == 2021, 2, 8)
+
+    competition = (dates.year == 2022) | (dates.year == 2023)
+    months_since_2022 = np.asarray((dates.year - 2022) * 12 + dates.month)
+    period(competition, 5, 12, 1 + months_since_2022 / 24)
+
+    period((dates.year == 2024) & (dates.month < 11), 10, 20)
+    period((dates.year == 2024) & (dates.month >= 11), 5, 15)
+    period(dates.year >= 2025, 0, 10)
+
+    return low, high, scale
+
+def simulate_conflict_risk(dates, n_paths=1, seed=None, baselines=RISK_BASELINES,
+                           weights=COMPOSITE_WEIGHTS, events=KEY_EVENTS):
+    """
+    批量模拟各风险维度和综合风险指数
+
+    Parameters
+    ----------
+    dates : pandas.DatetimeIndex
+        日期序列
+    n_paths : int, optional
+        蒙特卡洛路径数
+    seed : int, optional
+        随机种子，默认使用随机数服务的根种子
+    baselines : dict, optional
+        风险维度 -> 起始基线值
+    weights : dict, optional
+        风险维度 -> 综合指数权重
+    events : dict, optional
+        关键事件（日期 -> 描述）
+
+    Returns
+    -------
+    dict
+        dimensions、dates、events（各日期窗口内的事件列表）、
+        values（路径 × 日期 × 维度）和 composite（路径 × 日期）
+    """
+    dates = pd.DatetimeIndex(dates)
+    dimensions = list(baselines)
+    n_dates, n_dims = len(dates), len(dimensions)
+
+    # 事件冲击：窗口内的每个 (日期, 事件) 对各自独立抽取冲击，再按日期汇总
+    calendar = EventCalendar(events)
+    starts, stops = calendar.window(dates, before=EVENT_WINDOW_DAYS, after=EVENT_WINDOW_DAYS)
+    pair_date = np.repeat(np.arange(n_dates), stops - starts)
+    pair_event = np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops)]).astype(int)
+
+    effect_low = np.zeros((len(calendar), n_dims))
+    effect_high = np.zeros((len(calendar), n_dims))
+    for i, desc in enumerate(calendar.events):
+        for j, dimension in enumerate(dimensions):
+            bounds = event_effect_bounds(dimension, desc)
+            if bounds is not None:
+                effect_low[i, j], effect_high[i, j] = bounds
+
+    pair_low = effect_low[pair_event]
+    pair_range = effect_high[pair_event] - pair_low
+    # 各路径的随机数：(事件冲击, 趋势效应) 的均匀分布随机数和正态波动
+    event_draws = np.empty((n_paths, len(pair_event), n_dims))
+    trend_draws = np.empty((n_paths, n_dates, n_dims))
+    noise = np.empty((n_paths, n_dates, n_dims))
+    for path, rng in enumerate(spawn_rngs(n_paths, seed, RISK_STREAM)):
+        event_draws[path] = rng.random((len(pair_event), n_dims))
+        trend_draws[path] = rng.random((n_dates, n_dims))
+        noise[path] = rng.normal(0, 3, (n_dates, n_dims))
+
+    pair_effects = pair_low + pair_range * event_draws
+    event_effect = np.zeros((n_paths, n_dates, n_dims))
+    np.add.at(event_effect, (slice(None), pair_date), pair_effects)
+
+    # 时期趋势效应和随机波动
+    trend_low, trend_high, trend_scale = trend_effect_bounds(dates, dimensions)
+    trend_effect = (trend_low + (trend_high - trend_low) * trend_draws) * trend_scale
+    shocks = event_effect + trend_effect + noise
+
+    # 均值回归递推：只在日期维度上循环，所有路径和维度同时计算
+    values = np.empty((n_paths, n_dates, n_dims))
+    prev = np.broadcast_to(np.array([baselines[d] for d in dimensions], dtype=float), (n_paths, n_dims))
+    for t in range(n_dates):
+        current = np.clip(prev + shocks[:, t], 0, 100)
+        current += (LONG_RUN_MEAN - current) * MEAN_REVERSION
+        values[:, t] = current
+        prev = current
+
+    weight_vector = np.array([weights[d] for d in dimensions])
+
+    return {
+        'dimensions': dimensions,
+        'dates': dates,
+        'events': [calendar.events[start:stop] for start, stop in zip(starts, stops)],
+        'values': values,
+        'composite': values @ weight_vector,
+    }
+
+def composite_quantiles(simulation, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    """
+    综合风险指数在各路径间的分布
+
+    Parameters
+    ----------
+    simulation : dict
+        simulate_conflict_risk 的结果
+    quantiles : sequence of float, optional
+        分位数
+
+    Returns
+    -------
+    pandas.DataFrame
+        date、mean、std 以及各分位数列（如 p05、p50、p95）
+    """
+    composite = simulation['composite']
+    table = pd.DataFrame({
+        'date': simulation['dates'].strftime('%Y-%m-%d'),
+        'mean': composite.mean(axis=0).round(2),
+        'std': composite.std(axis=0).round(2),
+    })
+    for q, values in zip(quantiles, np.quantile(composite, quantiles, axis=0)):
+        table[f"p{int(round(q * 100)):02d}"] = values.round(2)
+    return table
@@ -13,12 +13,15 @@ import os
 import time
 from datetime import datetime
 
+from data_store import save_table, load_table, find_artifact
+from rng_service import make_rng
+
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def get_consumer_confidence_data():
+def get_consumer_confidence_data(with_sentiment=True, seed=None):
     """
     获取中美消费者信心指数数据
     
@@ -27,8 +30,13 @@ def get_consumer_confidence_data():
     2. 中国消费者信心指数
     
     这里使用模拟数据展示
+    
+    参数:
+    - with_sentiment: 是否同时生成消费者情绪预期数据（任务图中作为独立任务运行时为False）
+    - seed: 随机种子，默认使用随机数服务的根种子
     """
     print("开始生成消费者信心指数数据...")
+    rng = make_rng(seed, 'consumer_confidence')
     
     # 生成月度时间序列，扩展到2025年4月
     date_range = pd.date_range(start='2017-01-01', end='2025-04-01', freq='MS')
@@ -102,8 +110,8 @@ def get_consumer_confidence_data():
             us_shock += 8.0  # 信心恢复效应
         
         # 随机波动
-        us_random = np.random.normal(0, 2.0)
-        cn_random = np.random.normal(0, 2.5)
+        us_random = rng.normal(0, 2.0)
+        cn_random = rng.normal(0, 2.5)
         
         # 计算最终指数
         us_cci = us_base_cci + us_trend + us_seasonal + us_shock + us_random
@@ -117,20 +125,27 @@ def get_consumer_confidence_data():
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(data)
-    df.to_csv(os.path.join(save_dir, 'consumer_confidence_monthly.csv'), index=False, encoding='utf-8')
+    save_table(df, save_dir, 'consumer_confidence_monthly.csv')
     
     # 生成消费者情绪预期数据
-    generate_consumer_sentiment_data()
+    if with_sentiment:
+        generate_consumer_sentiment_data(seed=seed)
     
     print(f"消费者信心指数数据生成完成，已保存到: {save_dir}")
     return df
 
-def generate_consumer_sentiment_data():
-    """生成消费者情绪和预期数据"""
+def generate_consumer_sentiment_data(seed=None):
+    """
+    生成消费者情绪和预期数据
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
+    """
+    rng = make_rng(seed, 'consumer_sentiment')
     # 读取已生成的消费者信心指数数据
-    cci_file = os.path.join(save_dir, 'consumer_confidence_monthly.csv')
-    if os.path.exists(cci_file):
-        cci_data = pd.read_csv(cci_file)
+    cci_file = find_artifact(save_dir, 'consumer_confidence_monthly.csv')
+    if cci_file is not None:
+        cci_data = load_table(save_dir, 'consumer_confidence_monthly.csv')
         
         # 添加更多维度的情绪指标
         sentiment_data = []
@@ -142,12 +157,12 @@ def generate_consumer_sentiment_data():
             
             # 基于CCI生成其他情绪指标
             # 当前状况指数通常波动更小
-            us_current = us_cci * (0.9 + 0.2 * np.random.random())
-            cn_current = cn_cci * (0.9 + 0.2 * np.random.random())
+            us_current = us_cci * (0.9 + 0.2 * rng.random())
+            cn_current = cn_cci * (0.9 + 0.2 * rng.random())
             
             # 预期指数通常波动更大
-            us_expectation = us_cci * (0.8 + 0.4 * np.random.random())
-            cn_expectation = cn_cci * (0.8 + 0.4 * np.random.random())
+            us_expectation = us_cci * (0.8 + 0.4 * rng.random())
+            cn_expectation = cn_cci * (0.8 + 0.4 * rng.random())
             
             # 风险感知（关税战后上升）
             date_obj = datetime.strptime(date, '%Y-%m')
@@ -164,8 +179,8 @@ def generate_consumer_sentiment_data():
             if date_obj >= datetime(2025, 1, 1):
                 tariff_effect -= 5
                 
-            us_risk_perception = 50 + tariff_effect + 10 * np.random.random() - (us_cci - 95) / 2
-            cn_risk_perception = 45 + tariff_effect + 10 * np.random.random() - (cn_cci - 120) / 3
+            us_risk_perception = 50 + tariff_effect + 10 * rng.random() - (us_cci - 95) / 2
+            cn_risk_perception = 45 + tariff_effect + 10 * rng.random() - (cn_cci - 120) / 3
             
             sentiment_data.append({
                 'date': date,
@@ -179,7 +194,7 @@ def generate_consumer_sentiment_data():
         
         # 保存情绪数据
         sentiment_df = pd.DataFrame(sentiment_data)
-        sentiment_df.to_csv(os.path.join(save_dir, 'consumer_sentiment_monthly.csv'), index=False, encoding='utf-8')
+        save_table(sentiment_df, save_dir, 'consumer_sentiment_monthly.csv')
         
         return sentiment_df
     
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+爬虫注册表
+每个数据产品对应一个明确的入口函数（模块名 + 函数名）及其元数据。
+注册表本身不导入任何爬虫模块，只在任务运行时按需加载，
+未被选中的爬虫不会导入 pandas/numpy/requests 等依赖
+"""
+
+import os
+import sys
+import importlib
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+if CRAWLER_DIR not in sys.path:
+    sys.path.insert(0, CRAWLER_DIR)
+
+# 爬虫任务声明：每个任务调用一个函数，并声明读取和写出的 data/raw 数据文件，
+# 调度器据此推导任务间的依赖关系，相互独立的任务并行运行
+CRAWLERS = [
+    {
+        'name': 'ustr_tariff_lists',
+        'module': 'ustr_tariff_crawler',
+        'function': 'get_ustr_tariff_lists',
+        'sources': ['fetch_client.py'],
+        'description': '美国贸易代表关税数据',
+        'reads': [],
+        'writes': ['ustr_tariff_rounds.csv', 'ustr_tariff_round1_products.csv',
+                   'ustr_tariff_round2_products.csv', 'ustr_tariff_all_products.csv'],
+    },
+    {
+        'name': 'us_tariff_lines',
+        'module': 'us_tariff_crawler',
+        'function': 'generate_us_tariff_data',
+        'kwargs': {'with_summary': False},
+        'sources': ['tariff_line_engine.py'],
+        'description': '美国关税清单数据',
+        'reads': [],
+        'writes': ['us_tariffs_on_china.csv'],
+    },
+    {
+        'name': 'us_tariff_impact',
+        'module': 'us_tariff_crawler',
+        'function': 'generate_tariff_impact_summary',
+        'description': '美国关税影响汇总数据',
+        'reads': [],
+        'writes': ['us_tariff_impact_by_category.csv'],
+    },
+    {
+        'name': 'china_tariff_lines',
+        'module': 'china_tariff_crawler',
+        'function': 'generate_china_tariff_data',
+        'kwargs': {'with_summary': False},
+        'sources': ['tariff_line_engine.py'],
+        'description': '中国关税清单数据',
+        'reads': [],
+        'writes': ['china_tariffs_on_us.csv'],
+    },
+    {
+        'name': 'china_tariff_impact',
+        'module': 'china_tariff_crawler',
+        'function': 'generate_tariff_impact_summary',
+        'description': '中国关税影响汇总数据',
+        'reads': [],
+        'writes': ['china_tariff_impact_by_category.csv'],
+    },
+    {
+        'name': 'hs_index',
+        'module': 'hs_index',
+        'function': 'build_hs_index',
+        'sources': ['tariff_annex_parser.py'],
+        'description': '关税清单HS编码索引',
+        'reads': ['us_tariffs_on_china.csv', 'china_tariffs_on_us.csv'],
+        'writes': ['hs_index.npz'],
+    },
+    {
+        'name': 'china_customs_monthly',
+        'module': 'china_customs_crawler',
+        'function': 'get_china_us_trade_data',
+        'kwargs': {'with_categories': False},
+        'description': '中国海关进出口数据',
+        'reads': [],
+        'writes': ['china_us_trade_monthly.csv'],
+    },
+    {
+        'name': 'china_customs_category',
+        'module': 'china_customs_crawler',
+        'function': 'generate_category_trade_data',
+        'description': '中国海关分类别贸易数据',
+        'reads': [],
+        'writes': ['china_us_trade_by_category.csv'],
+    },
+    {
+        'name': 'trade_monthly',
+        'module': 'trade_data_crawler',
+        'function': 'crawl_monthly_trade_data',
+        'sources': ['event_calendar.py'],
+        'description': '中美月度贸易数据',
+        'reads': [],
+        'writes': ['us_china_monthly_trade.csv'],
+    },
+    {
+        'name': 'trade_annual_category',
+        'module': 'trade_data_crawler',
+        'function': 'crawl_annual_category_trade_data',
+        'description': '中美年度分类别贸易数据',
+        'reads': [],
+        'writes': ['us_china_annual_trade_by_category.csv'],
+    },
+    {
+        'name': 'trade_deficit',
+        'module': 'trade_data_crawler',
+        'function': 'crawl_trade_deficit_data',
+        'description': '中美贸易逆差数据',
+        'reads': ['us_china_monthly_trade.csv'],
+        'writes': ['us_china_trade_deficit.csv'],
+    },
+    {
+        'name': 'social_media_sentiment',
+        'module': 'social_media_sentiment_crawler',
+        'function': 'generate_social_media_sentiment',
+        'sources': ['event_calendar.py'],
+        'description': '社交媒体情绪数据',
+        'reads': [],
+        'writes': ['social_media_sentiment_weekly.csv', 'social_media_sentiment_daily_samples.csv'],
+    },
+    {
+        'name': 'consumer_confidence',
+        'module': 'consumer_confidence_crawler',
+        'function': 'get_consumer_confidence_data',
+        'kwargs': {'with_sentiment': False},
+        'description': '消费者信心指数数据',
+        'reads': [],
+        'writes': ['consumer_confidence_monthly.csv'],
+    },
+    {
+        'name': 'consumer_sentiment',
+        'module': 'consumer_confidence_crawler',
+        'function': 'generate_consumer_sentiment_data',
+        'description': '消费者情绪预期数据',
+        'reads': ['consumer_confidence_monthly.csv'],
+        'writes': ['consumer_sentiment_monthly.csv'],
+    },
+    {
+        'name': 'regional_economic',
+        'module': 'regional_economic_crawler',
+        'function': 'generate_regional_economic_data',
+        'sources': ['trade_flow_engine.py', 'spatial_weights.py'],
+        'description': '区域经济数据',
+        'reads': [],
+        'writes': ['regional_economic_data.csv', 'regional_trade_flows.csv',
+                   'regional_spatial_weights.npz', 'regional_spatial_weights.csv'],
+    },
+    {
+        'name': 'strategic_resources',
+        'module': 'strategic_resources_crawler',
+        'function': 'generate_strategic_resources_data',
+        # 输出文件名随日期频率变化（见 strategic_resources_crawler.resource_artifacts），writes 与 freq 对应
+        'kwargs': {'freq': 'M'},
+        'sources': ['event_calendar.py', 'resource_price_engine.py'],
+        'description': '战略资源依赖性数据',
+        'reads': [],
+        'writes': ['strategic_resources_data.json', 'strategic_resources_monthly.csv',
+                   'strategic_resources_monthly.index.json'],
+    },
+    {
+        'name': 'military_budget',
+        'module': 'strategic_resources_crawler',
+        'function': 'generate_military_budget_data',
+        'description': '军事预算数据',
+        'reads': [],
+        'writes': ['military_budget_data.json', 'military_budget_annual.csv',
+                   'military_budget_annual.index.json', 'military_tech_investment_annual.csv',
+                   'military_tech_investment_annual.index.json'],
+    },
+    {
+        'name': 'conflict_risk',
+        'module': 'strategic_resources_crawler',
+        'function': 'generate_conflict_risk_indicators',
+        'kwargs': {'n_paths': 1000},
+        'sources': ['event_calendar.py', 'conflict_risk_engine.py'],
+        'description': '冲突风险指标数据',
+        'reads': [],
+        'writes': ['conflict_risk_indicators.json', 'conflict_risk_monthly.csv',
+                   'conflict_risk_monthly.index.json', 'conflict_risk_composite_distribution.csv'],
+    },
+]
+
+def list_crawlers():
+    """返回全部已注册的爬虫任务"""
+    return list(CRAWLERS)
+
+def get_crawler(name):
+    """
+    按任务名查找已注册的爬虫任务
+
+    Parameters
+    ----------
+    name : str
+        任务名
+
+    Returns
+    -------
+    dict
+        任务声明
+    """
+    for crawler in CRAWLERS:
+        if crawler['name'] == name:
+            return crawler
+    raise KeyError(f"未注册的爬虫任务: {name}")
+
+def select_crawlers(only=None, skip=None):
+    """
+    按任务名或模块名选择爬虫任务
+
+    Parameters
+    ----------
+    only : list of str, optional
+        只保留这些任务（任务名或模块名），默认保留全部
+    skip : list of str, optional
+        排除这些任务（任务名或模块名）
+
+    Returns
+    -------
+    list of dict
+        选中的任务声明，保持注册顺序
+    """
+    known = {crawler['name'] for crawler in CRAWLERS} | {crawler['module'] for crawler in CRAWLERS}
+    for name in list(only or []) + list(skip or []):
+        if name not in known:
+            raise KeyError(f"未注册的爬虫任务或模块: {name}")
+
+    def matches(crawler, names):
+        return crawler['name'] in names or crawler['module'] in names
+
+    selected = [crawler for crawler in CRAWLERS if not only or matches(crawler, only)]
+    if skip:
+        selected = [crawler for crawler in selected if not matches(crawler, skip)]
+    return selected
+
+def load_entry_point(crawler):
+    """
+    加载爬虫任务的入口函数
+
+    模块通过常规 import 加载，同一进程中重复加载时复用 sys.modules 中的缓存
+
+    Parameters
+    ----------
+    crawler : dict
+        任务声明
+
+    Returns
+    -------
+    callable
+        入口函数
+    """
+    module = importlib.import_module(crawler['module'])
+    try:
+        return getattr(module, crawler['function'])
+    except AttributeError:
+        raise AttributeError(f"模块 {crawler['module']} 中没有入口函数 {crawler['function']}") from None
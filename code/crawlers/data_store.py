@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据文件存储后端
+爬虫以逻辑文件名（如 us_tariffs_on_china.csv）读写 data/raw 中的表格，
+实际格式由存储设置决定：
+- csv：文本格式，tariff_analysis.R 直接读取（默认）
+- parquet / feather：带类型、压缩的列式格式，category、round、region、resource
+  等重复取值的列以分类(categorical/dictionary)编码保存
+列式格式下可同时导出一份CSV，供R分析脚本和人工查看使用；
+保存时删除同一逻辑文件其他格式的旧文件，读取时不会取到过期的数据。
+文件名映射不依赖pandas，调度进程可在不导入pandas的情况下定位数据文件
+"""
+
+import os
+import time
+
+# 存储格式 -> 文件扩展名
+STORAGE_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+# 列式格式中以分类编码保存的列
+CATEGORICAL_COLUMNS = ['category', 'round', 'region', 'resource']
+
+# 列式格式使用的压缩算法
+COMPRESSION = 'zstd'
+
+# 默认存储设置，可通过环境变量 CRAWLER_DATA_FORMAT / CRAWLER_EXPORT_CSV 修改
+_settings = {
+    'format': os.environ.get('CRAWLER_DATA_FORMAT', 'csv'),
+    'export_csv': os.environ.get('CRAWLER_EXPORT_CSV', '') not in ('', '0'),
+}
+
+def configure(format=None, export_csv=None):
+    """
+    设置当前进程的存储格式
+
+    Parameters
+    ----------
+    format : str, optional
+        存储格式：csv、parquet 或 feather
+    export_csv : bool, optional
+        列式格式下是否同时导出CSV
+    """
+    if format is not None:
+        if format not in STORAGE_FORMATS:
+            raise ValueError(f"未知的存储格式: {format}（可选: {', '.join(STORAGE_FORMATS)}）")
+        _settings['format'] = format
+    if export_csv is not None:
+        _settings['export_csv'] = bool(export_csv)
+
+def storage_options():
+    """返回当前存储设置（可随任务声明传给工作进程）"""
+    return dict(_settings)
+
+def _stem(artifact):
+    stem, ext = os.path.splitext(artifact)
+    return stem if ext in STORAGE_FORMATS.values() else artifact
+
+def artifact_files(artifact, format=None, export_csv=None):
+    """
+    逻辑文件名在指定存储设置下对应的实际文件名
+
+    Parameters
+    ----------
+    artifact : str
+        逻辑文件名，如 us_tariffs_on_china.csv；非表格文件（如 .json）原样返回
+    format : str, optional
+        存储格式，默认为当前设置
+    export_csv : bool, optional
+        是否同时导出CSV，默认为当前设置
+
+    Returns
+    -------
+    list of str
+        实际写出的文件名，第一个为主文件
+    """
+    if os.path.splitext(artifact)[1] != '.csv':
+        return [artifact]
+    format = format or _settings['format']
+    export_csv = _settings['export_csv'] if export_csv is None else export_csv
+    files = [_stem(artifact) + STORAGE_FORMATS[format]]
+    if export_csv and format != 'csv':
+        files.append(_stem(artifact) + '.csv')
+    return files
+
+def remove_stale_files(save_dir, artifact, keep):
+    """
+    删除同一逻辑文件其他格式的旧文件（如改用parquet保存后遗留的CSV），
+    避免按其他默认格式读取时先找到过期的数据
+
+    Parameters
+    ----------
+    save_dir : str
+        数据目录
+    artifact : str
+        逻辑文件名（.csv）
+    keep : list of str
+        本次写出的文件路径
+    """
+    if os.path.splitext(artifact)[1] != '.csv':
+        return
+    keep = {os.path.abspath(path) for path in keep}
+    for ext in STORAGE_FORMATS.values():
+        path = os.path.join(save_dir, _stem(artifact) + ext)
+        if os.path.abspath(path) not in keep and os.path.exists(path):
+            os.remove(path)
+
+def find_artifact(save_dir, artifact, format=None):
+    """
+    查找已存在的数据文件，优先指定（默认为当前）存储格式，其次其他格式
+
+    Returns
+    -------
+    str or None
+        文件路径，均不存在时返回None
+    """
+    format = format or _settings['format']
+    formats = [format] + [fmt for fmt in STORAGE_FORMATS if fmt != format]
+    if os.path.splitext(artifact)[1] != '.csv':
+        candidates = [artifact]
+    else:
+        candidates = [_stem(artifact) + STORAGE_FORMATS[fmt] for fmt in formats]
+    for name in candidates:
+        path = os.path.join(save_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def _require_pyarrow(format):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(f"{format} 格式需要安装 pyarrow: pip install pyarrow") from None
+
+def index_file(artifact):
+    """分组表（见 save_grouped_table）的分组索引文件名"""
+    return _stem(artifact) + '.index.json'
+
+def encode_categories(df, categorical=None):
+    """将重复取值的列（见 CATEGORICAL_COLUMNS，以及categorical指定的列）转换为分类编码"""
+    import pandas as pd
+    columns = [column for column in CATEGORICAL_COLUMNS + list(categorical or [])
+               if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype)]
+    if not columns:
+        return df
+    return df.astype({column: 'category' for column in columns})
+
+def save_table(df, save_dir, artifact, index=False, categorical=None):
+    """
+    按当前存储格式保存表格
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        要保存的数据
+    save_dir : str
+        保存目录
+    artifact : str
+        逻辑文件名（.csv）
+    index : bool, optional
+        是否保存行索引（列式格式中作为普通列保存，读取时用 index_col 恢复）
+    categorical : list of str, optional
+        列式格式中额外以分类编码保存的列
+
+    Returns
+    -------
+    str
+        主文件路径
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    paths = [os.path.join(save_dir, name) for name in artifact_files(artifact)]
+    remove_stale_files(save_dir, artifact, paths)
+
+    for path in paths:
+        ext = os.path.splitext(path)[1]
+        if ext == '.csv':
+            df.to_csv(path, index=index, encoding='utf-8')
+            continue
+
+        format = 'parquet' if ext == '.parquet' else 'feather'
+        _require_pyarrow(format)
+        table = encode_categories(df.reset_index() if index else df.reset_index(drop=True), categorical)
+        if format == 'parquet':
+            table.to_parquet(path, index=False, compression=COMPRESSION)
+        else:
+            table.to_feather(path, compression=COMPRESSION)
+
+    return paths[0]
+
+class TableWriter:
+    """
+    分块写出表格：CSV逐块追加，parquet每块为一个row group，feather每块为一个record batch，
+    内存占用只与单块大小有关
+
+    Parameters
+    ----------
+    save_dir : str
+        保存目录
+    artifact : str
+        逻辑文件名（.csv）
+    categorical : list of str, optional
+        列式格式中额外以分类编码保存的列
+    total : int, optional
+        预计总行数，报告进度时显示完成比例
+    progress : float, optional
+        报告进度（已写出行数和吞吐量 行/秒）的最小间隔秒数，None 时不报告
+
+    Examples
+    --------
+    >>> with TableWriter(save_dir, 'regional_trade_flows.csv') as writer:
+    ...     for chunk in chunks:
+    ...         writer.write(chunk)
+    """
+
+    def __init__(self, save_dir, artifact, categorical=None, total=None, progress=None):
+        os.makedirs(save_dir, exist_ok=True)
+        self.paths = [os.path.join(save_dir, name) for name in artifact_files(artifact)]
+        self.path = self.paths[0]
+        remove_stale_files(save_dir, artifact, self.paths)
+        self.categorical = categorical
+        self.total = total
+        self.progress = progress
+        self.rows = 0
+        self._schema = None
+        self._writers = {}
+        self._closed = False
+        self._started = self._reported = time.perf_counter()
+
+    def write(self, df):
+        """写出一块数据（各块的列须相同）"""
+        for path in self.paths:
+            ext = os.path.splitext(path)[1]
+            if ext == '.csv':
+                df.to_csv(path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0,
+                          index=False, encoding='utf-8')
+                continue
+
+            _require_pyarrow(ext[1:])
+            import pyarrow as pa
+            if self._schema is None:
+                table = pa.Table.from_pandas(encode_categories(df, self.categorical), preserve_index=False)
+                self._schema = table.schema
+            else:
+                table = pa.Table.from_pandas(encode_categories(df, self.categorical),
+                                             schema=self._schema, preserve_index=False)
+            if path not in self._writers:
+                if ext == '.parquet':
+                    import pyarrow.parquet as pq
+                    self._writers[path] = pq.ParquetWriter(path, self._schema, compression=COMPRESSION)
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+                    self._writers[path] = pa.ipc.new_file(path, self._schema, options=options)
+            if ext == '.parquet':
+                self._writers[path].write_table(table, row_group_size=max(len(table), 1))
+            else:
+                self._writers[path].write_table(table, max_chunksize=max(len(table), 1))
+        self.rows += len(df)
+
+        if self.progress is not None and time.perf_counter() - self._reported >= self.progress:
+            self._reported = time.perf_counter()
+            done = f"/{self.total:,} ({self.rows / self.total:.0%})" if self.total else ''
+            print(f"  {os.path.basename(self.path)}: 已写出 {self.rows:,}{done} 行，{self.throughput():,.0f} 行/秒")
+
+    def throughput(self):
+        """开始写出以来的平均吞吐量（行/秒）"""
+        return self.rows / max(time.perf_counter() - self._started, 1e-9)
+
+    def __len__(self):
+        return self.rows
+
+    def close(self):
+        """结束写出，返回主文件路径"""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        if self.progress is not None and not self._closed:
+            elapsed = time.perf_counter() - self._started
+            print(f"  {os.path.basename(self.path)}: 共写出 {self.rows:,} 行，用时 {elapsed:.2f} 秒，{self.throughput():,.0f} 行/秒")
+        self._closed = True
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def load_table(save_dir, artifact, index_col=None, columns=None, dtype_backend=None):
+    """
+    读取表格，自动识别已保存的格式
+
+    Parameters
+    ----------
+    save_dir : str
+        数据目录
+    artifact : str
+        逻辑文件名（.csv）
+    index_col : int or str, optional
+        作为行索引的列（与 pandas.read_csv 相同）
+    columns : list of str, optional
+        只读取这些列（列式格式只解码所需的列）
+    dtype_backend : str, optional
+        列式格式的数据类型后端，'pyarrow' 时字符串列不转换为Python对象，读取大表更快
+
+    Returns
+    -------
+    pandas.DataFrame
+        读取的数据
+    """
+    import pandas as pd
+
+    path = find_artifact(save_dir, artifact)
+    if path is None:
+        raise FileNotFoundError(os.path.join(save_dir, artifact))
+
+    ext = os.path.splitext(path)[1]
+    if ext == '.csv':
+        return pd.read_csv(path, index_col=index_col, usecols=columns)
+
+    _require_pyarrow(ext[1:])
+    if columns is not None and isinstance(index_col, str) and index_col not in columns:
+        columns = [index_col] + list(columns)
+    options = {} if dtype_backend is None else {'dtype_backend': dtype_backend}
+    if ext == '.parquet':
+        df = pd.read_parquet(path, columns=columns, **options)
+    else:
+        df = pd.read_feather(path, columns=columns, **options)
+    if index_col is not None:
+        df = df.set_index(df.columns[index_col] if isinstance(index_col, int) else index_col)
+    return df
+
+def save_grouped_table(df, save_dir, artifact, key, categorical=None):
+    """
+    按分组列保存长表，并写出分组索引
+
+    同一组的行连续存放（组的先后顺序与首次出现的顺序相同），
+    索引文件（见 index_file）记录每组的行范围。
+    列式格式中每组单独成块（parquet的row group / feather的record batch），
+    load_grouped_table 读取部分分组时只解码对应的块，CSV也只解析对应的行
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        长表数据
+    save_dir : str
+        保存目录
+    artifact : str
+        逻辑文件名（.csv）
+    key : str
+        分组列，如 resource
+    categorical : list of str, optional
+        列式格式中额外以分类编码保存的列
+
+    Returns
+    -------
+    str
+        主文件路径
+    """
+    import json
+    import numpy as np
+    import pandas as pd
+
+    os.makedirs(save_dir, exist_ok=True)
+    codes, values = pd.factorize(df[key], sort=False)
+    df = df.iloc[np.argsort(codes, kind='stable')].reset_index(drop=True)
+    counts = np.bincount(codes, minlength=len(values))
+    stops = np.cumsum(counts)
+    groups = [[value, int(stop - count), int(stop)]
+              for value, count, stop in zip(values.tolist(), counts, stops)]
+
+    paths = [os.path.join(save_dir, name) for name in artifact_files(artifact)]
+    remove_stale_files(save_dir, artifact, paths)
+    for path in paths:
+        ext = os.path.splitext(path)[1]
+        if ext == '.csv':
+            df.to_csv(path, index=False, encoding='utf-8')
+            continue
+
+        _require_pyarrow(ext[1:])
+        import pyarrow as pa
+        table = pa.Table.from_pandas(encode_categories(df, categorical), preserve_index=False)
+        if ext == '.parquet':
+            import pyarrow.parquet as pq
+            with pq.ParquetWriter(path, table.schema, compression=COMPRESSION) as writer:
+                for _, start, stop in groups:
+                    writer.write_table(table.slice(start, stop - start), row_group_size=stop - start)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+            with pa.ipc.new_file(path, table.schema, options=options) as writer:
+                for _, start, stop in groups:
+                    writer.write_table(table.slice(start, stop - start), max_chunksize=stop - start)
+
+    index = {'key': key, 'columns': list(df.columns), 'groups': groups}
+    with open(os.path.join(save_dir, index_file(artifact)), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    return paths[0]
+
+def load_grouped_table(save_dir, artifact, keys=None, columns=None, start=None, end=None, date_column='date'):
+    """
+    读取分组长表中的部分分组和时间范围
+
+    Parameters
+    ----------
+    save_dir : str
+        数据目录
+    artifact : str
+        逻辑文件名（.csv）
+    keys : list, optional
+        要读取的分组取值，默认读取全部
+    columns : list of str, optional
+        只读取这些列
+    start, end : optional
+        时间范围（闭区间），与 date_column 列的取值可比较，如 '2019-01-01' 或年份
+    date_column : str, optional
+        时间列名
+
+    Returns
+    -------
+    pandas.DataFrame
+        所选分组的数据
+    """
+    import json
+    import pandas as pd
+
+    path = find_artifact(save_dir, artifact)
+    index_path = os.path.join(save_dir, index_file(artifact))
+    if path is None:
+        raise FileNotFoundError(os.path.join(save_dir, artifact))
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"缺少分组索引 {index_path}，请用 save_grouped_table 重新生成")
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    key = index['key']
+    if keys is None:
+        selected = list(range(len(index['groups'])))
+    else:
+        positions = {value: i for i, (value, _, _) in enumerate(index['groups'])}
+        missing = [value for value in keys if value not in positions]
+        if missing:
+            raise KeyError(f"{artifact} 中没有分组: {', '.join(map(str, missing))}")
+        selected = [positions[value] for value in keys]
+
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys([key] + list(columns)
+                                          + ([date_column] if start is not None or end is not None else [])))
+        read_columns = [column for column in index['columns'] if column in read_columns]
+
+    ext = os.path.splitext(path)[1]
+    if ext == '.csv':
+        header = pd.read_csv(path, nrows=0).columns
+        parts = [pd.read_csv(path, header=None, names=header, usecols=read_columns,
+                             skiprows=range(0, first + 1), nrows=last - first)
+                 for _, first, last in (index['groups'][i] for i in selected)]
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=read_columns or header)
+    elif ext == '.parquet':
+        _require_pyarrow('parquet')
+        import pyarrow.parquet as pq
+        df = pq.ParquetFile(path).read_row_groups(selected, columns=read_columns).to_pandas()
+    else:
+        _require_pyarrow('feather')
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        table = pa.Table.from_batches([reader.get_batch(i) for i in selected], schema=reader.schema)
+        df = (table.select(read_columns) if read_columns else table).to_pandas()
+
+    return _filter_dates(df, columns, start, end, date_column)
+
+def _filter_dates(df, columns, start, end, date_column):
+    if start is not None:
+        df = df[df[date_column] >= start]
+    if end is not None:
+        df = df[df[date_column] <= end]
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
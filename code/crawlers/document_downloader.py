@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关税清单文件的并发下载器
+USTR 第301条款各轮清单和国务院关税税则委员会的反制清单附件以数十个分页的 HTML/PDF/Excel 文件发布，
+下载器按文件清单（来源 → 轮次 → URL）并发下载：
+- asyncio 调度：总并发数和每个主机的并发数分别由信号量限制，传输在专用线程池中以流式方式进行，
+  复用 fetch_client 的连接池会话
+- 流式写盘：响应按块写入 .part 文件，内存占用与文件大小无关
+- 断点续传：中断后 .part 文件保留，重试或下次运行时以 Range 请求续传（服务器不支持时从头下载）
+- 校验：每个文件计算 sha256，与清单给出的校验值比对；结果记录在下载目录的 checksums.json 中，
+  下次运行时已下载且校验一致的文件直接跳过
+
+文件清单为JSON，来源 -> 轮次 -> 文件列表，文件可以是URL字符串，
+也可以是包含 url 以及可选的 name（保存文件名）、sha256（期望校验值）的字典，
+字典中的其他键（如解析用的 implementation_date、rate）原样保留在文件项中：
+    {
+        "ustr": {"1": ["https://.../list1.pdf"], "3": [{"url": "https://.../list3.xlsx", "sha256": "..."}]},
+        "mof": {"2018-08": ["https://.../annex1.xls", "https://.../annex2.xls"]}
+    }
+
+用法示例：
+    python document_downloader.py documents.json --concurrency 16
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+from fetch_client import (BASE_DIR, PER_HOST, RETRIES, RETRY_STATUS, TIMEOUT, FetchError, new_session,
+                          retry_delay)
+
+DOCUMENT_DIR = os.path.join(BASE_DIR, 'data', 'cache', 'documents')
+CHECKSUM_FILE = 'checksums.json'
+# 默认总并发数和流式写盘的块大小
+CONCURRENCY = 8
+CHUNK_SIZE = 1 << 16
+
+def file_sha256(path, chunk_size=1 << 20):
+    """分块计算文件的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def document_name(url):
+    """URL -> 默认保存文件名（路径最后一段，没有时为 index.html）"""
+    return unquote(os.path.basename(urlsplit(url).path)) or 'index.html'
+
+def load_document_manifest(manifest, dest_dir=DOCUMENT_DIR):
+    """
+    读取文件清单，展开为文件列表
+
+    Parameters
+    ----------
+    manifest : str or dict
+        清单文件路径，或已读取的清单
+    dest_dir : str, optional
+        下载目录，文件保存在 dest_dir/来源/轮次/文件名
+
+    Returns
+    -------
+    list of dict
+        每个文件一项：source、round、url、name、sha256（可为None）、path，以及清单中的其他键
+    """
+    if isinstance(manifest, str):
+        with open(manifest, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    documents = []
+    for source, rounds in manifest.items():
+        for round_name, entries in rounds.items():
+            used = set()
+            for entry in entries:
+                entry = {'url': entry} if isinstance(entry, str) else dict(entry)
+                name = entry.get('name') or document_name(entry['url'])
+                if name in used:
+                    # 同一轮次中文件名重复（如多个 index.html）时加上序号
+                    stem, ext = os.path.splitext(name)
+                    name = f"{stem}-{len(used)}{ext}"
+                used.add(name)
+                documents.append({
+                    **entry,
+                    'source': source,
+                    'round': str(round_name),
+                    'url': entry['url'],
+                    'name': name,
+                    'sha256': entry.get('sha256'),
+                    'path': os.path.join(dest_dir, source, str(round_name), name),
+                })
+    return documents
+
+def download_document(session, document, known=None, chunk_size=CHUNK_SIZE, retries=RETRIES, timeout=TIMEOUT):
+    """
+    流式下载一个文件（在工作线程中运行），支持断点续传和校验
+
+    Parameters
+    ----------
+    session : requests.Session
+        会话
+    document : dict
+        文件（见 load_document_manifest）
+    known : str, optional
+        上次下载记录的 sha256，文件已存在且与之一致时跳过
+    chunk_size : int, optional
+        写盘块大小
+    retries : int, optional
+        最大重试次数，每次重试从 .part 文件的末尾续传
+    timeout : tuple, optional
+        (连接超时, 读取超时) 秒
+
+    Returns
+    -------
+    dict
+        文件各项，另加 sha256、size、status（cached / downloaded / resumed）
+    """
+    path, url = document['path'], document['url']
+    expected = document.get('sha256') or known
+    if os.path.exists(path):
+        digest = file_sha256(path)
+        if expected is None or digest == expected:
+            return dict(document, sha256=digest, size=os.path.getsize(path), status='cached')
+        os.remove(path)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part = path + '.part'
+    resumed = False
+    for attempt in range(retries + 1):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        response = None
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code == 416 and offset:
+                    # .part 已是完整文件
+                    break
+                if response.status_code not in RETRY_STATUS:
+                    if response.status_code >= 400:
+                        raise FetchError(f"下载 {url} 失败: HTTP {response.status_code}")
+                    # 206 从断点续写；200 表示服务器忽略了 Range，从头写
+                    append = response.status_code == 206 and offset > 0
+                    resumed = resumed or append
+                    with open(part, 'ab' if append else 'wb') as f:
+                        for block in response.iter_content(chunk_size):
+                            f.write(block)
+                    break
+                error = f"HTTP {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        if attempt == retries:
+            raise FetchError(f"下载 {url} 失败（重试 {retries} 次，已保留 {part} 以便续传）: {error}")
+        time.sleep(retry_delay(attempt, response))
+
+    digest = file_sha256(part)
+    if document.get('sha256') and digest != document['sha256']:
+        os.remove(part)
+        raise FetchError(f"{url} 校验失败: sha256 {digest} 与清单中的 {document['sha256']} 不一致")
+    os.replace(part, path)
+    return dict(document, sha256=digest, size=os.path.getsize(path), status='resumed' if resumed else 'downloaded')
+
+async def download_documents(documents, dest_dir=DOCUMENT_DIR, concurrency=CONCURRENCY, per_host=PER_HOST,
+                             chunk_size=CHUNK_SIZE, retries=RETRIES, session=None):
+    """
+    并发下载文件列表
+
+    Parameters
+    ----------
+    documents : list of dict
+        文件（见 load_document_manifest）
+    dest_dir : str, optional
+        下载目录（保存 checksums.json）
+    concurrency : int, optional
+        总并发数
+    per_host : int, optional
+        每个主机的并发数
+    chunk_size, retries : int, optional
+        见 download_document
+    session : requests.Session, optional
+        会话，默认新建连接池大小为 concurrency 的会话
+
+    Returns
+    -------
+    list of dict
+        与 documents 顺序相同的结果；失败的文件 status 为 failed，error 为原因
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    checksum_path = os.path.join(dest_dir, CHECKSUM_FILE)
+    checksums = {}
+    if os.path.exists(checksum_path):
+        with open(checksum_path, encoding='utf-8') as f:
+            checksums = json.load(f)
+
+    own_session = session is None
+    session = session or new_session(pool_size=concurrency)
+    limit = asyncio.Semaphore(concurrency)
+    hosts = {}
+    loop = asyncio.get_running_loop()
+
+    def key(document):
+        return os.path.relpath(document['path'], dest_dir)
+
+    async def run(executor, document):
+        slot = hosts.setdefault(urlsplit(document['url']).netloc, asyncio.Semaphore(per_host))
+        # 先取主机的名额再取全局名额：排队等待繁忙主机的任务不占用全局名额，不阻塞其他主机
+        async with slot, limit:
+            try:
+                return await loop.run_in_executor(executor, download_document, session, document,
+                                                  checksums.get(key(document)), chunk_size, retries)
+            except (FetchError, OSError) as exc:
+                return dict(document, status='failed', error=str(exc))
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = await asyncio.gather(*(run(executor, document) for document in documents))
+    finally:
+        if own_session:
+            session.close()
+
+    for result in results:
+        if result['status'] != 'failed':
+            checksums[key(result)] = result['sha256']
+    with open(checksum_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(checksums.items())), f, ensure_ascii=False, indent=2)
+    return results
+
+def download_manifest(manifest, dest_dir=DOCUMENT_DIR, sources=None, **kwargs):
+    """
+    下载文件清单中的全部（或指定来源的）文件，参数同 download_documents
+
+    Returns
+    -------
+    list of dict
+        下载结果
+    """
+    documents = load_document_manifest(manifest, dest_dir)
+    if sources:
+        documents = [document for document in documents if document['source'] in sources]
+    return asyncio.run(download_documents(documents, dest_dir, **kwargs))
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='并发下载关税清单文件')
+    parser.add_argument('manifest', help='文件清单（JSON，来源 -> 轮次 -> URL列表）')
+    parser.add_argument('--dest', default=DOCUMENT_DIR, help=f'下载目录（默认 {DOCUMENT_DIR}）')
+    parser.add_argument('--sources', nargs='*', help='只下载这些来源')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help=f'总并发数（默认 {CONCURRENCY}）')
+    parser.add_argument('--per-host', type=int, default=PER_HOST, help=f'每个主机的并发数（默认 {PER_HOST}）')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    results = download_manifest(args.manifest, args.dest, sources=args.sources,
+                                concurrency=args.concurrency, per_host=args.per_host)
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if result['status'] == 'failed':
+            print(f"  失败 {result['source']}/{result['round']}/{result['name']}: {result['error']}")
+    size = sum(result.get('size', 0) for result in results)
+    summary = '，'.join(f"{status} {count}" for status, count in sorted(counts.items()))
+    print(f"共 {len(results)} 个文件（{summary}），{size / 1e6:.1f} MB，用时 {time.time() - start:.2f} 秒")
+    return 1 if counts.get('failed') else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键事件日历
+事件日期只解析一次并保存为有序的 datetime64 数组，
+对整组日期用 searchsorted 一次求出每个日期前后若干天（或月）内的事件，
+供战略资源、冲突风险、贸易和社交媒体等数据生成器共用
+"""
+
+import numpy as np
+
+# 中美经贸关系关键事件时间点
+KEY_EVENTS = {
+    '2018-03-22': '美国宣布对中国商品征收关税',
+    '2018-04-02': '中国对美国128种商品加征关税',
+    '2018-07-06': '美国对340亿美元中国商品加征25%关税',
+    '2018-08-23': '美国对160亿美元中国商品加征25%关税',
+    '2018-09-24': '美国对2000亿美元中国商品加征10%关税',
+    '2019-05-10': '美国将2000亿美元中国商品关税税率从10%上调至25%',
+    '2019-08-01': '美国宣布对剩余3000亿美元中国商品加征10%关税',
+    '2019-12-13': '中美第一阶段经贸协议达成',
+    '2020-01-15': '中美签署第一阶段经贸协议',
+    '2020-02-14': '中美第一阶段经贸协议生效',
+    '2020-08-15': '中美第一阶段经贸协议评估会议',
+    '2021-01-20': '拜登就任美国总统',
+    '2021-10-04': '美国贸易代表戴琪发表对华贸易政策演讲',
+    '2022-01-01': '区域全面经济伙伴关系协定生效',
+    '2022-02-24': '俄乌冲突爆发',
+    '2022-08-09': '美国《芯片与科学法案》签署',
+    '2022-10-07': '美国发布对华半导体出口管制新规',
+    '2023-08-09': '美国发布对华投资限制行政令',
+    '2023-10-15': '中国发布稀土出口管制新规',
+    '2024-06-15': '美国宣布新一轮对华关税措施',
+    '2024-11-05': '美国大选日',
+    '2025-01-20': '美国新总统就职',
+}
+
+def as_dates(values, unit='D'):
+    """
+    将日期（字符串、datetime、Timestamp、DatetimeIndex等）转换为 datetime64 数组
+
+    Parameters
+    ----------
+    values : scalar or array-like
+        日期或日期序列
+    unit : str, optional
+        时间精度：'D' 按天，'M' 按月
+
+    Returns
+    -------
+    numpy.ndarray
+        datetime64[unit] 数组
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = np.array([np.datetime64(value, 'D') for value in values.ravel()]).reshape(values.shape)
+    return values.astype(f'datetime64[{unit}]')
+
+class EventCalendar:
+    """
+    按日期排序的事件表
+
+    Parameters
+    ----------
+    events : dict
+        事件日期（字符串或datetime）-> 事件内容（描述文本或参数字典）
+    """
+
+    def __init__(self, events):
+        items = sorted(events.items(), key=lambda item: as_dates([item[0]])[0])
+        self.dates = as_dates([date for date, _ in items])
+        self.events = [event for _, event in items]
+
+    def __len__(self):
+        return len(self.events)
+
+    def window(self, dates, before, after=0, unit='D'):
+        """
+        求每个日期的事件窗口：事件日期落在 [date - before, date + after] 内
+
+        Parameters
+        ----------
+        dates : array-like
+            查询日期序列
+        before, after : int
+            日期之前 / 之后的天数（unit='M' 时为月数），闭区间
+        unit : str, optional
+            'D' 按天比较，'M' 按月比较
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (starts, stops)：第i个日期的窗口内事件为 events[starts[i]:stops[i]]，按日期先后排列
+        """
+        dates = as_dates(dates, unit)
+        event_dates = self.dates.astype(f'datetime64[{unit}]')
+        starts = np.searchsorted(event_dates, dates - np.timedelta64(before, unit), side='left')
+        stops = np.searchsorted(event_dates, dates + np.timedelta64(after, unit), side='right')
+        return starts, np.maximum(stops, starts)
+
+    def first_in_window(self, dates, before, after=0, unit='D'):
+        """窗口内最早事件的下标，没有事件时为-1"""
+        starts, stops = self.window(dates, before, after, unit)
+        return np.where(stops > starts, starts, -1)
+
+    def last_in_window(self, dates, before, after=0, unit='D'):
+        """窗口内最近（日期最晚）事件的下标，没有事件时为-1"""
+        starts, stops = self.window(dates, before, after, unit)
+        return np.where(stops > starts, stops - 1, -1)
+
+    def days_since(self, dates, index):
+        """
+        各日期距所给事件的天数
+
+        Parameters
+        ----------
+        dates : array-like
+            查询日期序列
+        index : numpy.ndarray
+            事件下标（如 last_in_window 的结果），-1 处返回-1
+
+        Returns
+        -------
+        numpy.ndarray
+            天数（整数）
+        """
+        dates = as_dates(dates)
+        index = np.asarray(index)
+        days = (dates - self.dates[np.maximum(index, 0)]).astype(np.int64) if len(self) else np.zeros(len(dates), dtype=np.int64)
+        return np.where(index >= 0, days, -1)
+
+    def events_in_window(self, dates, before, after=0, unit='D'):
+        """每个日期窗口内的事件内容列表（按日期先后排列）"""
+        starts, stops = self.window(dates, before, after, unit)
+        return [self.events[start:stop] for start, stop in zip(starts, stops)]
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+爬虫共用的HTTP抓取层
+- 连接池：所有请求共用一个 requests.Session，同一主机复用TCP/TLS连接
+- 每个主机的并发上限：多线程抓取时同一主机同时进行的请求数不超过 per_host
+- 重试：连接错误、超时和 429/5xx 响应按指数退避（带随机抖动）重试，优先遵循 Retry-After
+- 条件请求：缓存中有 ETag / Last-Modified 时发送 If-None-Match / If-Modified-Since，
+  304 响应直接使用缓存内容
+- 响应缓存：响应体按 sha256 内容寻址保存（objects/ab/abcdef...），相同内容只存一份；
+  URL 到内容摘要、ETag、Last-Modified 等的映射保存在 index/ 下的JSON文件中
+- 离线模式（offline=True 或环境变量 CRAWLER_OFFLINE=1）：只从缓存读取，缓存中没有时报错，
+  因此可以把录制好的缓存目录作为固定数据（fixtures）在无网络环境下运行爬虫
+
+抓取结果是字典：url、status、content（bytes）、headers、sha256、path（缓存文件）、from_cache
+"""
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.environ.get('CRAWLER_HTTP_CACHE', os.path.join(BASE_DIR, 'data', 'cache', 'http'))
+
+USER_AGENT = 'tongjijianmo-tariff-crawler/1.0 (+research; contact via repository)'
+# (连接超时, 读取超时) 秒
+TIMEOUT = (10, 60)
+# 连接池大小和每个主机的并发上限
+POOL_SIZE = 16
+PER_HOST = 4
+# 重试次数、退避基数和上限（秒）
+RETRIES = 4
+BACKOFF = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 缓存中保留的响应头
+CACHED_HEADERS = ['Content-Type', 'Content-Length', 'Content-Disposition', 'ETag', 'Last-Modified']
+
+class FetchError(OSError):
+    """抓取失败：重试后仍出错、非重试的错误状态码，或离线模式下缓存中没有"""
+
+def url_key(url):
+    """URL -> 缓存索引文件名"""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+def _write_atomic(path, data):
+    """先写临时文件再改名，并发写同一文件时读者只会看到完整内容"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class ResponseCache:
+    """
+    内容寻址的响应缓存
+
+    Parameters
+    ----------
+    cache_dir : str
+        缓存目录，下设 objects/（响应体）和 index/（URL元数据）
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def object_path(self, digest):
+        """内容摘要 -> 响应体文件路径"""
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest)
+
+    def _index_path(self, url):
+        return os.path.join(self.cache_dir, 'index', url_key(url) + '.json')
+
+    def lookup(self, url):
+        """URL的缓存元数据，没有缓存（或响应体已丢失）时返回None"""
+        try:
+            with open(self._index_path(url), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return meta if os.path.exists(self.object_path(meta['sha256'])) else None
+
+    def read(self, meta):
+        """读取缓存的响应体"""
+        with open(self.object_path(meta['sha256']), 'rb') as f:
+            return f.read()
+
+    def store(self, url, status, headers, content):
+        """
+        保存响应，返回元数据
+
+        相同内容的响应体只写一次；元数据记录摘要、保留的响应头和抓取时间
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            _write_atomic(path, content)
+        meta = {
+            'url': url,
+            'status': status,
+            'sha256': digest,
+            'size': len(content),
+            'headers': {name: headers[name] for name in CACHED_HEADERS if name in headers},
+            'fetched_at': time.time(),
+        }
+        self._write_meta(url, meta)
+        return meta
+
+    def touch(self, url, meta, headers=None):
+        """条件请求返回304后更新抓取时间（以及服务器给出的新验证器）"""
+        meta = dict(meta, fetched_at=time.time())
+        for name in ('ETag', 'Last-Modified'):
+            if headers is not None and name in headers:
+                meta['headers'][name] = headers[name]
+        self._write_meta(url, meta)
+        return meta
+
+    def _write_meta(self, url, meta):
+        _write_atomic(self._index_path(url), json.dumps(meta, ensure_ascii=False, indent=2).encode('utf-8'))
+
+def new_session(pool_size=POOL_SIZE):
+    """带连接池的 requests.Session；重试由调用方处理（需要遵循 Retry-After 和主机并发限制），连接池不再重试"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def retry_delay(attempt, response=None, backoff=BACKOFF, backoff_max=BACKOFF_MAX):
+    """
+    第 attempt 次重试前的等待秒数
+
+    响应带 Retry-After（秒数或HTTP日期）时遵循之，否则为 backoff × 2^attempt，
+    乘以 [0.5, 1.5) 的随机抖动，避免多个进程同时重试；不超过 backoff_max
+    """
+    if response is not None and 'Retry-After' in response.headers:
+        value = response.headers['Retry-After']
+        try:
+            return min(float(value), backoff_max)
+        except ValueError:
+            try:
+                return min(max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0), backoff_max)
+            except (TypeError, ValueError):
+                pass
+    return min(backoff * 2 ** attempt * (0.5 + random.random()), backoff_max)
+
+class FetchClient:
+    """
+    带连接池、主机并发限制、重试、条件请求和响应缓存的HTTP客户端（线程安全）
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        响应缓存目录
+    max_age : float, optional
+        缓存的有效期（秒）：有效期内直接使用缓存、不发请求；
+        None 表示始终向服务器验证（有验证器时发送条件请求）
+    offline : bool, optional
+        只使用缓存，默认取环境变量 CRAWLER_OFFLINE
+    per_host : int, optional
+        每个主机的并发请求上限
+    retries : int, optional
+        最大重试次数
+    backoff : float, optional
+        指数退避的基数（秒）
+    timeout : tuple, optional
+        (连接超时, 读取超时) 秒
+    session : requests.Session, optional
+        自定义会话，默认新建带连接池的会话
+
+    Examples
+    --------
+    >>> with FetchClient() as client:
+    ...     page = client.get('https://ustr.gov/issue-areas/enforcement/section-301-investigations/tariff-actions')
+    ...     html = page['content'].decode('utf-8')
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_age=None, offline=None, per_host=PER_HOST, retries=RETRIES,
+                 backoff=BACKOFF, timeout=TIMEOUT, session=None):
+        self.cache = ResponseCache(cache_dir)
+        self.max_age = max_age
+        self.offline = os.environ.get('CRAWLER_OFFLINE', '') not in ('', '0') if offline is None else offline
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or new_session()
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url):
+        """主机的并发信号量"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    def _request(self, url, headers):
+        """发送GET请求，按需重试；返回最后一次的响应"""
+        slot = self._host_slot(url)
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                with slot:
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            if attempt == self.retries:
+                raise FetchError(f"抓取 {url} 失败（重试 {self.retries} 次）: {error}")
+            time.sleep(retry_delay(attempt, response, self.backoff))
+
+    def _result(self, url, meta, from_cache, content=None):
+        return {
+            'url': url,
+            'status': meta['status'],
+            'content': self.cache.read(meta) if content is None else content,
+            'headers': dict(meta['headers']),
+            'sha256': meta['sha256'],
+            'path': self.cache.object_path(meta['sha256']),
+            'from_cache': from_cache,
+        }
+
+    def get(self, url, params=None, max_age=None, refresh=False):
+        """
+        抓取URL（经过缓存）
+
+        Parameters
+        ----------
+        url : str
+            地址
+        params : dict, optional
+            查询参数
+        max_age : float, optional
+            本次请求的缓存有效期，默认使用客户端设置
+        refresh : bool, optional
+            忽略有效期，向服务器验证缓存
+
+        Returns
+        -------
+        dict
+            url、status、content、headers、sha256、path、from_cache
+        """
+        url = requests.Request('GET', url, params=params).prepare().url
+        meta = self.cache.lookup(url)
+        max_age = self.max_age if max_age is None else max_age
+        if meta is not None and (self.offline or (not refresh and max_age is not None
+                                                  and time.time() - meta['fetched_at'] < max_age)):
+            return self._result(url, meta, from_cache=True)
+        if self.offline:
+            raise FetchError(f"离线模式下缓存中没有 {url}（缓存目录: {self.cache.cache_dir}）")
+
+        headers = {}
+        if meta is not None:
+            if 'ETag' in meta['headers']:
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        response = self._request(url, headers)
+        if response.status_code == 304 and meta is not None:
+            return self._result(url, self.cache.touch(url, meta, response.headers), from_cache=True)
+        if response.status_code >= 400:
+            raise FetchError(f"抓取 {url} 失败: HTTP {response.status_code}")
+
+        content = response.content
+        meta = self.cache.store(url, response.status_code, response.headers, content)
+        return self._result(url, meta, from_cache=False, content=content)
+
+    def get_many(self, urls, max_workers=POOL_SIZE, **kwargs):
+        """
+        并发抓取多个URL（同一主机的并发数受 per_host 限制）
+
+        Returns
+        -------
+        list of dict
+            与 urls 顺序相同的抓取结果
+        """
+        if len(urls) <= 1 or max_workers <= 1:
+            return [self.get(url, **kwargs) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return list(executor.map(lambda url: self.get(url, **kwargs), urls))
+
+    def close(self):
+        """关闭会话（释放连接池）"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# 当前进程的默认客户端，首次使用时创建
+_default = {'client': None}
+
+def default_client():
+    """当前进程共用的 FetchClient（默认缓存目录和设置）"""
+    if _default['client'] is None:
+        _default['client'] = FetchClient()
+    return _default['client']
+
+def fetch(url, **kwargs):
+    """使用默认客户端抓取URL，参数同 FetchClient.get"""
+    return default_client().get(url, **kwargs)
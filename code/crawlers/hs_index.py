@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关税清单的HS编码索引
+将 us_tariffs_on_china 和 china_tariffs_on_us 的全部税号按编码排序，编码右补零到10位后转为整数，
+排序数组上的二分查找（numpy.searchsorted）即可回答：
+- 前缀区间查询：某章、品目、子目下的全部清单行（如 HS 85、品目 8703），以及涉及的轮次
+- 点查询：覆盖某个税号的清单行（相同税号、上级编码和下级税号），以及某日实际适用的加征税率
+查询只做几次二分查找和切片，不再逐行扫描字符串；
+索引以 .npz 压缩格式保存在数据目录（hs_index.npz），并记录源数据文件内容的SHA-256哈希，
+源数据内容未变化时直接读取，无需重建（重新生成但内容相同的数据文件不会使索引过期）
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from build_manifest import file_hash
+from data_store import find_artifact, load_table
+from tariff_annex_parser import format_hs_code, normalize_hs_codes
+
+save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'raw')
+
+HS_INDEX_FILE = 'hs_index.npz'
+
+# 编码右补零后的位数（10位税号）
+KEY_DIGITS = 10
+
+# 索引的清单：名称 -> 数据文件及列（escalation 为税率提高的日期，此后适用 current 税率）
+TARIFF_TABLES = {
+    'us': {
+        'artifact': 'us_tariffs_on_china.csv',
+        'initial': 'initial_tariff_rate',
+        'current': 'current_tariff_rate',
+        'escalation': 'tariff_escalation_date',
+    },
+    'china': {
+        'artifact': 'china_tariffs_on_us.csv',
+        'initial': 'additional_tariff_rate',
+        'current': 'additional_tariff_rate',
+        'escalation': None,
+    },
+}
+
+# 索引中每条清单行的数组
+INDEX_ARRAYS = ['key', 'length', 'table', 'round', 'row', 'start', 'escalation', 'initial_rate', 'current_rate']
+
+def code_digits(code):
+    """查询编码 -> 数字串（去掉点和空格，奇数位补前导零，如 85、8414.59.10、8703）"""
+    digits = ''.join(ch for ch in str(code) if ch.isdigit())
+    if len(digits) % 2:
+        digits = '0' + digits
+    if not 0 < len(digits) <= KEY_DIGITS:
+        raise ValueError(f"无效的HS编码: {code!r}")
+    return digits
+
+def source_signature(data_dir, tables=None):
+    """各清单数据文件的 “文件名:内容SHA-256哈希”，用于判断索引是否过期"""
+    signature = []
+    for name in tables or list(TARIFF_TABLES):
+        path = find_artifact(data_dir, TARIFF_TABLES[name]['artifact'])
+        if path is None:
+            raise FileNotFoundError(os.path.join(data_dir, TARIFF_TABLES[name]['artifact']))
+        signature.append(f"{os.path.basename(path)}:{file_hash(path)}")
+    return signature
+
+class HSIndex:
+    """
+    HS编码的排序索引
+
+    Parameters
+    ----------
+    tables : sequence of str
+        清单名称，arrays['table'] 为其中的位置
+    arrays : dict
+        INDEX_ARRAYS 各项，每条清单行一个元素：key（右补零到10位的编码整数）、length（编码位数）、
+        table、round、row（在源数据文件中的行号）、start（实施日期）、escalation（税率提高日期，可为NaT）、
+        initial_rate、current_rate
+    sources : sequence of str, optional
+        源数据文件签名（见 source_signature）
+    """
+
+    def __init__(self, tables, arrays, sources=()):
+        self.tables = list(tables)
+        self.sources = list(sources)
+        order = np.lexsort((arrays['length'], arrays['key']))
+        self.key = np.asarray(arrays['key'], dtype=np.int64)[order]
+        self.length = np.asarray(arrays['length'], dtype=np.int8)[order]
+        self.table = np.asarray(arrays['table'], dtype=np.int8)[order]
+        self.round = np.asarray(arrays['round'], dtype=np.int16)[order]
+        self.row = np.asarray(arrays['row'], dtype=np.int32)[order]
+        self.start = np.asarray(arrays['start'], dtype='datetime64[D]')[order]
+        self.escalation = np.asarray(arrays['escalation'], dtype='datetime64[D]')[order]
+        self.initial_rate = np.asarray(arrays['initial_rate'], dtype=float)[order]
+        self.current_rate = np.asarray(arrays['current_rate'], dtype=float)[order]
+
+    @classmethod
+    def from_frames(cls, frames, sources=()):
+        """
+        由各清单的 DataFrame 构造
+
+        Parameters
+        ----------
+        frames : dict
+            清单名称（TARIFF_TABLES 的键）-> 清单数据，须包含 round、hs_code、implementation_date 和税率列
+        """
+        parts = []
+        for position, (name, frame) in enumerate(frames.items()):
+            spec = TARIFF_TABLES[name]
+            codes = normalize_hs_codes(frame['hs_code'].to_numpy(dtype=object))
+            valid = codes.notna().to_numpy()
+            codes = codes[valid]
+            escalation = (frame[spec['escalation']] if spec['escalation'] else pd.Series(None, index=frame.index))
+            parts.append({
+                'key': codes.str.ljust(KEY_DIGITS, '0').astype(np.int64).to_numpy(),
+                'length': codes.str.len().to_numpy(),
+                'table': np.full(len(codes), position),
+                'round': frame['round'].to_numpy()[valid],
+                'row': np.flatnonzero(valid),
+                'start': pd.to_datetime(frame['implementation_date']).to_numpy()[valid],
+                'escalation': pd.to_datetime(escalation).to_numpy()[valid],
+                'initial_rate': frame[spec['initial']].to_numpy(dtype=float)[valid],
+                'current_rate': frame[spec['current']].to_numpy(dtype=float)[valid],
+            })
+        arrays = {name: np.concatenate([part[name] for part in parts]) for name in INDEX_ARRAYS}
+        arrays['start'] = arrays['start'].astype('datetime64[D]')
+        arrays['escalation'] = arrays['escalation'].astype('datetime64[D]')
+        return cls(list(frames), arrays, sources)
+
+    def __len__(self):
+        return len(self.key)
+
+    def _table_id(self, table):
+        try:
+            return self.tables.index(table)
+        except ValueError:
+            raise KeyError(f"索引中没有清单: {table}（可选: {', '.join(self.tables)}）") from None
+
+    def positions(self, prefix, table=None):
+        """
+        某编码前缀下的全部清单行
+
+        Parameters
+        ----------
+        prefix : str or int
+            章（85）、品目（8703）、子目（8414.59）或税号
+        table : str, optional
+            只取该清单的行
+
+        Returns
+        -------
+        numpy.ndarray
+            清单行在索引中的位置（按编码排序）
+        """
+        digits = code_digits(prefix)
+        scale = 10 ** (KEY_DIGITS - len(digits))
+        low = int(digits) * scale
+        start, stop = np.searchsorted(self.key, [low, low + scale])
+        found = np.arange(start, stop)
+        # 比前缀短的编码（上级编码）补零后也可能落在区间内
+        mask = self.length[start:stop] >= len(digits)
+        if table is not None:
+            mask &= self.table[start:stop] == self._table_id(table)
+        return found if mask.all() else found[mask]
+
+    def count(self, prefix, table=None):
+        """某编码前缀下的清单行数"""
+        return len(self.positions(prefix, table))
+
+    def covering(self, code, table=None):
+        """
+        覆盖某编码的清单行：相同编码、上级编码（清单按品目或子目列出时）和下级税号
+
+        Returns
+        -------
+        numpy.ndarray
+            清单行在索引中的位置
+        """
+        digits = code_digits(code)
+        found = [self.positions(digits, table)]
+        for length in range(2, len(digits), 2):
+            low = int(digits[:length]) * 10 ** (KEY_DIGITS - length)
+            start, stop = np.searchsorted(self.key, [low, low + 1])
+            mask = self.length[start:stop] == length
+            if table is not None:
+                mask &= self.table[start:stop] == self._table_id(table)
+            found.append(np.arange(start, stop)[mask])
+        return np.concatenate(found) if len(found) > 1 else found[0]
+
+    def rounds(self, prefix, table=None):
+        """
+        某编码前缀下的清单行涉及的轮次
+
+        Returns
+        -------
+        dict
+            清单名称 -> 轮次列表（升序），只包含有清单行的清单
+        """
+        found = self.positions(prefix, table)
+        tables, rounds = self.table[found], self.round[found]
+        return {self.tables[t]: np.unique(rounds[tables == t]).tolist() for t in np.unique(tables)}
+
+    def rates_on(self, positions, date):
+        """清单行在某日适用的加征税率：实施前为0，税率提高日期之后为 current_rate"""
+        date = np.datetime64(date, 'D')
+        escalated = self.escalation[positions] <= date
+        rates = np.where(escalated, self.current_rate[positions], self.initial_rate[positions])
+        return np.where(self.start[positions] <= date, rates, 0.0)
+
+    def rate(self, code, date):
+        """
+        某日对某税号实际适用的加征税率
+
+        覆盖该税号的清单行（见 covering）中当日已实施的最高税率；
+        查询的编码比清单税号短时（如查询8位子目而清单为10位税号），取其下各税号中的最高税率
+
+        Parameters
+        ----------
+        code : str or int
+            HS编码，如 '8414.59.10'
+        date : str or datetime-like
+            日期，如 '2019-06-01'
+
+        Returns
+        -------
+        dict
+            清单名称 -> 加征税率（百分数），未被清单覆盖或尚未实施时为0
+        """
+        found = self.covering(code)
+        rates = self.rates_on(found, date)
+        tables = self.table[found]
+        return {name: float(rates[tables == t].max(initial=0.0)) for t, name in enumerate(self.tables)}
+
+    def hs_codes(self, positions):
+        """清单行的编码（不带点的数字串）"""
+        padded = self.key[positions].astype(f'U{KEY_DIGITS}')
+        return np.array([code.zfill(KEY_DIGITS)[:length] for code, length in zip(padded, self.length[positions])],
+                        dtype=object)
+
+    def lines(self, prefix=None, table=None, date=None):
+        """
+        清单行的明细
+
+        Parameters
+        ----------
+        prefix : str or int, optional
+            编码前缀，默认全部清单行
+        table : str, optional
+            只取该清单的行
+        date : str or datetime-like, optional
+            给出时另加该日适用的税率列 rate
+
+        Returns
+        -------
+        pandas.DataFrame
+            table、round、hs_code、row、implementation_date、escalation_date、initial_rate、current_rate 列
+        """
+        if prefix is not None:
+            found = self.positions(prefix, table)
+        elif table is not None:
+            found = np.flatnonzero(self.table == self._table_id(table))
+        else:
+            found = np.arange(len(self))
+        frame = pd.DataFrame({
+            'table': np.array(self.tables, dtype=object)[self.table[found]],
+            'round': self.round[found],
+            'hs_code': self.hs_codes(found),
+            'row': self.row[found],
+            'implementation_date': self.start[found],
+            'escalation_date': self.escalation[found],
+            'initial_rate': self.initial_rate[found],
+            'current_rate': self.current_rate[found],
+        })
+        if date is not None:
+            frame['rate'] = self.rates_on(found, date)
+        return frame
+
+    def save(self, path):
+        """保存为 .npz 压缩文件：清单名称、源数据签名和 INDEX_ARRAYS 各数组"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, tables=np.array(self.tables, dtype=str), sources=np.array(self.sources, dtype=str),
+                                **{name: getattr(self, name) for name in INDEX_ARRAYS})
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """读取 save 保存的 .npz 文件"""
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(archive['tables'].tolist(), {name: archive[name] for name in INDEX_ARRAYS},
+                       archive['sources'].tolist())
+
+    def __repr__(self):
+        counts = ', '.join(f"{name}={int((self.table == t).sum())}" for t, name in enumerate(self.tables))
+        return f"HSIndex(lines={len(self)}, {counts})"
+
+def build_hs_index(data_dir=save_dir, save=True):
+    """
+    由 us_tariffs_on_china 和 china_tariffs_on_us 构建HS编码索引
+
+    Parameters
+    ----------
+    data_dir : str, optional
+        数据目录
+    save : bool, optional
+        是否保存到 data_dir/hs_index.npz
+
+    Returns
+    -------
+    HSIndex
+        索引
+    """
+    frames = {}
+    for name, spec in TARIFF_TABLES.items():
+        columns = ['round', 'hs_code', 'implementation_date'] + list(dict.fromkeys(
+            column for column in (spec['initial'], spec['current'], spec['escalation']) if column))
+        frames[name] = load_table(data_dir, spec['artifact'], columns=columns)
+    index = HSIndex.from_frames(frames, sources=source_signature(data_dir))
+    if save:
+        index.save(os.path.join(data_dir, HS_INDEX_FILE))
+    return index
+
+def load_hs_index(data_dir=save_dir):
+    """
+    读取数据目录中的HS编码索引；索引不存在或源数据文件内容已变化时重新构建并保存
+
+    Returns
+    -------
+    HSIndex
+        索引
+    """
+    path = os.path.join(data_dir, HS_INDEX_FILE)
+    if os.path.exists(path):
+        index = HSIndex.load(path)
+        if index.sources == source_signature(data_dir):
+            return index
+    return build_hs_index(data_dir)
+
+if __name__ == "__main__":
+    # 用法：python hs_index.py [编码前缀 ...]，如 python hs_index.py 85 8703 8414.59.10
+    hs_index = load_hs_index()
+    print(hs_index)
+    for query in sys.argv[1:]:
+        print(f"HS {format_hs_code(code_digits(query))}: {hs_index.count(query)} 条，"
+              f"轮次 {hs_index.rounds(query)}")
@@ -8,25 +8,53 @@
 
 import requests
 import pandas as pd
-import numpy as np
 import os
 import time
 from datetime import datetime
-import random
+
+from data_store import save_table, TableWriter
+from rng_service import make_rng
+from spatial_weights import SpatialWeights
+from trade_flow_engine import iter_od_flow_chunks
 
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def generate_regional_economic_data():
+# 区域数不超过此值时同时保存带标签的稠密空间权重矩阵CSV
+DENSE_WEIGHTS_MAX_REGIONS = 500
+
+# 关税战时间线：年份 -> 关税影响强度（GDP增速影响 = -强度 × 贸易依存度 × 2，
+# 失业率影响 = 强度 × 贸易依存度 × 0.5）
+TARIFF_IMPACT_BY_YEAR = {
+    2018: 0.3,  # 关税开始，影响30%
+    2019: 0.7,  # 关税升级，影响70%
+    2020: 0.8,  # 关税持续+疫情，影响80%
+    2021: 0.6,  # 关税部分缓和，影响60%
+    2022: 0.8,  # 芯片管制加强，影响80%
+    2023: 0.8,  # 持续影响
+    2024: 0.75, # 新一轮关税调整
+    2025: 0.65  # 部分缓和
+}
+
+def generate_regional_economic_data(tariff_years=TARIFF_IMPACT_BY_YEAR, save=True, seed=None):
     """
     生成区域经济数据
     
     模拟中国不同地区的GDP增速、失业率等数据，
     体现关税战对不同区域的差异化影响
+    
+    参数:
+    - tariff_years: 年份 -> 关税影响强度，默认 TARIFF_IMPACT_BY_YEAR
+    - save: 是否保存（同时生成区域间贸易网络）；敏感性分析中反复求值时为False
+    - seed: 随机种子，默认使用随机数服务的根种子；每个区域使用独立的随机数流
+    
+    返回:
+    - 区域 × 年份的经济数据表
     """
-    print("开始生成区域经济数据...")
+    if save:
+        print("开始生成区域经济数据...")
     
     # 定义中国主要区域
     regions = [
@@ -81,22 +109,11 @@ def generate_regional_economic_data():
     # 年份范围（扩展到2025年）
     years = list(range(2017, 2026))
     
-    # 关税战时间线
-    tariff_years = {
-        2018: 0.3,  # 关税开始，影响30%
-        2019: 0.7,  # 关税升级，影响70%
-        2020: 0.8,  # 关税持续+疫情，影响80%
-        2021: 0.6,  # 关税部分缓和，影响60%
-        2022: 0.8,  # 芯片管制加强，影响80%
-        2023: 0.8,  # 持续影响
-        2024: 0.75, # 新一轮关税调整
-        2025: 0.65  # 部分缓和
-    }
-    
     # 生成数据
     data = []
     
     for region in regions:
+        rng = make_rng(seed, ('regional_economic', region))
         trade_depend = trade_dependency[region]
         region_type = None
         for type_name, type_regions in region_types.items():
@@ -138,7 +155,7 @@ def generate_regional_economic_data():
                     policy_support = 0.5  # 科技创新支持
             
             # 最终GDP增速
-            gdp_growth = base_growth + tariff_effect + special_factor + policy_support + 0.5 * np.random.randn()
+            gdp_growth = base_growth + tariff_effect + special_factor + policy_support + 0.5 * rng.standard_normal()
             gdp_growth = max(0, gdp_growth)  # 确保不为负
             
             # 基础失业率随时间变化（整体改善趋势）
@@ -163,11 +180,11 @@ def generate_regional_economic_data():
                 employment_policy = -0.3  # 就业优先政策效果
                 
             # 最终失业率
-            unemployment_rate = base_unemp + unemp_tariff_effect + covid_effect + employment_policy + 0.2 * np.random.randn()
+            unemployment_rate = base_unemp + unemp_tariff_effect + covid_effect + employment_policy + 0.2 * rng.standard_normal()
             unemployment_rate = max(1.5, unemployment_rate)  # 确保合理的下限
             
             # 投资增速（受关税和地区经济活力影响）
-            investment_growth = gdp_growth + 1.0 + tariff_effect * 0.5 + 1.0 * np.random.randn()
+            investment_growth = gdp_growth + 1.0 + tariff_effect * 0.5 + 1.0 * rng.standard_normal()
             
             # 2024年后投资刺激
             if year >= 2024:
@@ -175,7 +192,7 @@ def generate_regional_economic_data():
                 investment_growth += investment_boost
             
             # 消费增速（受失业率和消费者信心影响）
-            consumption_growth = gdp_growth - 0.2 * (unemployment_rate - base_unemployment[region]) + 0.8 * np.random.randn()
+            consumption_growth = gdp_growth - 0.2 * (unemployment_rate - base_unemployment[region]) + 0.8 * rng.standard_normal()
             
             # 2024年后消费刺激政策
             if year >= 2024:
@@ -205,21 +222,27 @@ def generate_regional_economic_data():
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(data)
-    df.to_csv(os.path.join(save_dir, 'regional_economic_data.csv'), index=False, encoding='utf-8')
+    if not save:
+        return df
+    save_table(df, save_dir, 'regional_economic_data.csv')
     
     # 生成区域间贸易网络数据（用于空间计量分析）
-    generate_regional_trade_network(regions)
+    generate_regional_trade_network(regions, seed=seed)
     
     print(f"区域经济数据生成完成，已保存到: {save_dir}")
     return df
 
-def generate_regional_trade_network(regions):
-    """生成区域间贸易网络数据"""
-    n = len(regions)
+def generate_regional_trade_network(regions, seed=None):
+    """
+    生成区域间贸易网络数据
     
-    # 生成邻接矩阵
-    adjacency = np.zeros((n, n))
+    参数:
+    - regions: 区域名称列表
+    - seed: 随机种子，默认使用随机数服务的根种子
     
+    返回:
+    - 贸易流量的行数
+    """
     # 定义地理邻近关系（简化版）
     neighbors = {
         "广东": ["广西", "湖南", "江西", "福建", "香港", "澳门"],
@@ -245,75 +268,24 @@ def generate_regional_trade_network(regions):
         "河北": ["北京", "天津", "山东", "河南", "山西", "内蒙古", "辽宁"]
     }
     
-    # 转换成邻接矩阵
-    for i, region1 in enumerate(regions):
-        for j, region2 in enumerate(regions):
-            if i == j:
-                continue  # 忽略自环
-            
-            # 如果region2在region1的邻居列表中
-            if region2 in neighbors.get(region1, []) or region1 in neighbors.get(region2, []):
-                adjacency[i, j] = 1
+    # 转换成稀疏邻接矩阵（任一方把对方列为邻居即视为相邻）
+    weights = SpatialWeights.from_neighbors(regions, neighbors)
     
-    # 生成贸易流量数据（基于邻接关系和经济规模）
-    trade_flows = []
+    # 生成贸易流量数据（基于邻接关系和经济规模），按 (年份, 起点分块) 逐块生成并写出
+    years = list(range(2017, 2026))  # 扩展年份范围到2025
+    with TableWriter(save_dir, 'regional_trade_flows.csv', categorical=['origin', 'destination']) as writer:
+        for chunk in iter_od_flow_chunks(regions, weights.matrix, years, seed=seed):
+            writer.write(chunk)
     
-    # 扩展年份范围到2025
-    for year in range(2017, 2026):
-        # 2025年只有Q1数据
-        year_fraction = 1.0
-        if year == 2025:
-            year_fraction = 0.25
-            
-        for i, region1 in enumerate(regions):
-            for j, region2 in enumerate(regions):
-                if i == j:
-                    continue  # 忽略自环
-                
-                # 邻近地区贸易流量更大
-                is_neighbor = adjacency[i, j] > 0
-                neighbor_factor = 2.0 if is_neighbor else 1.0
-                
-                # 距离衰减（简化模型）
-                distance_decay = np.random.uniform(0.5, 1.5) * neighbor_factor
-                
-                # 基础贸易流量（假设是双向的，但不完全对称）
-                base_flow = 100 * distance_decay * np.random.uniform(0.8, 1.2)
-                
-                # 关税战后区域间贸易变化
-                tariff_effect = 1.0
-                if year >= 2018:
-                    # 关税战后国内价值链重构，区域间贸易增加
-                    tariff_effect = 1.0 + 0.05 * (year - 2017)
-                
-                # 2024年后新一轮国内大循环政策
-                if year >= 2024:
-                    tariff_effect += 0.1
-                
-                flow = base_flow * tariff_effect
-                
-                # 2025年只有Q1数据
-                if year == 2025:
-                    flow *= year_fraction
-                
-                trade_flows.append({
-                    'year': year,
-                    'origin': region1,
-                    'destination': region2,
-                    'trade_flow': round(flow, 2),
-                    'is_neighbor': int(is_neighbor),
-                    'year_fraction': year_fraction
-                })
-    
-    # 转换为DataFrame并保存
-    df_trade = pd.DataFrame(trade_flows)
-    df_trade.to_csv(os.path.join(save_dir, 'regional_trade_flows.csv'), index=False, encoding='utf-8')
+    # 保存空间权重矩阵（用于空间计量分析）：稀疏CSR格式，可用 SpatialWeights.load 直接读取
+    weights.save(os.path.join(save_dir, 'regional_spatial_weights.npz'))
     
-    # 创建空间权重矩阵（用于空间计量分析）
-    df_spatial = pd.DataFrame(adjacency, columns=regions, index=regions)
-    df_spatial.to_csv(os.path.join(save_dir, 'regional_spatial_weights.csv'), encoding='utf-8')
+    # 带区域标签的稠密矩阵只在区域较少时保留，便于直接查看
+    if weights.n <= DENSE_WEIGHTS_MAX_REGIONS:
+        df_spatial = pd.DataFrame(weights.to_dense(), columns=regions, index=regions)
+        save_table(df_spatial, save_dir, 'regional_spatial_weights.csv', index=True)
     
-    return df_trade
+    return writer.rows
 
 # 为了兼容run_all_crawlers.py中的函数调用方式，添加主函数别名
 def get_regional_data():
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+战略资源价格与供应链指标的批量模拟引擎
+一次生成 (资源 × 日期) 矩阵：事件冲击由事件日历按日期求出，
+各时期的趋势效应用日期掩码整列计算，不在Python层逐资源、逐月循环。
+每种资源使用以资源名称命名的独立随机数流（只在抽取随机数时逐资源调用），
+某种资源的模拟结果与同时模拟哪些资源无关。
+日期频率可为月度或日度，资源数量可扩展到数千种
+"""
+
+import numpy as np
+import pandas as pd
+
+from event_calendar import KEY_EVENTS, EventCalendar
+from rng_service import make_rng
+
+# 事件冲击幅度：(事件描述的判断条件, 冲击下限, 冲击上限)，按顺序取第一个满足的条件
+EVENT_EFFECTS = [
+    (lambda desc: '关税' in desc or '出口管制' in desc, 0.05, 0.15),
+    (lambda desc: '协议' in desc and '达成' in desc, -0.08, -0.02),
+    (lambda desc: '冲突' in desc, 0.10, 0.20),
+]
+
+# 事件影响窗口（前后天数）
+EVENT_WINDOW_DAYS = 30
+
+# 随机数流名称（每种资源一个流：(RESOURCE_STREAM, 资源名称)）
+RESOURCE_STREAM = 'resource_prices'
+
+def event_effect_bounds(calendar):
+    """
+    每个事件冲击幅度的上下限
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (下限, 上限)，不产生冲击的事件为 (0, 0)
+    """
+    low = np.zeros(len(calendar))
+    high = np.zeros(len(calendar))
+    for i, desc in enumerate(calendar.events):
+        for matches, effect_low, effect_high in EVENT_EFFECTS:
+            if matches(desc):
+                low[i], high[i] = effect_low, effect_high
+                break
+    return low, high
+
+def period_effect_bounds(dates):
+    """
+    各日期所处时期的趋势效应参数
+
+    - 2018-03 至 2019-12 关税战：U(0.02, 0.05) × 距2018-03-01的年数
+    - 2020 疫情扰动：U(0.05, 0.10)
+    - 2021-2022 供应链重构：U(0.03, 0.08)
+    - 2023 起战略竞争加剧：U(0.05, 0.12) × (1 + 距2023年的月数 / 24)
+
+    Parameters
+    ----------
+    dates : pandas.DatetimeIndex
+        日期序列
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (下限, 上限, 倍数)，趋势效应为 U(下限, 上限) × 倍数
+    """
+    dates = pd.DatetimeIndex(dates)
+    low = np.zeros(len(dates))
+    high = np.zeros(len(dates))
+    scale = np.ones(len(dates))
+
+    trade_war = (dates >= '2018-03-01') & (dates <= '2019-12-31')
+    pandemic = (dates >= '2020-01-01') & (dates <= '2020-12-31')
+    restructuring = (dates >= '2021-01-01') & (dates <= '2022-12-31')
+    competition = dates >= '2023-01-01'
+
+    low[trade_war], high[trade_war] = 0.02, 0.05
+    scale[trade_war] = (dates[trade_war] - pd.Timestamp('2018-03-01')).days / 365
+    low[pandemic], high[pandemic] = 0.05, 0.10
+    low[restructuring], high[restructuring] = 0.03, 0.08
+    low[competition], high[competition] = 0.05, 0.12
+    months_since_2023 = (dates.year - 2023) * 12 + dates.month
+    scale[competition] = 1 + months_since_2023[competition] / 24
+
+    return low, high, scale
+
+def _resource_draws(rng, n_dates):
+    """
+    一种资源所需的全部随机数
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (基础价格、基础中国供应占比、美国依赖度降幅、波动率) 4个参数，
+        (事件冲击, 趋势效应) 的 (2 × 日期) 均匀分布随机数，各日期的标准正态波动，
+        (中国供应占比, 美国依赖度) 的 (2 × 日期) 扰动
+    """
+    base = rng.uniform((10, 30, 10, 0.05), (1000, 60, 30, 0.15))
+    return base, rng.random((2, n_dates)), rng.standard_normal(n_dates), rng.uniform(-2, 2, (2, n_dates))
+
+def simulate_resource_prices(resources, dates, seed=None, events=KEY_EVENTS):
+    """
+    批量模拟战略资源的价格和供应链指标
+
+    每种资源有随机的基础价格、中国供应占比、美国依赖度和价格波动率；
+    各期价格变化 = 正态波动 + 事件冲击 + 时期趋势效应
+
+    Parameters
+    ----------
+    resources : sequence of str
+        资源名称
+    dates : pandas.DatetimeIndex
+        日期序列（月度或日度）
+    seed : int, optional
+        随机种子，默认使用随机数服务的根种子
+    events : dict, optional
+        关键事件（日期 -> 描述）
+
+    Returns
+    -------
+    dict
+        resources、dates、event（各日期的事件描述）以及
+        price、price_change（%）、china_supply_pct、us_dependency_pct 四个 (资源 × 日期) 矩阵
+    """
+    dates = pd.DatetimeIndex(dates)
+    n_resources, n_dates = len(resources), len(dates)
+    shape = (n_resources, n_dates)
+
+    draws = [_resource_draws(make_rng(seed, (RESOURCE_STREAM, resource)), n_dates) for resource in resources]
+    base = np.array([draw[0] for draw in draws]).reshape(n_resources, 4)
+    uniforms = np.array([draw[1] for draw in draws]).reshape(n_resources, 2, n_dates)
+    normals = np.array([draw[2] for draw in draws]).reshape(shape)
+    noise = np.array([draw[3] for draw in draws]).reshape(n_resources, 2, n_dates)
+
+    # 各资源的基础参数（列向量，与日期维度广播）
+    base_price = base[:, 0:1]
+    base_china_supply = base[:, 1:2]
+    base_us_dependency = 100 - base[:, 2:3]
+    volatility = base[:, 3:4]
+
+    # 事件冲击：每个日期前后30天内最早的事件
+    calendar = EventCalendar(events)
+    event_index = calendar.first_in_window(dates, before=EVENT_WINDOW_DAYS, after=EVENT_WINDOW_DAYS)
+    effect_low, effect_high = event_effect_bounds(calendar)
+    has_event = event_index >= 0
+    low = np.where(has_event, effect_low[np.maximum(event_index, 0)], 0.0)
+    high = np.where(has_event, effect_high[np.maximum(event_index, 0)], 0.0)
+    event_effect = low + (high - low) * uniforms[:, 0]
+
+    # 时期趋势效应
+    period_low, period_high, period_scale = period_effect_bounds(dates)
+    time_effect = (period_low + (period_high - period_low) * uniforms[:, 1]) * period_scale
+
+    price_change = normals * volatility + event_effect + time_effect
+    price = base_price * (1 + price_change)
+
+    china_supply = np.minimum(95, base_china_supply * (1 + time_effect * 0.5))
+    us_dependency = np.clip(base_us_dependency * (1 - time_effect * 0.3), 5, 95)
+    china_supply += noise[:, 0]
+    us_dependency += noise[:, 1]
+
+    event = np.full(n_dates, None, dtype=object)
+    event[has_event] = np.array(calendar.events, dtype=object)[event_index[has_event]]
+
+    return {
+        'resources': list(resources),
+        'dates': dates,
+        'event': event,
+        'price': np.round(price, 2),
+        'price_change': np.round(price_change * 100, 2),
+        'china_supply_pct': np.round(china_supply, 1),
+        'us_dependency_pct': np.round(us_dependency, 1),
+    }
+
+def to_long_table(simulation):
+    """
+    将模拟结果展开为 资源 × 日期 长表（按资源分组、组内按日期排列）
+
+    Parameters
+    ----------
+    simulation : dict
+        simulate_resource_prices 的结果
+
+    Returns
+    -------
+    pandas.DataFrame
+        date、resource、price、price_change、china_supply_pct、us_dependency_pct、event 列
+    """
+    n_resources = len(simulation['resources'])
+    n_dates = len(simulation['dates'])
+    return pd.DataFrame({
+        'date': np.tile(simulation['dates'].strftime('%Y-%m-%d').to_numpy(dtype=object), n_resources),
+        'resource': pd.Categorical.from_codes(np.repeat(np.arange(n_resources), n_dates),
+                                              simulation['resources']),
+        'price': simulation['price'].ravel(),
+        'price_change': simulation['price_change'].ravel(),
+        'china_supply_pct': simulation['china_supply_pct'].ravel(),
+        'us_dependency_pct': simulation['us_dependency_pct'].ravel(),
+        'event': np.tile(simulation['event'], n_resources),
+    })
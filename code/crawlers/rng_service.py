@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+集中的随机数服务
+所有生成函数都从同一个根种子 (numpy.random.SeedSequence) 派生 numpy.random.Generator：
+每个随机数流由名称路径标识，如 ('regional_economic', '广东')、('resource_prices', '稀土')，
+名称经哈希后作为 SeedSequence 的 spawn_key，同一根种子下不同名称的流相互独立；
+蒙特卡洛路径等编号流用 SeedSequence.spawn 在命名流之下再派生。
+流只由根种子和名称决定，与任务的运行顺序、所在进程和其他流的用量无关，
+因此并行运行与串行运行的结果逐位相同
+"""
+
+import hashlib
+
+import numpy as np
+
+# 当前进程的根种子熵，首次使用时未设置则取操作系统熵（不可复现）
+_root = {'entropy': None}
+
+def seed_all(seed=None):
+    """
+    设置当前进程的根种子（run_all_crawlers --seed）
+
+    Parameters
+    ----------
+    seed : int, optional
+        根种子，None 时使用操作系统熵
+    """
+    _root['entropy'] = np.random.SeedSequence(seed).entropy
+
+def root_entropy():
+    """当前进程的根种子熵"""
+    if _root['entropy'] is None:
+        seed_all()
+    return _root['entropy']
+
+def stream_key(name):
+    """流名称 -> spawn_key 的一个元素：非负整数原样使用，其他名称取 sha256 的前4字节"""
+    if isinstance(name, (int, np.integer)) and name >= 0:
+        return int(name)
+    digest = hashlib.sha256(str(name).encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'little')
+
+def seed_sequence(seed=None, stream=()):
+    """
+    命名流的 SeedSequence
+
+    Parameters
+    ----------
+    seed : int or numpy.random.SeedSequence, optional
+        种子，None 时使用根种子
+    stream : str or tuple, optional
+        流名称或名称路径
+
+    Returns
+    -------
+    numpy.random.SeedSequence
+    """
+    if isinstance(stream, (str, int, np.integer)):
+        stream = (stream,)
+    key = tuple(stream_key(name) for name in stream)
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + key, pool_size=seed.pool_size)
+    return np.random.SeedSequence(root_entropy() if seed is None else seed, spawn_key=key)
+
+def make_rng(seed=None, stream=()):
+    """
+    创建命名流的随机数生成器
+
+    Parameters
+    ----------
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        种子，None 时使用根种子；传入 Generator 时原样返回
+    stream : str or tuple, optional
+        流名称或名称路径；不指定时 make_rng(seed) 与 np.random.default_rng(seed) 相同
+
+    Returns
+    -------
+    numpy.random.Generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed_sequence(seed, stream))
+
+def spawn_rngs(n, seed=None, stream=()):
+    """
+    在命名流之下派生 n 个相互独立的编号流（如蒙特卡洛路径），第 i 个流与 n 无关
+
+    Returns
+    -------
+    list of numpy.random.Generator
+    """
+    return [np.random.default_rng(child) for child in seed_sequence(seed, stream).spawn(n)]
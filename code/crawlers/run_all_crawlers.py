@@ -9,15 +9,26 @@
 import os
 import sys
 import time
+import argparse
 import traceback
-import importlib.util
 from datetime import datetime
-import pandas as pd
 
 # 添加项目根目录到系统路径
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(BASE_DIR)
 
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, CRAWLER_DIR)
+
+from crawler_registry import CRAWLERS, select_crawlers, load_entry_point
+from task_graph import select_tasks, execute_task_graph
+from build_manifest import BuildManifest
+import data_store
+
+def is_table(value):
+    """判断是否为DataFrame等表格对象（避免在主进程中导入pandas）"""
+    return hasattr(value, 'columns') and hasattr(value, '__len__')
+
 def count_records(result):
     """
     计算结果中的记录数量
@@ -35,7 +46,7 @@ def count_records(result):
     if result is None:
         return 0
     
-    if isinstance(result, pd.DataFrame):
+    if is_table(result):
         return len(result)
     elif isinstance(result, list):
         return len(result)
@@ -43,7 +54,7 @@ def count_records(result):
         # 尝试累加字典中的所有值的长度
         total = 0
         for value in result.values():
-            if isinstance(value, (list, pd.DataFrame)):
+            if isinstance(value, list) or is_table(value):
                 total += len(value)
             elif isinstance(value, dict):
                 total += count_records(value)
@@ -56,16 +67,94 @@ def count_records(result):
     # 无法确定记录数
     return 0
 
-def run_all_crawlers():
+def run_crawler_task(task):
+    """
+    在当前进程中运行单个爬虫任务（进程池的工作函数）
+    
+    Parameters
+    ----------
+    task : dict
+        爬虫注册表中的任务声明；
+        包含seed时以其作为随机数服务（rng_service）的根种子，各爬虫从中派生自己的命名随机数流，
+        包含storage时按其设置数据文件的存储格式
+        
+    Returns
+    -------
+    dict
+        任务运行统计：记录数、耗时和CPU时间
+    """
+    task_start_time = time.time()
+    cpu_start_time = time.process_time()
+    
+    # 按需加载爬虫模块的入口函数
+    func = load_entry_point(task)
+    
+    if task.get('storage') is not None:
+        data_store.configure(**task['storage'])
+    
+    if task.get('seed') is not None:
+        import rng_service
+        rng_service.seed_all(task['seed'])
+    
+    result = func(**task.get('kwargs', {}))
+    
+    return {
+        'function': func.__name__,
+        'records': count_records(result),
+        'elapsed': time.time() - task_start_time,
+        'cpu_time': time.process_time() - cpu_start_time
+    }
+
+def run_all_crawlers(max_workers=None, targets=None, seed=None, force=False, only=None, skip=None,
+                     data_format=None, export_csv=None):
     """
     运行所有爬虫脚本，收集完整数据集
     
+    按任务声明的数据依赖关系调度，相互独立的任务使用进程池并行运行；
+    输入、参数、随机种子和代码均未变化的任务直接复用构建清单中记录的数据
+    
     数据时间范围：2017年1月至2025年4月
+    
+    Parameters
+    ----------
+    max_workers : int, optional
+        并行进程数，默认为CPU核心数；为1时在当前进程中依次运行
+    targets : list of str, optional
+        只生成这些数据文件（或任务）及其依赖，默认运行全部任务
+    seed : int, optional
+        随机种子，指定后各爬虫使用由其派生的独立随机数流，结果与任务调度顺序和并行进程数无关
+    force : bool, optional
+        为True时忽略构建清单，重新生成全部数据
+    only : list of str, optional
+        只运行这些爬虫任务（任务名或模块名）
+    skip : list of str, optional
+        跳过这些爬虫任务（任务名或模块名）
+    data_format : str, optional
+        表格数据的存储格式：csv（默认）、parquet 或 feather
+    export_csv : bool, optional
+        使用列式格式时是否同时导出CSV（供R分析脚本读取）
     """
     start_time = time.time()
+    tasks = CRAWLERS
+    if targets:
+        tasks = select_tasks(tasks, targets)
+    if only or skip:
+        selected = {task['name'] for task in select_crawlers(only=only, skip=skip)}
+        tasks = [task for task in tasks if task['name'] in selected]
+    if seed is not None:
+        tasks = [dict(task, seed=seed) for task in tasks]
+    data_store.configure(format=data_format, export_csv=export_csv)
+    storage = data_store.storage_options()
+    tasks = [dict(task, storage=storage) for task in tasks]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tasks)))
+    
     print("=" * 60)
     print("开始全面数据采集".center(50))
     print("时间范围: 2017年1月 - 2025年4月".center(50))
+    print(f"并行进程数: {max_workers}".center(50))
+    print(f"存储格式: {storage['format']}{' (+csv)' if storage['export_csv'] and storage['format'] != 'csv' else ''}".center(50))
     print("=" * 60)
     
     # 确保数据目录存在
@@ -74,121 +163,108 @@ def run_all_crawlers():
     os.makedirs(raw_data_dir, exist_ok=True)
     os.makedirs(processed_data_dir, exist_ok=True)
     
-    # 爬虫模块列表
-    crawler_modules = [
-        ('ustr_tariff_crawler', '美国贸易代表关税数据'),
-        ('us_tariff_crawler', '美国关税清单数据'),
-        ('china_tariff_crawler', '中国关税清单数据'),
-        ('china_customs_crawler', '中国海关进出口数据'),
-        ('trade_data_crawler', '中美贸易数据'),
-        ('social_media_sentiment_crawler', '社交媒体情绪数据'),
-        ('consumer_confidence_crawler', '消费者信心指数数据'),
-        ('regional_economic_crawler', '区域经济数据'),
-        ('strategic_resources_crawler', '战略资源与安全指标数据'),
-    ]
+    manifest = BuildManifest(raw_dir=raw_data_dir, seed=seed, storage=storage)
     
     # 统计信息
-    successful_modules = 0
+    successful_tasks = 0
     total_records = 0
+    total_task_time = 0.0
+    total_cpu_time = 0.0
+    ran_tasks = []
+    reused_tasks = []
     
-    # 依次运行各个爬虫
-    for module_name, data_description in crawler_modules:
-        crawler_start_time = time.time()
-        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 开始采集{data_description}...")
-        
-        try:
-            # 动态导入爬虫模块
-            module_path = os.path.join(os.path.dirname(__file__), f"{module_name}.py")
-            spec = importlib.util.spec_from_file_location(module_name, module_path)
-            crawler_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(crawler_module)
-            
-            # 运行主要爬虫函数（检查不同的函数名）
-            result = None
-            
-            # 检查各种可能的主函数名
-            module_main_prefix = module_name.split('_')[0]
-            possible_functions = [
-                f"generate_{module_main_prefix}_data",  # 例如: generate_us_data
-                f"crawl_{module_main_prefix}_data",     # 例如: crawl_us_data
-                f"get_{module_main_prefix}_data",       # 例如: get_us_data
-                
-                # 完整命名模式，例如: generate_ustr_tariff_data
-                f"generate_{module_name}_data",
-                f"crawl_{module_name}_data",
-                f"get_{module_name}_data",
-                
-                # 包含在文件名中的主要名词
-                f"generate_{module_name.split('_')[0]}_{module_name.split('_')[1]}_data",
-                
-                # 直接使用文件中的具体函数名
-                "get_ustr_tariff_lists",
-                "generate_us_tariff_data",
-                "generate_china_tariff_data",
-                "get_china_us_trade_data",
-                "crawl_trade_data",
-                "generate_social_media_sentiment",
-                "get_consumer_confidence_data",
-                "generate_regional_economic_data",
-                "generate_strategic_resources_data",
-                "generate_military_budget_data",
-                "generate_conflict_risk_indicators",
-                "generate_data",
-                "main"
-            ]
-            
-            # 根据爬虫模块名称添加特定的函数名
-            if module_name == "china_customs_crawler":
-                possible_functions.append("generate_china_customs_data")
-            elif module_name == "social_media_sentiment_crawler":
-                possible_functions.append("generate_social_media_data")
-            elif module_name == "strategic_resources_crawler":
-                possible_functions.append("crawl_strategic_resources_data")
-            
-            # 尝试调用可能的函数
-            for func_name in possible_functions:
-                if hasattr(crawler_module, func_name):
-                    func = getattr(crawler_module, func_name)
-                    result = func()
-                    break
-            
-            if result is None:
-                print(f"  警告: 未找到{module_name}的主函数")
-            
-            # 如果是战略资源爬虫，还需调用额外的军事预算和冲突风险指标生成函数
-            if module_name == "strategic_resources_crawler":
-                if hasattr(crawler_module, "generate_military_budget_data"):
-                    crawler_module.generate_military_budget_data()
-                if hasattr(crawler_module, "generate_conflict_risk_indicators"):
-                    crawler_module.generate_conflict_risk_indicators()
-            
-            # 打印采集结果汇总
-            crawler_end_time = time.time()
-            print(f"✓ {data_description}采集完成！耗时: {crawler_end_time - crawler_start_time:.2f}秒")
-            
-            # 计算并打印记录数
-            record_count = count_records(result)
-            total_records += record_count
-            print(f"  采集记录数: {record_count}")
-            
-            successful_modules += 1
-            
-        except Exception as e:
+    def report(task, stats=None, error=None):
+        nonlocal successful_tasks, total_records, total_task_time, total_cpu_time
+        data_description = task['description']
+        if error is not None:
+            manifest.forget(task)
             print(f"✗ {data_description}采集出错:")
-            print(f"  错误信息: {str(e)}")
-            traceback.print_exc()
+            print(f"  错误信息: {str(error)}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return
+        
+        # 打印采集结果汇总
+        if stats.get('cached'):
+            reused_tasks.append(task['name'])
+            print(f"= {data_description}未变化，复用已有数据")
+        else:
+            manifest.record(task, stats)
+            ran_tasks.append(task['name'])
+            print(f"✓ {data_description}采集完成！耗时: {stats['elapsed']:.2f}秒 (CPU: {stats['cpu_time']:.2f}秒)")
+        print(f"  采集记录数: {stats['records']}")
+        
+        total_records += stats['records']
+        total_task_time += stats['elapsed']
+        total_cpu_time += stats['cpu_time']
+        successful_tasks += 1
+    
+    def log_start(task):
+        print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 开始采集{task['description']}...")
+    
+    cached = None if force else manifest.cached_result
+    try:
+        for task, stats, error in execute_task_graph(tasks, run_crawler_task, max_workers,
+                                                     on_start=log_start, cached=cached):
+            report(task, stats=stats, error=error)
+    finally:
+        manifest.save()
     
     end_time = time.time()
     duration = end_time - start_time
     hours, remainder = divmod(duration, 3600)
     minutes, seconds = divmod(remainder, 60)
+    speedup = total_task_time / duration if duration > 0 else 0.0
     
     print("\n" + "=" * 60)
     print("全部数据采集完成!".center(50))
     print(f"总耗时: {int(hours)}小时 {int(minutes)}分 {seconds:.2f}秒".center(50))
-    print(f"成功模块: {successful_modules}/{len(crawler_modules)}".center(50))
+    print(f"任务累计耗时: {total_task_time:.2f}秒 (CPU: {total_cpu_time:.2f}秒)".center(50))
+    print(f"并行加速比: {speedup:.2f}x".center(50))
+    print(f"成功任务: {successful_tasks}/{len(tasks)}".center(50))
     print(f"总记录数: {total_records}".center(50))
+    print(f"重新生成: {len(ran_tasks)}个任务，复用: {len(reused_tasks)}个任务".center(50))
     print("=" * 60)
+    if ran_tasks:
+        print(f"重新生成的任务: {', '.join(ran_tasks)}")
+    if reused_tasks:
+        print(f"复用清单数据的任务: {', '.join(reused_tasks)}")
+
+def print_crawler_list():
+    """打印已注册的爬虫任务及其入口函数和输出文件"""
+    for task in CRAWLERS:
+        print(f"{task['name']:<24} {task['module']}.{task['function']}  {task['description']}")
+        for artifact in task.get('writes', []):
+            print(f"{'':<24}   -> {artifact}")
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="运行所有数据爬虫，采集完整数据集")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="并行进程数（默认为CPU核心数，1表示依次运行）")
+    parser.add_argument('-t', '--target', action='append', dest='targets', default=None,
+                        help="只生成指定数据文件（如 consumer_sentiment_monthly.csv）或任务及其依赖，可重复指定")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="随机种子（各爬虫使用由其派生的独立随机数流）")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="忽略构建清单，重新生成全部数据")
+    parser.add_argument('--format', choices=sorted(data_store.STORAGE_FORMATS), default=None,
+                        dest='data_format',
+                        help="表格数据的存储格式（默认csv，或由环境变量 CRAWLER_DATA_FORMAT 指定）")
+    parser.add_argument('--export-csv', action='store_true', default=None,
+                        help="使用parquet/feather格式时同时导出CSV")
+    parser.add_argument('-l', '--list', action='store_true',
+                        help="列出已注册的爬虫任务后退出")
+    parser.add_argument('--only', action='append', default=None,
+                        help="只运行指定的爬虫任务（任务名或模块名），可重复指定")
+    parser.add_argument('--skip', action='append', default=None,
+                        help="跳过指定的爬虫任务（任务名或模块名），可重复指定")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    run_all_crawlers() 
\ No newline at end of file
+    args = parse_args()
+    if args.list:
+        print_crawler_list()
+    else:
+        run_all_crawlers(max_workers=args.workers, targets=args.targets, seed=args.seed,
+                         force=args.force, only=args.only, skip=args.skip,
+                         data_format=args.data_format, export_csv=args.export_csv)
@@ -14,22 +14,29 @@ import time
 import json
 import re
 from datetime import datetime, timedelta
-import random
 from collections import Counter
 
+from data_store import save_table
+from rng_service import make_rng
+from event_calendar import EventCalendar
+
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def generate_social_media_sentiment():
+def generate_social_media_sentiment(seed=None):
     """
     生成模拟的社交媒体情感数据
     
     在实际应用中，应使用Selenium、requests等工具爬取社交媒体数据，
     并使用情感分析库如SnowNLP、NLTK等进行情感分析
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
     """
     print("开始生成社交媒体情感数据...")
+    rng = make_rng(seed, 'social_media_weekly')
     
     # 生成周度时间序列（2017年至2025年4月）
     start_date = datetime(2017, 1, 1)
@@ -61,55 +68,56 @@ def generate_social_media_sentiment():
     topics = ['关税', '贸易战', '中美关系', '进出口', '关税清单', '经济影响', '股市', '汇率', '失业', 
              '半导体', '稀土', '芯片', '供应链', '脱钩', '科技战', '国家安全', '外交关系']
     
+    # 每周之前两周内最近的事件及其距今天数（一次求出所有周）
+    event_calendar = EventCalendar(events)
+    latest_event = event_calendar.last_in_window(weeks, before=13)
+    days_since_event = event_calendar.days_since(weeks, latest_event)
+    
     # 生成模拟数据
     data = []
     
-    for week in weeks:
-        week_date = datetime.strptime(week, '%Y-%m-%d')
-        
+    for i, week in enumerate(weeks):
         # 确定该周的基本情绪基线
         # 关税战前相对平静，关税实施后负面情绪上升
         if week < '2018-03-22':  # 关税战前
             base_positive = 0.6
             base_negative = 0.3
             base_neutral = 0.1
-            base_volume = 100 + 50 * np.random.random()  # 基础讨论量
+            base_volume = 100 + 50 * rng.random()  # 基础讨论量
         elif '2018-03-22' <= week < '2018-07-06':  # 关税宣布至实施
             base_positive = 0.4
             base_negative = 0.5
             base_neutral = 0.1
-            base_volume = 500 + 200 * np.random.random()
+            base_volume = 500 + 200 * rng.random()
         elif week >= '2018-07-06' and week < '2024-06-15':  # 关税实施后到2024新关税前
             base_positive = 0.3
             base_negative = 0.6
             base_neutral = 0.1
-            base_volume = 800 + 300 * np.random.random()
+            base_volume = 800 + 300 * rng.random()
         elif week >= '2024-06-15' and week < '2024-11-05':  # 2024新关税后到大选前
             base_positive = 0.25
             base_negative = 0.65
             base_neutral = 0.1
-            base_volume = 1200 + 400 * np.random.random()
+            base_volume = 1200 + 400 * rng.random()
         elif week >= '2024-11-05' and week < '2025-01-20':  # 大选后到新总统就职前
             base_positive = 0.35
             base_negative = 0.55
             base_neutral = 0.1
-            base_volume = 1000 + 300 * np.random.random()
+            base_volume = 1000 + 300 * rng.random()
         else:  # 2025年新总统就职后
             base_positive = 0.45
             base_negative = 0.45
             base_neutral = 0.1
-            base_volume = 800 + 200 * np.random.random()
+            base_volume = 800 + 200 * rng.random()
         
         # 关键事件会引起讨论量激增和情绪波动
         event_effect = 0
         event_name = None
-        for event_date, event_desc in events.items():
-            days_diff = (week_date - datetime.strptime(event_date, '%Y-%m-%d')).days
-            if 0 <= days_diff < 14:  # 事件后两周内有明显影响
-                influence = 1.0 - days_diff / 14.0  # 随时间衰减
-                event_effect = max(event_effect, influence)
-                if days_diff < 7:  # 取最近一周的事件作为本周主要事件
-                    event_name = event_desc
+        if latest_event[i] >= 0:  # 事件后两周内有明显影响，以最近的事件为准
+            days_diff = int(days_since_event[i])
+            event_effect = 1.0 - days_diff / 14.0  # 随时间衰减
+            if days_diff < 7:  # 取最近一周的事件作为本周主要事件
+                event_name = event_calendar.events[latest_event[i]]
         
         # 应用事件效应
         if event_effect > 0:
@@ -140,15 +148,15 @@ def generate_social_media_sentiment():
             neutral_shift = 0
         
         # 计算最终情绪分布和讨论量
-        positive = max(0, min(1, base_positive + positive_shift + 0.05 * np.random.randn()))
-        negative = max(0, min(1, base_negative + negative_shift + 0.05 * np.random.randn()))
+        positive = max(0, min(1, base_positive + positive_shift + 0.05 * rng.standard_normal()))
+        negative = max(0, min(1, base_negative + negative_shift + 0.05 * rng.standard_normal()))
         # 归一化以确保总和为1
         total = positive + negative
         positive /= total
         negative /= total
         neutral = 0  # 已经归一化为正面+负面=1
         
-        volume = base_volume * volume_multiplier * (1 + 0.2 * np.random.randn())
+        volume = base_volume * volume_multiplier * (1 + 0.2 * rng.standard_normal())
         volume = max(10, int(volume))  # 确保至少有一些讨论
         
         # 生成本周热门话题
@@ -158,12 +166,12 @@ def generate_social_media_sentiment():
             topic_weights = [0.6]  # 赋予高权重
             
             # 添加其他随机话题
-            additional_topics = random.sample(topics, 2)
+            additional_topics = rng.choice(topics, 2, replace=False).tolist()
             hot_topics.extend(additional_topics)
             topic_weights.extend([0.2, 0.2])
         else:
             # 随机选择热门话题
-            hot_topics = random.sample(topics, 3)
+            hot_topics = rng.choice(topics, 3, replace=False).tolist()
             topic_weights = [0.4, 0.3, 0.3]
         
         data.append({
@@ -178,19 +186,26 @@ def generate_social_media_sentiment():
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(data)
-    df.to_csv(os.path.join(save_dir, 'social_media_sentiment_weekly.csv'), index=False, encoding='utf-8')
+    save_table(df, save_dir, 'social_media_sentiment_weekly.csv')
     
     # 生成每日情感数据样本（仅生成部分重要时期的每日数据）
-    generate_daily_sentiment_samples(events)
+    generate_daily_sentiment_samples(events, seed=seed)
     
     print(f"社交媒体情感数据生成完成，已保存到: {save_dir}")
     return df
 
-def generate_daily_sentiment_samples(events):
-    """生成重要时间点前后的每日情感数据样本"""
+def generate_daily_sentiment_samples(events, seed=None):
+    """
+    生成重要时间点前后的每日情感数据样本
+    
+    参数:
+    - events: 关键事件（日期 -> 描述）
+    - seed: 随机种子，默认使用随机数服务的根种子；每个事件使用独立的随机数流
+    """
     daily_samples = []
     
     for event_date, event_desc in events.items():
+        rng = make_rng(seed, ('social_media_daily', event_date))
         # 生成事件前7天和后14天的每日数据
         event_dt = datetime.strptime(event_date, '%Y-%m-%d')
         start_date = event_dt - timedelta(days=7)
@@ -262,8 +277,8 @@ def generate_daily_sentiment_samples(events):
                     base_volume = 1000 * np.exp(-days_diff / 7)  # 讨论量指数衰减
             
             # 添加随机波动
-            positive = max(0, min(1, base_positive + 0.05 * np.random.randn()))
-            negative = max(0, min(1, base_negative + 0.05 * np.random.randn()))
+            positive = max(0, min(1, base_positive + 0.05 * rng.standard_normal()))
+            negative = max(0, min(1, base_negative + 0.05 * rng.standard_normal()))
             
             # 归一化
             total = positive + negative
@@ -271,7 +286,7 @@ def generate_daily_sentiment_samples(events):
             negative /= total
             neutral = 0
             
-            volume = int(base_volume * (1 + 0.3 * np.random.randn()))
+            volume = int(base_volume * (1 + 0.3 * rng.standard_normal()))
             volume = max(10, volume)
             
             daily_samples.append({
@@ -288,7 +303,7 @@ def generate_daily_sentiment_samples(events):
     
     # 转换为DataFrame并保存
     df = pd.DataFrame(daily_samples)
-    df.to_csv(os.path.join(save_dir, 'social_media_sentiment_daily_samples.csv'), index=False, encoding='utf-8')
+    save_table(df, save_dir, 'social_media_sentiment_daily_samples.csv')
     
     return df
 
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+稀疏空间权重矩阵
+以CSR稀疏矩阵保存区域间的空间权重，只存储非零元素，
+支持邻接表、k近邻和距离阈值三种构造方式以及行标准化，
+以 .npz 压缩格式读写（区域名称、CSR三个数组和变换方式），可直接用于空间计量估计
+"""
+
+import os
+
+import numpy as np
+from scipy import sparse
+
+class SpatialWeights:
+    """
+    空间权重矩阵
+
+    Parameters
+    ----------
+    ids : sequence of str
+        区域名称，顺序与矩阵的行列一致
+    matrix : scipy.sparse matrix or array-like
+        (n × n) 权重矩阵
+    transform : str, optional
+        'B' 为0/1二元权重，'R' 为行标准化权重，'W' 为其他权重
+    """
+
+    def __init__(self, ids, matrix, transform='B'):
+        self.ids = list(ids)
+        self.matrix = sparse.csr_matrix(matrix, dtype=float)
+        self.matrix.eliminate_zeros()
+        self.matrix.sort_indices()
+        self.transform = transform
+        if self.matrix.shape != (len(self.ids), len(self.ids)):
+            raise ValueError(f"权重矩阵形状 {self.matrix.shape} 与区域数量 {len(self.ids)} 不符")
+
+    @classmethod
+    def from_adjacency(cls, ids, adjacency):
+        """由（稠密或稀疏的）0/1邻接矩阵构造"""
+        return cls(ids, adjacency, transform='B')
+
+    @classmethod
+    def from_neighbors(cls, ids, neighbors, symmetric=True):
+        """
+        由邻居列表构造二元权重
+
+        Parameters
+        ----------
+        ids : sequence of str
+            区域名称
+        neighbors : dict
+            区域 -> 邻近区域列表，不在ids中的邻居被忽略
+        symmetric : bool, optional
+            任一方把对方列为邻居即视为相邻
+        """
+        position = {region: i for i, region in enumerate(ids)}
+        pairs = np.array([(position[region], position[other])
+                          for region, others in neighbors.items() if region in position
+                          for other in others if other in position and other != region],
+                         dtype=np.int64).reshape(-1, 2)
+        rows, cols = pairs[:, 0], pairs[:, 1]
+        if symmetric:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        matrix = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(ids), len(ids))).tocsr()
+        matrix.data[:] = 1.0  # 重复的邻接关系只计一次
+        return cls(ids, matrix, transform='B')
+
+    @classmethod
+    def knn(cls, ids, coords, k):
+        """
+        k近邻权重：每个区域与距离最近的k个区域相邻（非对称）
+
+        Parameters
+        ----------
+        ids : sequence of str
+            区域名称
+        coords : array-like
+            (n × 2) 坐标（如经纬度投影坐标）
+        k : int
+            近邻数量
+        """
+        from scipy.spatial import cKDTree
+
+        coords = np.asarray(coords, dtype=float)
+        n = len(coords)
+        if not 0 < k < n:
+            raise ValueError(f"k须在1到{n - 1}之间")
+        _, neighbors = cKDTree(coords).query(coords, k=k + 1)
+        # 去掉每行中区域自身（距离为0的那个）
+        rows = np.repeat(np.arange(n), k + 1)
+        cols = neighbors.ravel()
+        keep = rows != cols
+        rows, cols = rows[keep], cols[keep]
+        # 有重合坐标时自身可能不在结果中，只保留每行前k个
+        order = np.lexsort((np.arange(len(rows)), rows))
+        rank = np.arange(len(rows)) - np.searchsorted(rows[order], rows[order])
+        rows, cols = rows[order][rank < k], cols[order][rank < k]
+        matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+        return cls(ids, matrix, transform='B')
+
+    @classmethod
+    def distance_band(cls, ids, coords, threshold, binary=True, alpha=-1.0):
+        """
+        距离阈值权重：距离不超过threshold的区域相邻
+
+        Parameters
+        ----------
+        ids : sequence of str
+            区域名称
+        coords : array-like
+            (n × 2) 坐标
+        threshold : float
+            距离阈值
+        binary : bool, optional
+            为True时为0/1权重，否则为距离的alpha次幂（反距离权重）
+        alpha : float, optional
+            反距离权重的幂次
+        """
+        from scipy.spatial import cKDTree
+
+        coords = np.asarray(coords, dtype=float)
+        tree = cKDTree(coords)
+        distances = tree.sparse_distance_matrix(tree, threshold, output_type='coo_matrix')
+        keep = distances.row != distances.col
+        rows, cols, dist = distances.row[keep], distances.col[keep], distances.data[keep]
+        if binary:
+            weights = np.ones(len(rows))
+        else:
+            weights = np.power(np.maximum(dist, np.finfo(float).tiny), alpha)
+        matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(len(coords), len(coords)))
+        return cls(ids, matrix, transform='B' if binary else 'W')
+
+    @property
+    def n(self):
+        """区域数量"""
+        return self.matrix.shape[0]
+
+    @property
+    def nnz(self):
+        """非零权重个数"""
+        return self.matrix.nnz
+
+    @property
+    def cardinalities(self):
+        """每个区域的邻居数量"""
+        return np.diff(self.matrix.indptr)
+
+    @property
+    def islands(self):
+        """没有邻居的区域"""
+        return [self.ids[i] for i in np.flatnonzero(self.cardinalities == 0)]
+
+    def neighbors(self, region):
+        """某区域的邻居及权重"""
+        i = self.ids.index(region)
+        start, stop = self.matrix.indptr[i], self.matrix.indptr[i + 1]
+        return {self.ids[j]: w for j, w in zip(self.matrix.indices[start:stop], self.matrix.data[start:stop])}
+
+    def row_standardize(self):
+        """行标准化：每行权重之和为1（孤立区域整行保持为0）"""
+        row_sums = np.asarray(self.matrix.sum(axis=1)).ravel()
+        scale = np.divide(1.0, row_sums, out=np.zeros_like(row_sums), where=row_sums != 0)
+        return SpatialWeights(self.ids, sparse.diags(scale) @ self.matrix, transform='R')
+
+    def lag(self, y):
+        """空间滞后 Wy（y可以是向量或 (n × k) 矩阵）"""
+        return self.matrix @ np.asarray(y, dtype=float)
+
+    def reorder(self, ids):
+        """按给定的区域顺序重排行列"""
+        position = {region: i for i, region in enumerate(self.ids)}
+        order = np.array([position[region] for region in ids])
+        return SpatialWeights(ids, self.matrix[order][:, order], transform=self.transform)
+
+    def to_dense(self):
+        """转换为稠密数组"""
+        return self.matrix.toarray()
+
+    def save(self, path):
+        """
+        保存为 .npz 压缩文件：区域名称、CSR的 data/indices/indptr 数组和变换方式
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f, ids=np.array(self.ids, dtype=str), data=self.matrix.data,
+                indices=self.matrix.indices, indptr=self.matrix.indptr,
+                transform=np.array(self.transform))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """读取 save 保存的 .npz 文件"""
+        with np.load(path, allow_pickle=False) as archive:
+            ids = archive['ids'].tolist()
+            matrix = sparse.csr_matrix((archive['data'], archive['indices'], archive['indptr']),
+                                       shape=(len(ids), len(ids)))
+            return cls(ids, matrix, transform=str(archive['transform']))
+
+    def __repr__(self):
+        return f"SpatialWeights(n={self.n}, nnz={self.nnz}, transform='{self.transform}')"
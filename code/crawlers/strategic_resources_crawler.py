@@ -12,159 +12,101 @@
 
 import os
 import json
-import random
-import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+from data_store import save_table, save_grouped_table, load_grouped_table
+from rng_service import make_rng
+from resource_price_engine import simulate_resource_prices, to_long_table
+from conflict_risk_engine import COMPOSITE_WEIGHTS, simulate_conflict_risk, composite_quantiles
+
 # 基础参数设置
 START_DATE = datetime(2017, 1, 1)
 END_DATE = datetime(2025, 4, 30)  # 扩展到2025年4月
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DATA_DIR = os.path.join(BASE_DIR, 'data', 'raw')
 
-# 关键事件时间点
-KEY_EVENTS = {
-    '2018-03-22': '美国宣布对中国商品征收关税',
-    '2018-04-02': '中国对美国128种商品加征关税',
-    '2018-07-06': '美国对340亿美元中国商品加征25%关税',
-    '2018-08-23': '美国对160亿美元中国商品加征25%关税',
-    '2018-09-24': '美国对2000亿美元中国商品加征10%关税',
-    '2019-05-10': '美国将2000亿美元中国商品关税税率从10%上调至25%',
-    '2019-08-01': '美国宣布对剩余3000亿美元中国商品加征10%关税',
-    '2019-12-13': '中美第一阶段经贸协议达成',
-    '2020-01-15': '中美签署第一阶段经贸协议',
-    '2020-02-14': '中美第一阶段经贸协议生效',
-    '2020-08-15': '中美第一阶段经贸协议评估会议',
-    '2021-01-20': '拜登就任美国总统',
-    '2021-10-04': '美国贸易代表戴琪发表对华贸易政策演讲',
-    '2022-01-01': '区域全面经济伙伴关系协定生效',
-    '2022-02-24': '俄乌冲突爆发',
-    '2022-08-09': '美国《芯片与科学法案》签署',
-    '2022-10-07': '美国发布对华半导体出口管制新规',
-    '2023-08-09': '美国发布对华投资限制行政令',
-    '2023-10-15': '中国发布稀土出口管制新规',
-    '2024-06-15': '美国宣布新一轮对华关税措施',
-    '2024-11-05': '美国大选日',
-    '2025-01-20': '美国新总统就职',
-}
+# 战略资源数据的日期频率 -> 文件名中的频率名称
+RESOURCE_FREQUENCIES = {'M': 'monthly', 'D': 'daily'}
 
-def generate_strategic_resources_data():
+def resource_artifacts(freq='M'):
+    """
+    战略资源数据在指定频率下的文件名
+    
+    参数:
+    - freq: 日期频率，'M' 为月度，'D' 为日度
+    
+    返回:
+    - (JSON文件名, 长表逻辑文件名)，如 ('strategic_resources_data.json', 'strategic_resources_monthly.csv')
+    """
+    if freq not in RESOURCE_FREQUENCIES:
+        raise ValueError(f"不支持的日期频率: {freq}（可选: {', '.join(RESOURCE_FREQUENCIES)}）")
+    name = RESOURCE_FREQUENCIES[freq]
+    json_file = 'strategic_resources_data.json' if freq == 'M' else f'strategic_resources_{name}_data.json'
+    return json_file, f'strategic_resources_{name}.csv'
+
+def generate_strategic_resources_data(seed=None, freq='M', resources=None):
     """
     生成战略资源依赖性数据
     包括稀土和关键矿产的供应、需求和价格数据
     
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
+    - freq: 日期频率，'M' 为月度（默认），'D' 为日度
+    - resources: 资源名称列表，默认为下列稀土元素和关键矿产
+    
     返回:
     - 包含战略资源数据的字典
     """
+    # 输出文件名随日期频率变化，日度数据不覆盖月度数据
+    json_file, long_artifact = resource_artifacts(freq)
+    
     # 确保输出目录存在
     os.makedirs(DATA_DIR, exist_ok=True)
     
     # 定义要分析的战略资源
-    resources = [
-        # 稀土元素
-        '镧', '铈', '镨', '钕', '钷', '钐', '铕', '钆', '铽', '镝', '钬', '铒', '铥', '镱', '镥',
-        # 关键矿产
-        '锂', '钴', '镍', '铜', '钨', '锗', '铟', '钽', '铂族金属', '石墨', '钛', '锆'
-    ]
+    if resources is None:
+        resources = [
+            # 稀土元素
+            '镧', '铈', '镨', '钕', '钷', '钐', '铕', '钆', '铽', '镝', '钬', '铒', '铥', '镱', '镥',
+            # 关键矿产
+            '锂', '钴', '镍', '铜', '钨', '锗', '铟', '钽', '铂族金属', '石墨', '钛', '锆'
+        ]
     
-    # 创建月度时间序列
-    date_range = pd.date_range(start=START_DATE, end=END_DATE, freq='M')
+    # 创建时间序列
+    date_range = pd.date_range(start=START_DATE, end=END_DATE, freq=freq)
     
-    # 为每种资源创建数据
-    resources_data = {}
+    # 一次生成 资源 × 日期 的价格和供应链指标矩阵
+    simulation = simulate_resource_prices(resources, date_range, seed=seed)
+    df = to_long_table(simulation)
     
-    for resource in resources:
-        # 初始基础值
-        base_price = random.uniform(10, 1000)  # 基础价格
-        base_china_supply = random.uniform(30, 60)  # 中国供应占比(%)
-        base_us_dependency = 100 - random.uniform(10, 30)  # 美国依赖度(%)
-        volatility = random.uniform(0.05, 0.15)  # 价格波动率
-        
-        resource_data = []
-        
-        # 生成月度数据
-        for date in date_range:
-            # 检查是否有关键事件
-            date_str = date.strftime('%Y-%m-%d')
-            event = None
-            event_effect = 0
-            
-            # 查找最近30天内的事件
-            for event_date, event_desc in KEY_EVENTS.items():
-                event_date = datetime.strptime(event_date, '%Y-%m-%d')
-                days_diff = abs((date.to_pydatetime() - event_date).days)
-                
-                if days_diff <= 30:
-                    event = event_desc
-                    # 根据事件计算影响
-                    if '关税' in event_desc or '出口管制' in event_desc:
-                        event_effect = random.uniform(0.05, 0.15)
-                    elif '协议' in event_desc and '达成' in event_desc:
-                        event_effect = random.uniform(-0.08, -0.02)
-                    elif '冲突' in event_desc:
-                        event_effect = random.uniform(0.10, 0.20)
-                    break
-            
-            # 根据时间段调整供应链关系
-            time_effect = 0
-            
-            # 2018 关税战开始
-            if date >= datetime(2018, 3, 1) and date <= datetime(2019, 12, 31):
-                time_effect = random.uniform(0.02, 0.05) * (date - datetime(2018, 3, 1)).days / 365
-            
-            # 2020 疫情扰动
-            elif date >= datetime(2020, 1, 1) and date <= datetime(2020, 12, 31):
-                time_effect = random.uniform(0.05, 0.10)
-            
-            # 2021-2022 供应链重构
-            elif date >= datetime(2021, 1, 1) and date <= datetime(2022, 12, 31):
-                time_effect = random.uniform(0.03, 0.08)
-            
-            # 2023-2025 战略竞争加剧
-            elif date >= datetime(2023, 1, 1):
-                months_since_2023 = (date.year - 2023) * 12 + date.month
-                time_effect = random.uniform(0.05, 0.12) * (1 + months_since_2023 / 24)
-            
-            # 计算价格变化
-            price_change = np.random.normal(0, volatility) + event_effect + time_effect
-            price = base_price * (1 + price_change)
-            
-            # 调整供应占比
-            china_supply = min(95, base_china_supply * (1 + time_effect * 0.5))
-            us_dependency = max(5, min(95, base_us_dependency * (1 - time_effect * 0.3)))
-            
-            # 添加随机波动
-            china_supply += random.uniform(-2, 2)
-            us_dependency += random.uniform(-2, 2)
-            
-            # 组织数据
-            resource_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'resource': resource,
-                'price': round(price, 2),
-                'price_change': round(price_change * 100, 2),  # 转为百分比
-                'china_supply_pct': round(china_supply, 1),
-                'us_dependency_pct': round(us_dependency, 1),
-                'event': event
-            })
-        
-        resources_data[resource] = resource_data
+    # 按资源组织数据
+    records = df.to_dict('records')
+    n_dates = len(date_range)
+    resources_data = {resource: records[i * n_dates:(i + 1) * n_dates]
+                      for i, resource in enumerate(resources)}
     
     # 保存数据
-    output_file = os.path.join(DATA_DIR, 'strategic_resources_data.json')
+    output_file = os.path.join(DATA_DIR, json_file)
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(resources_data, f, ensure_ascii=False, indent=2)
     
     print(f"战略资源依赖性数据已生成并保存至: {output_file}")
-    print(f"包含 {len(resources)} 种资源的月度数据，时间范围: {START_DATE.strftime('%Y-%m-%d')} 至 {END_DATE.strftime('%Y-%m-%d')}")
+    print(f"包含 {len(resources)} 种资源的{'日度' if freq == 'D' else '月度'}数据，时间范围: {START_DATE.strftime('%Y-%m-%d')} 至 {END_DATE.strftime('%Y-%m-%d')}")
+    
+    # 同时保存为按资源分组的长表（resource × date），便于按资源和时间范围读取
+    long_file = save_grouped_table(df, DATA_DIR, long_artifact, key='resource', categorical=['event'])
+    print(f"战略资源长表已保存至: {long_file}")
     
     return resources_data
 
-def generate_military_budget_data():
+def generate_military_budget_data(seed=None):
     """
     生成中美两国军事预算和国防支出相关数据
     
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子；两国军费和每个技术类别各使用独立的随机数流
+    
     返回:
     - 包含军事预算数据的字典
     """
@@ -185,6 +127,8 @@ def generate_military_budget_data():
         'US': [],
         'China': []
     }
+    us_rng = make_rng(seed, ('military_budget', 'US'))
+    china_rng = make_rng(seed, ('military_budget', 'China'))
     
     for year in years:
         # 计算美国军费
@@ -203,14 +147,14 @@ def generate_military_budget_data():
                 
             # 2024大选年可能影响
             if year == 2024:
-                adj_growth += random.uniform(-0.005, 0.01)
+                adj_growth += us_rng.uniform(-0.005, 0.01)
             
             # 2025新政府可能调整
             if year == 2025:
-                adj_growth += random.uniform(-0.01, 0.02)
+                adj_growth += us_rng.uniform(-0.01, 0.02)
                 
             prev_budget = military_data['US'][-1]['budget']
-            us_budget = prev_budget * (1 + adj_growth + random.uniform(-0.005, 0.005))
+            us_budget = prev_budget * (1 + adj_growth + us_rng.uniform(-0.005, 0.005))
         
         # 计算中国军费
         if year == 2017:
@@ -232,10 +176,10 @@ def generate_military_budget_data():
                 
             # 2024-2025潜在调整
             if year >= 2024:
-                adj_growth += random.uniform(0, 0.015)
+                adj_growth += china_rng.uniform(0, 0.015)
                 
             prev_budget = military_data['China'][-1]['budget']
-            china_budget = prev_budget * (1 + adj_growth + random.uniform(-0.005, 0.005))
+            china_budget = prev_budget * (1 + adj_growth + china_rng.uniform(-0.005, 0.005))
         
         # 添加美国数据
         military_data['US'].append({
@@ -262,9 +206,11 @@ def generate_military_budget_data():
     tech_investment = {'US': {}, 'China': {}}
     
     for category in tech_categories:
+        rng = make_rng(seed, ('military_tech', category))
+        
         # 设置基础投资比例
-        us_base = random.uniform(0.05, 0.15)
-        china_base = random.uniform(0.04, 0.12)
+        us_base = rng.uniform(0.05, 0.15)
+        china_base = rng.uniform(0.04, 0.12)
         
         # 根据类别调整
         if category in ['AI与自主系统', '高超音速武器', '太空技术']:
@@ -281,7 +227,7 @@ def generate_military_budget_data():
             year_factor = 1 + (year - 2017) * 0.05
             
             # 美国数据
-            us_pct = us_base * year_factor * (1 + random.uniform(-0.1, 0.1))
+            us_pct = us_base * year_factor * (1 + rng.uniform(-0.1, 0.1))
             us_amount = military_data['US'][i]['budget'] * us_pct
             
             tech_investment['US'][category].append({
@@ -291,7 +237,7 @@ def generate_military_budget_data():
             })
             
             # 中国数据
-            china_pct = china_base * year_factor * (1 + random.uniform(-0.1, 0.1))
+            china_pct = china_base * year_factor * (1 + rng.uniform(-0.1, 0.1))
             china_amount = military_data['China'][i]['budget'] * china_pct
             
             tech_investment['China'][category].append({
@@ -312,14 +258,31 @@ def generate_military_budget_data():
         json.dump(military_budget_data, f, ensure_ascii=False, indent=2)
     
     print(f"军事预算数据已生成并保存至: {output_file}")
+    
+    # 同时保存为长表：年度军费按国家分组，军事技术投资按技术类别分组
+    budget_df = pd.DataFrame([dict(country=country, **record)
+                              for country, records in military_data.items() for record in records])
+    tech_df = pd.DataFrame([dict(country=country, category=category, **record)
+                            for country, categories in tech_investment.items()
+                            for category, records in categories.items() for record in records])
+    save_grouped_table(budget_df, DATA_DIR, 'military_budget_annual.csv', key='country',
+                       categorical=['country'])
+    save_grouped_table(tech_df, DATA_DIR, 'military_tech_investment_annual.csv', key='category',
+                       categorical=['country'])
     print(f"包含中美两国年度军费数据，时间范围: 2017年至2025年")
     
     return military_budget_data
 
-def generate_conflict_risk_indicators():
+def generate_conflict_risk_indicators(seed=None, n_paths=1, weights=COMPOSITE_WEIGHTS):
     """
     生成中美关系冲突风险指标
     
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
+    - n_paths: 蒙特卡洛路径数；大于1时另存综合风险指数在各路径间的分布，
+      风险指标数据取第一条路径
+    - weights: 风险维度 -> 综合风险指数权重，默认 COMPOSITE_WEIGHTS
+    
     返回:
     - 包含冲突风险指标的字典
     """
@@ -329,157 +292,27 @@ def generate_conflict_risk_indicators():
     # 创建月度时间序列
     date_range = pd.date_range(start=START_DATE, end=END_DATE, freq='M')
     
-    # 定义风险指标维度
-    risk_dimensions = [
-        '贸易紧张度', '技术对抗度', '军事对峙风险', 
-        '外交关系状态', '舆论敌意度', '第三方盟友协调度'
-    ]
+    # 所有风险维度和路径同时模拟
+    simulation = simulate_conflict_risk(date_range, n_paths=n_paths, seed=seed, weights=weights)
+    risk_dimensions = simulation['dimensions']
+    dates = date_range.strftime('%Y-%m-%d')
+    values = simulation['values'][0].round(1)
+    composite = simulation['composite'][0].round(1)
+    month_events = [list(events) if events else None for events in simulation['events']]
     
-    # 生成基础数据
+    # 组织数据
     risk_data = {}
-    
-    for dimension in risk_dimensions:
-        # 设置起始基线值 (0-100)
-        if dimension == '贸易紧张度':
-            baseline = 30
-        elif dimension == '技术对抗度':
-            baseline = 25
-        elif dimension == '军事对峙风险':
-            baseline = 20
-        elif dimension == '外交关系状态':
-            baseline = 35
-        elif dimension == '舆论敌意度':
-            baseline = 40
-        elif dimension == '第三方盟友协调度':
-            baseline = 45
-        else:
-            baseline = 30
-            
-        risk_data[dimension] = []
-        
-        # 上一个月的值，初始为基线
-        prev_value = baseline
-        
-        for date in date_range:
-            # 检查是否有关键事件
-            date_str = date.strftime('%Y-%m-%d')
-            events_effect = 0
-            event_desc = []
-            
-            # 查找最近30天内的事件影响
-            for event_date, event_desc_text in KEY_EVENTS.items():
-                event_date = datetime.strptime(event_date, '%Y-%m-%d')
-                days_diff = abs((date.to_pydatetime() - event_date).days)
-                
-                if days_diff <= 30:
-                    event_desc.append(event_desc_text)
-                    
-                    # 根据事件和维度计算影响
-                    if dimension == '贸易紧张度' and ('关税' in event_desc_text or '贸易' in event_desc_text):
-                        events_effect += random.uniform(10, 20)
-                    elif dimension == '技术对抗度' and ('芯片' in event_desc_text or '科技' in event_desc_text or '出口管制' in event_desc_text):
-                        events_effect += random.uniform(8, 15)
-                    elif dimension == '军事对峙风险' and ('冲突' in event_desc_text):
-                        events_effect += random.uniform(5, 12)
-                    elif dimension == '外交关系状态':
-                        if '协议' in event_desc_text and '签署' in event_desc_text:
-                            events_effect -= random.uniform(5, 10)
-                        elif '制裁' in event_desc_text or '限制' in event_desc_text:
-                            events_effect += random.uniform(8, 15)
-                    elif dimension == '舆论敌意度':
-                        if '关税' in event_desc_text or '制裁' in event_desc_text:
-                            events_effect += random.uniform(5, 12)
-                        elif '协议' in event_desc_text and '签署' in event_desc_text:
-                            events_effect -= random.uniform(3, 8)
-                    elif dimension == '第三方盟友协调度' and ('盟友' in event_desc_text or '协调' in event_desc_text):
-                        events_effect += random.uniform(5, 10)
-            
-            # 根据时间段调整基本趋势
-            trend_effect = 0
-            
-            # 2018-2019 贸易战升级
-            if date >= datetime(2018, 3, 1) and date <= datetime(2019, 12, 31):
-                trend_effect = (date - datetime(2018, 3, 1)).days / 365 * random.uniform(8, 15)
-            
-            # 2020 COVID-19和第一阶段协议
-            elif date >= datetime(2020, 1, 1) and date <= datetime(2020, 12, 31):
-                if dimension in ['贸易紧张度', '外交关系状态']:
-                    trend_effect = -random.uniform(3, 8)  # 贸易协议缓和
-                else:
-                    trend_effect = random.uniform(5, 10)  # 疫情加剧其他维度
-            
-            # 2021 拜登政府初期
-            elif date >= datetime(2021, 1, 1) and date <= datetime(2021, 12, 31):
-                trend_effect = random.uniform(2, 8)  # 总体延续紧张但风格变化
-            
-            # 2022-2023 战略竞争加剧
-            elif date >= datetime(2022, 1, 1) and date <= datetime(2023, 12, 31):
-                months_since_2022 = (date.year - 2022) * 12 + date.month
-                trend_effect = random.uniform(5, 12) * (1 + months_since_2022 / 24)
-            
-            # 2024 大选年
-            elif date >= datetime(2024, 1, 1) and date <= datetime(2024, 12, 31):
-                # 大选年政治周期影响
-                if date.month < 11:  # 大选前
-                    trend_effect = random.uniform(10, 20)  # 选举前紧张加剧
-                else:  # 大选后
-                    trend_effect = random.uniform(5, 15)  # 选举后略微缓和
-            
-            # 2025 新政府初期
-            elif date >= datetime(2025, 1, 1):
-                trend_effect = random.uniform(0, 10)  # 政策不确定性
-            
-            # 添加随机波动
-            random_effect = np.random.normal(0, 3)
-            
-            # 计算新值 (保持在0-100范围内)
-            new_value = max(0, min(100, prev_value + events_effect + trend_effect + random_effect))
-            
-            # 添加回归到均值的效应 (长期均值为50)
-            mean_reversion = (50 - new_value) * 0.05
-            new_value += mean_reversion
-            
-            # 保存值作为下个月的前值
-            prev_value = new_value
-            
-            # 组织数据
-            risk_data[dimension].append({
-                'date': date.strftime('%Y-%m-%d'),
-                'value': round(new_value, 1),
-                'events': event_desc if event_desc else None
-            })
-    
-    # 计算综合风险指数
-    composite_risk = []
-    weights = {
-        '贸易紧张度': 0.2,
-        '技术对抗度': 0.2,
-        '军事对峙风险': 0.25,
-        '外交关系状态': 0.15,
-        '舆论敌意度': 0.1,
-        '第三方盟友协调度': 0.1
-    }
-    
-    for i in range(len(date_range)):
-        date = date_range[i].strftime('%Y-%m-%d')
-        weighted_sum = sum(risk_data[dim][i]['value'] * weights[dim] for dim in risk_dimensions)
-        
-        # 汇总各维度提到的事件
-        all_events = []
-        for dim in risk_dimensions:
-            if risk_data[dim][i]['events']:
-                all_events.extend(risk_data[dim][i]['events'])
-        # 去除重复事件
-        all_events = list(set(all_events)) if all_events else None
-        
-        composite_risk.append({
-            'date': date,
-            'value': round(weighted_sum, 1),
-            'events': all_events
-        })
+    for j, dimension in enumerate(risk_dimensions):
+        risk_data[dimension] = [
+            {'date': date, 'value': float(value), 'events': events}
+            for date, value, events in zip(dates, values[:, j], month_events)
+        ]
     
     # 添加综合指数到风险数据中
-    risk_data['综合风险指数'] = composite_risk
+    risk_data['综合风险指数'] = [
+        {'date': date, 'value': float(value), 'events': events}
+        for date, value, events in zip(dates, composite, month_events)
+    ]
     
     # 保存数据
     output_file = os.path.join(DATA_DIR, 'conflict_risk_indicators.json')
@@ -487,10 +320,83 @@ def generate_conflict_risk_indicators():
         json.dump(risk_data, f, ensure_ascii=False, indent=2)
     
     print(f"冲突风险指标数据已生成并保存至: {output_file}")
+    
+    # 同时保存为按风险维度分组的长表（dimension × date），同月多个事件以分号连接
+    risk_df = pd.DataFrame([
+        {'dimension': dimension, 'date': record['date'], 'value': record['value'],
+         'events': '；'.join(record['events']) if record['events'] else None}
+        for dimension, records in risk_data.items() for record in records])
+    save_grouped_table(risk_df, DATA_DIR, 'conflict_risk_monthly.csv', key='dimension',
+                       categorical=['dimension', 'events'])
     print(f"包含{len(risk_dimensions)}个风险维度的月度数据，时间范围: {START_DATE.strftime('%Y-%m-%d')} 至 {END_DATE.strftime('%Y-%m-%d')}")
     
+    # 多路径时保存综合风险指数的分布
+    if n_paths > 1:
+        distribution_file = save_table(composite_quantiles(simulation), DATA_DIR,
+                                       'conflict_risk_composite_distribution.csv')
+        print(f"综合风险指数分布（{n_paths}条路径）已保存至: {distribution_file}")
+    
     return risk_data
 
+def load_strategic_resources(resources=None, start=None, end=None, columns=None, freq='M'):
+    """
+    读取部分战略资源的月度（或日度）数据，不解析整个JSON文件
+    
+    参数:
+    - resources: 资源名称列表，默认全部
+    - start, end: 日期范围（闭区间），如 '2019-01-01'
+    - columns: 只读取这些列
+    - freq: 日期频率，'M' 为月度（默认），'D' 为日度（须先以 freq='D' 生成）
+    
+    返回:
+    - resource × date 长表
+    """
+    return load_grouped_table(DATA_DIR, resource_artifacts(freq)[1], keys=resources,
+                              columns=columns, start=start, end=end)
+
+def load_conflict_risk(dimensions=None, start=None, end=None, columns=None):
+    """
+    读取部分风险维度（含 综合风险指数）的月度数据
+    
+    参数:
+    - dimensions: 风险维度列表，默认全部
+    - start, end: 日期范围（闭区间），如 '2019-01-01'
+    - columns: 只读取这些列
+    
+    返回:
+    - dimension × date 长表
+    """
+    return load_grouped_table(DATA_DIR, 'conflict_risk_monthly.csv', keys=dimensions,
+                              columns=columns, start=start, end=end)
+
+def load_military_budget(countries=None, start_year=None, end_year=None):
+    """
+    读取中美年度军费数据
+    
+    参数:
+    - countries: 国家列表（'US' / 'China'），默认全部
+    - start_year, end_year: 年份范围（闭区间）
+    
+    返回:
+    - country × year 长表
+    """
+    return load_grouped_table(DATA_DIR, 'military_budget_annual.csv', keys=countries,
+                              start=start_year, end=end_year, date_column='year')
+
+def load_military_tech_investment(categories=None, start_year=None, end_year=None):
+    """
+    读取中美军事技术投资数据
+    
+    参数:
+    - categories: 技术类别列表，默认全部
+    - start_year, end_year: 年份范围（闭区间）
+    
+    返回:
+    - category × country × year 长表
+    """
+    return load_grouped_table(DATA_DIR, 'military_tech_investment_annual.csv', keys=categories,
+                              start=start_year, end=end_year, date_column='year')
+
 # 为了兼容run_all_crawlers.py中的函数调用方式，添加主函数别名
 def crawl_strategic_resources_data():
     """
@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关税清单附件的流式解析
+将 USTR 和国务院关税税则委员会（MOFCOM/财政部发布）的清单附件解析为统一的关税清单格式
+round、hs_code、product_description、implementation_date、additional_tariff_rate
+（与 us_tariffs_on_china.csv / china_tariffs_on_us.csv 的同名列一致）：
+- 表格（CSV / Excel）：在前若干行中按关键词定位表头（税则号列、商品名称、税率等），
+  找不到表头时取大多数取值为HS编码的列；Excel 以只读模式逐行读取
+- PDF文本（pdftotext -layout 的输出，或安装 pypdf 时直接读取 .pdf）：以HS编码开头的行为一条记录，
+  其后不以编码开头的行视为上一条商品描述的续行
+- HS编码统一为不带点的数字串：8414.59.10 / 8414 59 10 / 84145910 均为 84145910，
+  Excel 数值单元格丢失的前导零按位数补回（1012100 -> 01012100）
+- PDF文本行的HS编码前可有序号栏（财政部附件的 序号 / 税则号列 / 商品名称）
+- 税率取单元格中最后一个带百分号的数字（“10%→25%”、“25%（2019年6月1日起）”均为25），
+  没有百分号时取最后一个数字，小于1的数值视为比例（0.25 -> 25）
+各格式都按固定行数分批读取和解析，逐批产出 DataFrame，内存占用与附件大小无关
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from data_store import TableWriter
+
+save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'raw')
+
+PARSED_COLUMNS = ['round', 'hs_code', 'product_description', 'implementation_date', 'additional_tariff_rate']
+
+# 每批解析的行数
+BATCH_ROWS = 50_000
+
+# 在前多少行中查找表头
+HEADER_SCAN_ROWS = 30
+
+# 表头关键词（小写比较）
+HEADER_KEYWORDS = {
+    'hs_code': ['税则号列', '税则号', '税号', '商品编码', 'hts', 'hs code', 'hs编码', 'heading', 'subheading', 'tariff item'],
+    'product_description': ['商品名称', '货品名称', '商品描述', 'description', 'product', 'article'],
+    'additional_tariff_rate': ['加征', '税率', 'rate', 'additional duty', 'duty'],
+}
+
+# 有效的HS编码位数（章、品目、子目、8位/10位税号）
+HS_LENGTHS = (4, 6, 8, 10)
+
+# PDF文本行：[序号] + HS编码 + 其余文本。财政部附件为 序号 / 税则号列 / 商品名称 三栏，
+# 编码前可有一个整数序号；编码为带点（8414.59.10）、单个空格分隔（8414 59 10，只接受8位和10位，
+# 避免把描述开头的两位数并入编码）或连续数字，一个编码内只用一种分隔符
+HS_LINE = re.compile(r'^\s*(?:\d{1,5}\s+)?'
+                     r'(\d{4}(?:\.\d{2}){1,3}|\d{4}(?: \d{2}){2,3}|\d{10}|\d{8}|\d{6})(?![\d.])\s*(.*)$')
+# 行尾的税率（如 “25%”，可带括号说明如 “25%（2019年6月1日起）”）
+TRAILING_RATE = r'\s*(\d+(?:\.\d+)?\s*[%％]\s*(?:[（(][^）)]*[）)])?)\s*$'
+
+def normalize_hs_codes(values):
+    """
+    将HS编码统一为不带点的数字串
+
+    Parameters
+    ----------
+    values : array-like
+        带点、带空格或不带点的编码，Excel 中可能是数值
+
+    Returns
+    -------
+    pandas.Series
+        数字串；无效的编码（位数不是 4/6/8/10 位）为 NaN
+    """
+    series = pd.Series(values, dtype=object)
+    numeric = series.map(lambda v: isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool))
+    text = series.astype(str)
+    # 数值单元格：去掉浮点数的 .0 后缀
+    text = text.where(~numeric, text.str.replace(r'\.0+$', '', regex=True))
+    # 只接受由数字、点和空格组成的单元格（可带 ex 前缀），不从说明文字中拼凑数字
+    code_like = text.str.fullmatch(r'\s*(?:ex)?\s*\d[\d.\s]*', case=False)
+    digits = text.str.replace(r'\D', '', regex=True)
+    # 丢失了前导零的奇数位编码补齐为偶数位
+    digits = digits.where(digits.str.len() % 2 == 0, '0' + digits)
+    return digits.where(code_like & digits.str.len().isin(HS_LENGTHS) & series.notna())
+
+def format_hs_code(code):
+    """不带点的HS编码 -> 带点格式（84145910 -> 8414.59.10）"""
+    code = str(code)
+    return '.'.join([code[:4]] + [code[i:i + 2] for i in range(4, len(code), 2)])
+
+def parse_rates(values):
+    """
+    解析税率为百分数
+
+    Parameters
+    ----------
+    values : array-like
+        如 25、'25%'、'加征25%'、'10%→25%'、'25%（2019年6月1日起）'、0.25
+
+    Returns
+    -------
+    pandas.Series
+        浮点数（百分数），无法解析时为 NaN
+    """
+    series = pd.Series(values, dtype=object)
+    text = series.astype(str)
+    # 有百分号时取最后一个带百分号的数字（之后的日期等说明中的数字不算），否则取最后一个数字
+    percent = text.str.contains('[%％]')
+    rates = pd.to_numeric(text.str.extract(r'(\d+(?:\.\d+)?)\s*[%％](?!.*\d\s*[%％])', expand=False)
+                          .where(percent, text.str.extract(r'(\d+(?:\.\d+)?)(?!.*\d)', expand=False)),
+                          errors='coerce')
+    fraction = (rates < 1) & ~percent
+    return rates.where(~fraction, rates * 100).where(series.notna())
+
+def detect_encoding(path, candidates=('utf-8-sig', 'gb18030')):
+    """按文件开头（64KB）判断文本编码，中文附件常用 GBK/GB18030"""
+    with open(path, 'rb') as f:
+        head = f.read(1 << 16)
+    for encoding in candidates:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as exc:
+            # 截断处的不完整字符不算解码失败
+            if exc.start >= len(head) - 3:
+                return encoding
+    return 'latin-1'
+
+def locate_columns(frame):
+    """
+    在表格的前 HEADER_SCAN_ROWS 行中定位表头
+
+    Returns
+    -------
+    tuple
+        (表头所在行号或 None, 字段 -> 列位置)；找不到表头时按取值推断HS编码列和描述列
+    """
+    head = frame.head(HEADER_SCAN_ROWS)
+    for row_index, row in enumerate(head.itertuples(index=False)):
+        cells = [str(cell).strip().lower() if pd.notna(cell) else '' for cell in row]
+        columns = {}
+        for field, keywords in HEADER_KEYWORDS.items():
+            for position, cell in enumerate(cells):
+                if position not in columns.values() and cell and any(keyword in cell for keyword in keywords):
+                    columns[field] = position
+                    break
+        if 'hs_code' in columns:
+            return row_index, columns
+
+    # 没有表头：HS编码列为有效编码最多的列，描述列为其余列中平均文本最长的列
+    valid = [normalize_hs_codes(head.iloc[:, i]).notna().mean() for i in range(head.shape[1])]
+    if not valid or max(valid) < 0.5:
+        raise ValueError("找不到HS编码列")
+    columns = {'hs_code': int(np.argmax(valid))}
+    lengths = [head.iloc[:, i].astype(str).str.len().mean() if i != columns['hs_code'] else -1
+               for i in range(head.shape[1])]
+    if max(lengths) > 0:
+        columns['product_description'] = int(np.argmax(lengths))
+    return None, columns
+
+def lines_frame(frame, columns, round=None, implementation_date=None, rate=None):
+    """按定位的列将一块原始单元格转换为关税清单，丢弃没有有效HS编码的行（标题、小计、注释等）"""
+    hs_codes = normalize_hs_codes(frame.iloc[:, columns['hs_code']].to_numpy(dtype=object))
+    keep = hs_codes.notna().to_numpy()
+    if 'product_description' in columns:
+        descriptions = frame.iloc[keep, columns['product_description']].fillna('').astype(str).str.strip()
+    else:
+        descriptions = pd.Series('', index=frame.index[keep])
+    if 'additional_tariff_rate' in columns:
+        rates = parse_rates(frame.iloc[keep, columns['additional_tariff_rate']].to_numpy(dtype=object))
+        if rate is not None:
+            rates = rates.fillna(rate)
+    else:
+        rates = np.full(int(keep.sum()), np.nan if rate is None else float(rate))
+    return pd.DataFrame({
+        'round': round,
+        'hs_code': hs_codes[keep].to_numpy(),
+        'product_description': descriptions.to_numpy(),
+        'implementation_date': implementation_date,
+        'additional_tariff_rate': np.asarray(rates, dtype=float),
+    }, columns=PARSED_COLUMNS)
+
+def _table_batches(chunks, **context):
+    """原始单元格块 -> 关税清单批：第一块中定位表头，此后各块按相同的列解析"""
+    columns = None
+    for chunk in chunks:
+        if columns is None:
+            header, columns = locate_columns(chunk)
+            if header is not None:
+                chunk = chunk.iloc[header + 1:]
+        batch = lines_frame(chunk, columns, **context)
+        if len(batch):
+            yield batch
+
+def read_csv_chunks(path, batch_rows=BATCH_ROWS, encoding=None):
+    """分块读取CSV的原始单元格（不解析表头，全部按文本读取）"""
+    encoding = encoding or detect_encoding(path)
+    # 标题、说明行的单元格数少于表格，按前若干行的最大单元格数确定列数，否则表格行会被当作坏行丢弃
+    with open(path, encoding=encoding, errors='replace', newline='') as f:
+        width = max((len(row) for row in itertools.islice(csv.reader(f), HEADER_SCAN_ROWS)), default=1)
+    yield from pd.read_csv(path, header=None, names=range(width), dtype=str, chunksize=batch_rows,
+                           skip_blank_lines=True, encoding=encoding, encoding_errors='replace', on_bad_lines='skip')
+
+def read_excel_chunks(path, batch_rows=BATCH_ROWS, sheet=None):
+    """以只读模式逐行读取 .xlsx 工作表（默认第一个），按块产出原始单元格"""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("解析 Excel 附件需要安装 openpyxl: pip install openpyxl") from None
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = []
+        for row in worksheet.iter_rows(values_only=True):
+            # 整数值的浮点单元格还原为整数，避免HS编码出现 .0
+            rows.append([int(v) if isinstance(v, float) and v.is_integer() else v for v in row])
+            if len(rows) == batch_rows:
+                yield pd.DataFrame(rows, dtype=object)
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows, dtype=object)
+    finally:
+        workbook.close()
+
+def read_text_lines(path, encoding=None):
+    """逐行读取PDF文本；.pdf 文件需要 pypdf，逐页提取文本"""
+    if os.path.splitext(path)[1].lower() != '.pdf':
+        with open(path, encoding=encoding or detect_encoding(path), errors='replace') as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+        return
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("直接解析 PDF 附件需要安装 pypdf: pip install pypdf（或先用 pdftotext -layout 转为文本）") from None
+    for page in PdfReader(path).pages:
+        yield from (page.extract_text() or '').splitlines()
+
+def _text_records(lines):
+    """
+    一块文本行 -> 记录：以HS编码开头的行开始一条记录，其后的续行并入描述
+
+    Returns
+    -------
+    tuple
+        (块首续行文本（属于上一块的最后一条记录）, 各记录的 (编码, 描述) DataFrame)
+    """
+    lines = pd.Series(lines, dtype=object)
+    matched = lines.str.extract(HS_LINE)
+    is_code = matched[0].notna()
+    text = matched[1].where(is_code, lines).str.strip()
+    # 丢弃空行和只有数字的行（页码）
+    keep = is_code | ((text.str.len() > 0) & ~text.str.fullmatch(r'[\d\s./-]*'))
+    group = is_code.cumsum()[keep]
+    joined = text[keep].groupby(group).agg(' '.join)
+    leading = joined.get(0, '')
+    codes = matched[0][is_code].to_numpy()
+    return leading, pd.DataFrame({'hs_code': codes, 'product_description': joined.drop(0, errors='ignore').to_numpy()})
+
+def _text_batches(lines, round=None, implementation_date=None, rate=None, batch_rows=BATCH_ROWS):
+    """PDF文本行 -> 关税清单批；每块的最后一条记录留到下一块，以便并入跨块的续行"""
+    def finish(records):
+        descriptions = records['product_description'].astype(str)
+        trailing = descriptions.str.extract(TRAILING_RATE, expand=False)
+        rates = parse_rates(trailing.to_numpy(dtype=object))
+        if rate is not None:
+            rates = rates.fillna(rate)
+        frame = pd.DataFrame({
+            'round': round,
+            'hs_code': normalize_hs_codes(records['hs_code'].to_numpy(dtype=object)).to_numpy(),
+            'product_description': descriptions.str.replace(TRAILING_RATE, '', regex=True).str.strip().to_numpy(),
+            'implementation_date': implementation_date,
+            'additional_tariff_rate': rates.to_numpy(dtype=float),
+        }, columns=PARSED_COLUMNS)
+        return frame[frame['hs_code'].notna()]
+
+    pending = None
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) < batch_rows:
+            continue
+        leading, records = _text_records(buffer)
+        buffer = []
+        if pending is not None:
+            pending.iloc[-1, 1] = (pending.iloc[-1, 1] + ' ' + leading).strip()
+            records = pd.concat([pending, records], ignore_index=True)
+        if len(records) > 1:
+            batch = finish(records.iloc[:-1])
+            if len(batch):
+                yield batch
+        pending = records.iloc[-1:].reset_index(drop=True) if len(records) else pending
+
+    leading, records = _text_records(buffer)
+    if pending is not None:
+        pending.iloc[-1, 1] = (pending.iloc[-1, 1] + ' ' + leading).strip()
+        records = pd.concat([pending, records], ignore_index=True)
+    if len(records):
+        batch = finish(records)
+        if len(batch):
+            yield batch
+
+def parse_annex(path, round=None, implementation_date=None, rate=None, batch_rows=BATCH_ROWS, encoding=None):
+    """
+    流式解析一个清单附件
+
+    Parameters
+    ----------
+    path : str
+        附件路径：.csv、.xlsx/.xlsm、.txt（PDF文本）或 .pdf
+    round : optional
+        轮次，填入 round 列
+    implementation_date : str, optional
+        实施日期，填入 implementation_date 列
+    rate : float, optional
+        附件未给出税率（或单元格为空）时使用的加征税率，如 USTR 各批清单的统一税率
+    batch_rows : int, optional
+        每批读取的行数
+    encoding : str, optional
+        文本编码，默认自动判断
+
+    Yields
+    ------
+    pandas.DataFrame
+        PARSED_COLUMNS 各列的一批关税清单
+    """
+    context = {'round': round, 'implementation_date': implementation_date, 'rate': rate}
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        yield from _table_batches(read_csv_chunks(path, batch_rows, encoding), **context)
+    elif ext in ('.xlsx', '.xlsm'):
+        yield from _table_batches(read_excel_chunks(path, batch_rows), **context)
+    elif ext in ('.txt', '.pdf'):
+        yield from _text_batches(read_text_lines(path, encoding), batch_rows=batch_rows, **context)
+    else:
+        raise ValueError(f"不支持的附件格式: {path}（可选: .csv、.xlsx、.xlsm、.txt、.pdf）")
+
+def parse_documents(documents, save_dir, artifact, batch_rows=BATCH_ROWS):
+    """
+    解析下载的附件（document_downloader 的文件项）并逐批写出
+
+    文件项中的 round、implementation_date、rate 用作解析参数
+
+    Parameters
+    ----------
+    documents : list of dict
+        文件项，须包含 path
+    save_dir : str
+        保存目录
+    artifact : str
+        逻辑文件名（.csv）
+
+    Returns
+    -------
+    TableWriter
+        已关闭的写出器：path 为主文件路径，rows（len）为解析出的行数
+    """
+    writer = TableWriter(save_dir, artifact)
+    with writer:
+        for document in documents:
+            for batch in parse_annex(document['path'], document.get('round'), document.get('implementation_date'),
+                                     document.get('rate'), batch_rows=batch_rows):
+                # 各附件的轮次和日期统一为文本，列式格式的各 row group 因此有相同的schema
+                writer.write(batch.assign(round=batch['round'].astype(str),
+                                          implementation_date=batch['implementation_date'].fillna('').astype(str)))
+    return writer
+
+def main(argv=None):
+    """命令行入口：解析文件清单中已下载的附件"""
+    from document_downloader import DOCUMENT_DIR, load_document_manifest
+
+    parser = argparse.ArgumentParser(description='解析关税清单附件')
+    parser.add_argument('manifest', help='文件清单（见 document_downloader）')
+    parser.add_argument('--documents', default=DOCUMENT_DIR, help=f'附件下载目录（默认 {DOCUMENT_DIR}）')
+    parser.add_argument('--sources', nargs='*', help='只解析这些来源')
+    parser.add_argument('--save-dir', default=save_dir, help=f'输出目录（默认 {save_dir}）')
+    parser.add_argument('--artifact', default='parsed_tariff_lines.csv', help='输出逻辑文件名')
+    args = parser.parse_args(argv)
+
+    documents = [document for document in load_document_manifest(args.manifest, args.documents)
+                 if not args.sources or document['source'] in args.sources]
+    missing = [document['path'] for document in documents if not os.path.exists(document['path'])]
+    if missing:
+        parser.error(f"{len(missing)} 个附件尚未下载，如 {missing[0]}")
+    result = parse_documents(documents, args.save_dir, args.artifact)
+    print(f"已解析 {len(documents)} 个附件，共 {result.rows} 条，已保存到: {result.path}")
+
+if __name__ == "__main__":
+    main()
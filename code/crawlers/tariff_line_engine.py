@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HS编码关税清单批量生成引擎
+以NumPy数组一次生成一整轮关税清单：HS编码由整数数组整列补零格式化、
+商品描述按模板整组生成（纯候选词模板先展开为描述表再按下标抽取，其他模板逐部分整列拼接）、
+税率和贸易额整列生成，重复出现的字符串列以分类(categorical)编码保存。
+大规模清单按固定行数分批生成并逐批追加写出（write_tariff_lines），内存占用与总行数无关；
+不足一批的各轮合并为一批写出。
+供 us_tariff_crawler 和 china_tariff_crawler 共用
+"""
+
+import itertools
+from functools import lru_cache, reduce
+
+import numpy as np
+import pandas as pd
+
+from data_store import TableWriter
+from rng_service import make_rng
+
+# 每批生成和写出的行数（CSV追加一次 / parquet一个row group）
+BATCH_ROWS = 100_000
+
+# 写出进度的报告间隔（秒）
+PROGRESS_INTERVAL = 5.0
+
+# 描述模板中的占位符：该行的商品类别名称 / HS编码后缀
+CATEGORY = object()
+SUFFIX = object()
+
+def choose(rng, options, size):
+    """从候选值中有放回地随机抽取size个"""
+    options = np.asarray(options)
+    return options[rng.integers(0, len(options), size)]
+
+def uniform_rounded(rng, low, high, size, decimals):
+    """生成[low, high)上的均匀分布随机数并四舍五入"""
+    return np.round(rng.uniform(low, high, size), decimals)
+
+@lru_cache(maxsize=None)
+def _digit_table(width):
+    """0 ~ 10^width-1 的补零数字字符串表"""
+    return np.char.zfill(np.arange(10 ** width).astype(str), width)
+
+def format_digits(values, digits):
+    """将非负整数数组格式化为定长、补零的数字字符串数组"""
+    # 整数数组逐个转换为字符串（astype(str)）是生成一轮清单中最慢的一步，
+    # 这里每4位一组查补零字符串表，再整列拼接
+    values = np.asarray(values, dtype=np.int64)
+    groups = []
+    while digits > 4:
+        values, low = np.divmod(values, 10 ** 4)
+        groups.append(_digit_table(4)[low])
+        digits -= 4
+    groups.append(_digit_table(digits)[values])
+    return reduce(np.char.add, groups[::-1])
+
+def sample_hs_codes(rng, prefixes, size, suffix_digits):
+    """
+    批量生成HS编码
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        随机数生成器
+    prefixes : sequence of str
+        可选的HS两位章节编码
+    size : int
+        生成数量
+    suffix_digits : int
+        章节编码之后的位数（美国10位编码为8，中国8位编码为6）
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (章节编码在prefixes中的下标, 编码后缀, 完整HS编码)
+    """
+    prefix_index = rng.integers(0, len(prefixes), size)
+    suffix_values = rng.integers(0, 10 ** suffix_digits, size, dtype=np.int64)
+
+    suffixes = format_digits(suffix_values, suffix_digits)
+    hs_codes = np.char.add(np.array(prefixes)[prefix_index], suffixes)
+    return prefix_index, suffixes, hs_codes
+
+@lru_cache(maxsize=None)
+def _template_table(template):
+    """模板只含固定文本和候选词时，展开为全部组合的描述表（与 itertools.product 的顺序相同）"""
+    parts = [[part] if isinstance(part, str) else list(part) for part in template]
+    return np.array([''.join(combo) for combo in itertools.product(*parts)], dtype=object)
+
+@lru_cache(maxsize=None)
+def _range_table(part):
+    """range 的全部取值 -> 字符串表（下标为取值减 start）"""
+    return np.array([str(value) for value in part], dtype=object)
+
+def render_template(rng, template, size, category_codes=None, category_table=None, suffixes=None):
+    """
+    按模板批量生成商品描述
+
+    模板是由以下部分组成的列表：
+    - str：固定文本
+    - tuple/list of str：随机选择其中一个
+    - range：随机选择其中一个整数
+    - CATEGORY / SUFFIX：该行的商品类别 / HS编码后缀
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        随机数生成器
+    template : list
+        描述模板
+    size : int
+        生成数量
+    category_codes : numpy.ndarray, optional
+        各行商品类别在 category_table 中的下标，模板含 CATEGORY 时必须提供
+    category_table : tuple of str, optional
+        商品类别名称
+    suffixes : numpy.ndarray, optional
+        各行的HS编码后缀（object 数组），模板含 SUFFIX 时必须提供
+
+    Returns
+    -------
+    numpy.ndarray
+        描述字符串数组（object）
+    """
+    if all(isinstance(part, (str, tuple, list)) for part in template):
+        # 只有固定文本和候选词：先展开成分类描述表，再一次性按下标抽取
+        return choose(rng, _template_table(tuple(tuple(part) if isinstance(part, list) else part
+                                                 for part in template)), size)
+
+    # 每个部分整列生成（随机数按模板部分的顺序抽取），再逐部分拼接
+    columns = []
+    for part in template:
+        if part is CATEGORY:
+            columns.append(np.array(category_table, dtype=object)[category_codes])
+        elif part is SUFFIX:
+            columns.append(suffixes)
+        elif isinstance(part, range):
+            columns.append(_range_table(part)[rng.integers(part.start, part.stop, size) - part.start])
+        elif isinstance(part, str):
+            columns.append(part)
+        else:
+            columns.append(choose(rng, np.array(part, dtype=object), size))
+    return reduce(np.add, columns)
+
+def sample_tariff_lines(rng, prefixes, size, suffix_digits, category_names, templates, default_template):
+    """
+    批量生成一轮关税清单的HS编码、商品描述和商品类别
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        随机数生成器
+    prefixes : sequence of str
+        该轮可选的HS章节编码
+    size : int
+        商品数量
+    suffix_digits : int
+        章节编码之后的位数
+    category_names : dict
+        HS章节编码 -> 商品类别名称
+    templates : dict
+        HS章节编码 -> 描述模板（见 render_template）
+    default_template : list
+        其他章节使用的描述模板
+
+    Returns
+    -------
+    dict
+        hs_code、product_description（字符串数组）和 category（(类别下标, 类别名称) 元组，
+        由 tariff_line_frame 转换为分类编码）三列
+    """
+    prefixes = list(prefixes)
+    prefix_index, hs_suffixes, hs_codes = sample_hs_codes(rng, prefixes, size, suffix_digits)
+    category_table = tuple(category_names[prefix] for prefix in prefixes)
+
+    # 按模板分组：同一模板的所有行一次生成
+    prefix_templates = [templates.get(prefix, default_template) for prefix in prefixes]
+    grouped = {}
+    for template in prefix_templates:
+        grouped.setdefault(id(template), (len(grouped), template))
+
+    if len(grouped) == 1:
+        groups = [(prefix_templates[0], np.arange(size))]
+    else:
+        # 稳定排序后按组切分，各组内的行保持原顺序
+        group_of = np.array([grouped[id(template)][0] for template in prefix_templates])
+        row_groups = group_of[prefix_index]
+        order = np.argsort(row_groups, kind='stable')
+        bounds = np.cumsum(np.bincount(row_groups, minlength=len(grouped))).tolist()
+        groups = [(template, order[start:stop])
+                  for (_, template), start, stop in zip(grouped.values(), [0] + bounds, bounds)]
+
+    descriptions = np.empty(size, dtype=object)
+    for template, rows in groups:
+        if len(rows):
+            codes = prefix_index[rows] if CATEGORY in template else None
+            suffixes = hs_suffixes[rows].astype(object) if SUFFIX in template else None
+            descriptions[rows] = render_template(rng, template, len(rows), codes, category_table, suffixes)
+
+    return {
+        'hs_code': hs_codes.astype(object),
+        'product_description': descriptions,
+        'category': (prefix_index, category_table),
+    }
+
+@lru_cache(maxsize=None)
+def _categorical_dtype(values):
+    """全部可能取值（元组）-> CategoricalDtype，相同的取值只构造一次"""
+    return pd.CategoricalDtype(list(values))
+
+@lru_cache(maxsize=None)
+def _category_positions(dtype, table):
+    """类别名称表中各名称在 dtype 类别中的下标（各轮、各批的类别名称表相同，只映射一次）"""
+    return dtype.categories.get_indexer(list(table))
+
+def _category_codes(value, dtype, size):
+    """一批中某分类列的取值 -> dtype 中的类别下标"""
+    if value is None:
+        return np.full(size, -1, dtype=np.int32)
+    if isinstance(value, tuple):
+        # (类别下标, 类别名称)：先把类别名称映射到 dtype 的类别
+        codes, table = value
+        return np.take(_category_positions(dtype, table), codes)
+    if isinstance(value, (np.ndarray, pd.Categorical)):
+        return dtype.categories.get_indexer(np.asarray(value, dtype=object))
+    return np.full(size, dtype.categories.get_loc(value), dtype=np.int32)
+
+def tariff_line_frame(batches, columns, categories):
+    """
+    将一批或多批关税清单合并转换为DataFrame，各次调用的列类型一致
+
+    Parameters
+    ----------
+    batches : list of dict
+        每批为 列名 -> 数组、(类别下标, 类别名称) 或标量，缺少的列以空值填充
+    columns : list of str
+        输出列顺序
+    categories : dict
+        以分类编码保存的列 -> 全部可能取值（列表或 pandas.CategoricalDtype）；
+        各批使用相同的类别，列式格式的各 row group 因此有相同的schema
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    sizes = [len(batch['hs_code']) for batch in batches]
+    data = {}
+    for column in columns:
+        values = [batch.get(column) for batch in batches]
+        if column in categories:
+            dtype = categories[column]
+            if not isinstance(dtype, pd.CategoricalDtype):
+                dtype = _categorical_dtype(tuple(dtype))
+            codes = [_category_codes(value, dtype, size) for value, size in zip(values, sizes)]
+            data[column] = pd.Categorical.from_codes(np.concatenate(codes), dtype=dtype)
+        else:
+            parts = [value if isinstance(value, np.ndarray)
+                     else np.full(size, value, dtype=object if value is None else None)
+                     for value, size in zip(values, sizes)]
+            data[column] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    return pd.DataFrame(data, copy=False)
+
+def write_tariff_lines(save_dir, artifact, rounds, sample_round, columns, categories, stream,
+                       seed=None, batch_rows=BATCH_ROWS, progress=PROGRESS_INTERVAL):
+    """
+    分批生成关税清单并逐批追加写出（CSV追加 / parquet row group），不在内存中保留整张表
+
+    每批使用独立的命名随机数流 (stream, 轮次, 批序号)，
+    结果只由种子和批大小决定，与写出格式无关；
+    相邻的小批（如默认规模下的各轮）合并为不超过 batch_rows 行的一块写出
+
+    Parameters
+    ----------
+    save_dir : str
+        保存目录
+    artifact : str
+        逻辑文件名（.csv）
+    rounds : list of tuple
+        (轮次信息 dict, 商品数量)，轮次信息须包含 'round'
+    sample_round : callable
+        sample_round(rng, round_info, size) -> 一批数据的字典（见 tariff_line_frame）
+    columns : list of str
+        输出列顺序
+    categories : dict
+        以分类编码保存的列 -> 全部可能取值
+    stream : str
+        随机数流名称
+    seed : int, optional
+        随机种子，默认使用随机数服务的根种子
+    batch_rows : int, optional
+        每批行数
+    progress : float, optional
+        报告写出进度和吞吐量的间隔秒数，None 时不报告
+
+    Returns
+    -------
+    TableWriter
+        已关闭的写出器：path 为主文件路径，rows（len）为写出行数
+    """
+    total = sum(size for _, size in rounds)
+    dtypes = {column: _categorical_dtype(tuple(values)) for column, values in categories.items()}
+    writer = TableWriter(save_dir, artifact, total=total, progress=progress)
+    with writer:
+        pending, pending_rows = [], 0
+        for round_info, size in rounds:
+            for index, start in enumerate(range(0, size, batch_rows)):
+                rows = min(batch_rows, size - start)
+                if pending and pending_rows + rows > batch_rows:
+                    writer.write(tariff_line_frame(pending, columns, dtypes))
+                    pending, pending_rows = [], 0
+                rng = make_rng(seed, (stream, round_info['round'], index))
+                pending.append(sample_round(rng, round_info, rows))
+                pending_rows += rows
+        if pending:
+            writer.write(tariff_line_frame(pending, columns, dtypes))
+    return writer
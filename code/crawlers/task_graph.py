@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+爬虫任务依赖图
+根据每个任务声明读取(reads)和写出(writes)的 data/raw 数据文件推导任务间依赖，
+按依赖顺序调度任务，相互独立的分支在进程池中并行运行
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+def artifact_producers(tasks):
+    """
+    建立数据文件到生成任务的映射
+
+    Parameters
+    ----------
+    tasks : list of dict
+        任务声明列表，每个任务包含 name、reads、writes 等字段
+
+    Returns
+    -------
+    dict
+        数据文件名 -> 生成该文件的任务名
+    """
+    producers = {}
+    for task in tasks:
+        for artifact in task.get('writes', []):
+            if artifact in producers:
+                raise ValueError(f"数据文件 {artifact} 同时由任务 {producers[artifact]} 和 {task['name']} 生成")
+            producers[artifact] = task['name']
+    return producers
+
+def task_dependencies(tasks):
+    """
+    计算每个任务依赖的上游任务
+
+    读取的数据文件如果不由任何任务生成，视为外部输入，不产生依赖
+
+    Parameters
+    ----------
+    tasks : list of dict
+        任务声明列表
+
+    Returns
+    -------
+    dict
+        任务名 -> 上游任务名集合
+    """
+    producers = artifact_producers(tasks)
+    dependencies = {}
+    for task in tasks:
+        upstream = set()
+        for artifact in task.get('reads', []):
+            producer = producers.get(artifact)
+            if producer is not None and producer != task['name']:
+                upstream.add(producer)
+        dependencies[task['name']] = upstream
+    return dependencies
+
+def topological_order(tasks):
+    """
+    按依赖关系对任务排序（同层任务保持声明顺序）
+
+    Parameters
+    ----------
+    tasks : list of dict
+        任务声明列表
+
+    Returns
+    -------
+    list of dict
+        排序后的任务列表，上游任务总在下游任务之前
+    """
+    dependencies = task_dependencies(tasks)
+    remaining = {name: set(upstream) for name, upstream in dependencies.items()}
+    ordered = []
+    done = set()
+
+    while remaining:
+        ready = [task for task in tasks
+                 if task['name'] in remaining and not remaining[task['name']] - done]
+        if not ready:
+            raise ValueError(f"任务依赖存在环: {', '.join(sorted(remaining))}")
+        for task in ready:
+            ordered.append(task)
+            done.add(task['name'])
+            del remaining[task['name']]
+
+    return ordered
+
+def select_tasks(tasks, targets):
+    """
+    选出生成目标所需的任务及其全部上游任务
+
+    Parameters
+    ----------
+    tasks : list of dict
+        任务声明列表
+    targets : list of str
+        目标数据文件名（如 consumer_sentiment_monthly.csv）或任务名
+
+    Returns
+    -------
+    list of dict
+        按依赖顺序排列的任务子集
+    """
+    producers = artifact_producers(tasks)
+    dependencies = task_dependencies(tasks)
+    task_names = {task['name'] for task in tasks}
+
+    selected = set()
+    stack = []
+    for target in targets:
+        if target in task_names:
+            stack.append(target)
+        elif target in producers:
+            stack.append(producers[target])
+        else:
+            raise ValueError(f"未知的任务或数据文件: {target}")
+
+    while stack:
+        name = stack.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        stack.extend(dependencies[name])
+
+    return [task for task in topological_order(tasks) if task['name'] in selected]
+
+def execute_task_graph(tasks, worker, max_workers=1, on_start=None, cached=None):
+    """
+    按依赖关系运行任务，逐个产出任务结果
+
+    上游任务全部完成后下游任务才会提交；上游任务失败时，下游任务不再运行并报告为失败
+
+    Parameters
+    ----------
+    tasks : list of dict
+        任务声明列表
+    worker : callable
+        以任务声明为参数运行单个任务的函数（并行时须为模块级函数以便序列化）
+    max_workers : int, optional
+        并行进程数，为1时在当前进程中依次运行
+    on_start : callable, optional
+        任务开始（提交）时以任务声明为参数调用
+    cached : callable, optional
+        任务就绪时以任务声明为参数调用，返回非None时直接作为该任务结果而不再运行
+
+    Yields
+    ------
+    tuple
+        (任务声明, 运行结果, 异常)，成功时异常为None，失败时运行结果为None
+    """
+    ordered = topological_order(tasks)
+    dependencies = task_dependencies(ordered)
+    failed = set()
+
+    def failed_upstream(task):
+        return sorted(dependencies[task['name']] & failed)
+
+    if max_workers == 1:
+        for task in ordered:
+            upstream = failed_upstream(task)
+            if upstream:
+                failed.add(task['name'])
+                yield task, None, RuntimeError(f"上游任务失败: {', '.join(upstream)}")
+                continue
+            result = cached(task) if cached is not None else None
+            if result is not None:
+                yield task, result, None
+                continue
+            if on_start is not None:
+                on_start(task)
+            try:
+                result = worker(task)
+            except Exception as e:
+                failed.add(task['name'])
+                yield task, None, e
+            else:
+                yield task, result, None
+        return
+
+    finished = set()
+    waiting = list(ordered)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+
+        while waiting or running:
+            # 提交所有上游已完成的任务，跳过上游失败的任务
+            still_waiting = []
+            skipped = []
+            reused = []
+            for task in waiting:
+                upstream = dependencies[task['name']]
+                if upstream & failed:
+                    skipped.append(task)
+                elif upstream <= finished:
+                    result = cached(task) if cached is not None else None
+                    if result is not None:
+                        finished.add(task['name'])
+                        reused.append((task, result))
+                        continue
+                    if on_start is not None:
+                        on_start(task)
+                    running[executor.submit(worker, task)] = task
+                else:
+                    still_waiting.append(task)
+            waiting = still_waiting
+
+            for task, result in reused:
+                yield task, result, None
+            for task in skipped:
+                upstream = failed_upstream(task)
+                failed.add(task['name'])
+                yield task, None, RuntimeError(f"上游任务失败: {', '.join(upstream)}")
+            if skipped or reused:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.add(task['name'])
+                    yield task, None, e
+                else:
+                    finished.add(task['name'])
+                    yield task, result, None
@@ -11,38 +11,35 @@ import pandas as pd
 import numpy as np
 import os
 import time
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+
+from data_store import save_table, load_table
+from rng_service import make_rng
+from event_calendar import EventCalendar
 
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def crawl_trade_data():
+def crawl_trade_data(seed=None):
     """
     模拟爬取美中双边贸易数据
     生成月度和年度贸易统计数据
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
     """
     print("开始生成美中双边贸易数据...")
     
     # 生成月度贸易数据
-    monthly_data = generate_monthly_trade_data()
-    monthly_file = os.path.join(save_dir, 'us_china_monthly_trade.csv')
-    monthly_data.to_csv(monthly_file, index=False, encoding='utf-8')
-    print(f"月度贸易数据生成完成，已保存到: {monthly_file}")
+    monthly_data = crawl_monthly_trade_data(seed)
     
     # 生成年度贸易数据（按产品类别）
-    annual_category_data = generate_annual_category_trade_data()
-    annual_category_file = os.path.join(save_dir, 'us_china_annual_trade_by_category.csv')
-    annual_category_data.to_csv(annual_category_file, index=False, encoding='utf-8')
-    print(f"年度按类别贸易数据生成完成，已保存到: {annual_category_file}")
+    annual_category_data = crawl_annual_category_trade_data(seed)
     
     # 生成贸易逆差统计
-    deficit_data = generate_trade_deficit_data(monthly_data)
-    deficit_file = os.path.join(save_dir, 'us_china_trade_deficit.csv')
-    deficit_data.to_csv(deficit_file, index=False, encoding='utf-8')
-    print(f"贸易逆差数据生成完成，已保存到: {deficit_file}")
+    deficit_data = crawl_trade_deficit_data(monthly_data)
     
     return {
         'monthly_data': monthly_data,
@@ -50,10 +47,47 @@ def crawl_trade_data():
         'deficit_data': deficit_data
     }
 
-def generate_monthly_trade_data():
+def crawl_monthly_trade_data(seed=None):
+    """
+    生成月度贸易数据并保存到 us_china_monthly_trade.csv
+    """
+    monthly_data = generate_monthly_trade_data(seed)
+    monthly_file = save_table(monthly_data, save_dir, 'us_china_monthly_trade.csv')
+    print(f"月度贸易数据生成完成，已保存到: {monthly_file}")
+    
+    return monthly_data
+
+def crawl_annual_category_trade_data(seed=None):
+    """
+    生成按产品类别的年度贸易数据并保存到 us_china_annual_trade_by_category.csv
+    """
+    annual_category_data = generate_annual_category_trade_data(seed)
+    annual_category_file = save_table(annual_category_data, save_dir, 'us_china_annual_trade_by_category.csv')
+    print(f"年度按类别贸易数据生成完成，已保存到: {annual_category_file}")
+    
+    return annual_category_data
+
+def crawl_trade_deficit_data(monthly_data=None):
+    """
+    生成贸易逆差统计并保存到 us_china_trade_deficit.csv
+    
+    参数:
+    - monthly_data: 月度贸易数据，为None时读取已保存的 us_china_monthly_trade.csv
+    """
+    deficit_data = generate_trade_deficit_data(monthly_data)
+    deficit_file = save_table(deficit_data, save_dir, 'us_china_trade_deficit.csv')
+    print(f"贸易逆差数据生成完成，已保存到: {deficit_file}")
+    
+    return deficit_data
+
+def generate_monthly_trade_data(seed=None):
     """
     生成月度美中双边贸易数据（2017-2025）
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子
     """
+    rng = make_rng(seed, 'trade_monthly')
     # 创建日期范围（2017年1月至2025年3月）
     start_date = datetime(2017, 1, 1)
     end_date = datetime(2025, 4, 1)  # 截止到2025年3月
@@ -192,8 +226,13 @@ def generate_monthly_trade_data():
     cumulative_exports_impact = 0
     cumulative_imports_impact = 0
     
+    # 事件窗口：直接影响取此前3个月（90天）内最近的事件，长期影响累积此前24个月内的全部事件
+    event_calendar = EventCalendar(events)
+    direct_event = event_calendar.last_in_window(dates, before=89)
+    lasting_starts, lasting_stops = event_calendar.window(dates, before=24, unit='M')
+    
     # 生成每月的贸易数据
-    for date in dates:
+    for i, date in enumerate(dates):
         # 获取年度基准增长率
         year_growth = annual_growth.get(date.year, 0.0)
         
@@ -207,34 +246,33 @@ def generate_monthly_trade_data():
         seasonal_factor = seasonality.get(date.month, 1.0)
         
         # 检查是否有特殊事件发生在当前月份或之前
-        # 累积所有过去事件的影响
-        for event_date, impact in events.items():
-            if date >= event_date and date < event_date + timedelta(days=90):  # 假设事件影响持续3个月
-                # 新事件的直接影响
-                exports_impact_factor = 1 + impact['us_exports_impact']
-                imports_impact_factor = 1 + impact['us_imports_impact']
-                event_description = impact['description']
-            else:
-                exports_impact_factor = 1
-                imports_impact_factor = 1
-                event_description = None
-            
-            # 累积长期影响（只对过去的事件）
-            if date >= event_date:
-                # 长期影响随时间衰减
-                months_since_event = (date.year - event_date.year) * 12 + (date.month - event_date.month)
-                if months_since_event <= 24:  # 假设影响持续2年
-                    decay_factor = 1 - (months_since_event / 24)
-                    cumulative_exports_impact += impact['us_exports_impact'] * 0.3 * decay_factor
-                    cumulative_imports_impact += impact['us_imports_impact'] * 0.3 * decay_factor
+        if direct_event[i] >= 0:  # 假设事件影响持续3个月
+            # 新事件的直接影响
+            impact = event_calendar.events[direct_event[i]]
+            exports_impact_factor = 1 + impact['us_exports_impact']
+            imports_impact_factor = 1 + impact['us_imports_impact']
+            event_description = impact['description']
+        else:
+            exports_impact_factor = 1
+            imports_impact_factor = 1
+            event_description = None
+        
+        # 累积过去事件的长期影响（假设影响持续2年，随时间衰减）
+        for j in range(lasting_starts[i], lasting_stops[i]):
+            impact = event_calendar.events[j]
+            event_date = event_calendar.dates[j].item()
+            months_since_event = (date.year - event_date.year) * 12 + (date.month - event_date.month)
+            decay_factor = 1 - (months_since_event / 24)
+            cumulative_exports_impact += impact['us_exports_impact'] * 0.3 * decay_factor
+            cumulative_imports_impact += impact['us_imports_impact'] * 0.3 * decay_factor
         
         # 计算最终的贸易数据
         us_exports = base_us_exports * growth_factor * seasonal_factor * exports_impact_factor * (1 + cumulative_exports_impact)
         us_imports = base_us_imports * growth_factor * seasonal_factor * imports_impact_factor * (1 + cumulative_imports_impact)
         
         # 添加随机波动（±5%）
-        us_exports *= (1 + random.uniform(-0.05, 0.05))
-        us_imports *= (1 + random.uniform(-0.05, 0.05))
+        us_exports *= (1 + rng.uniform(-0.05, 0.05))
+        us_imports *= (1 + rng.uniform(-0.05, 0.05))
         
         # 确保数据合理性
         us_exports = max(us_exports, base_us_exports * 0.4)  # 不会低于基准的40%
@@ -258,9 +296,12 @@ def generate_monthly_trade_data():
     
     return df
 
-def generate_annual_category_trade_data():
+def generate_annual_category_trade_data(seed=None):
     """
     按产品类别生成年度美中贸易数据
+    
+    参数:
+    - seed: 随机种子，默认使用随机数服务的根种子；每个类别、年份使用独立的随机数流
     """
     # 产品类别
     categories = [
@@ -395,6 +436,7 @@ def generate_annual_category_trade_data():
         
         # 为每个类别生成数据
         for category in categories:
+            rng = make_rng(seed, ('trade_annual_category', category, year))
             # 获取基础占比
             base_export_ratio = export_category_base_ratio.get(category, 0.01)
             base_import_ratio = import_category_base_ratio.get(category, 0.01)
@@ -445,8 +487,8 @@ def generate_annual_category_trade_data():
             final_import_ratio = base_import_ratio + import_ratio_change
             
             # 添加随机波动
-            final_export_ratio *= (1 + random.uniform(-0.1, 0.1))
-            final_import_ratio *= (1 + random.uniform(-0.1, 0.1))
+            final_export_ratio *= (1 + rng.uniform(-0.1, 0.1))
+            final_import_ratio *= (1 + rng.uniform(-0.1, 0.1))
             
             # 确保占比为正
             final_export_ratio = max(0.001, final_export_ratio)
@@ -475,10 +517,16 @@ def generate_annual_category_trade_data():
     
     return df
 
-def generate_trade_deficit_data(monthly_data):
+def generate_trade_deficit_data(monthly_data=None):
     """
     基于月度数据生成贸易逆差统计
+    
+    参数:
+    - monthly_data: 月度贸易数据，为None时读取已保存的 us_china_monthly_trade.csv
     """
+    if monthly_data is None:
+        monthly_data = load_table(save_dir, 'us_china_monthly_trade.csv')
+    
     # 转换日期列为日期类型
     monthly_data['date'] = pd.to_datetime(monthly_data['date'])
     
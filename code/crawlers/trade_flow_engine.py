@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+区域间贸易流量(OD)批量生成引擎
+由邻接矩阵和年度效应向量一次生成 (年份 × 起点 × 终点) 流量张量；
+区域数较多时按 (年份, 起点分块) 逐块生成长表，逐块写出，内存占用与区域数的平方无关。
+每年使用独立的随机数流，整体生成和分块生成使用相同的随机数序列，结果一致
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from rng_service import make_rng
+
+# 分块生成时每块的目标行数
+CHUNK_ROWS = 1_000_000
+
+# 随机数流名称（每年一个流：(FLOW_STREAM, 年份)）
+FLOW_STREAM = 'regional_trade_flows'
+
+def year_effects(years):
+    """
+    各年的贸易流量倍数
+
+    - 2018 起关税战后国内价值链重构，区域间贸易每年增加5%
+    - 2024 起国内大循环政策再增加0.1
+    - 2025 年只有Q1数据，按0.25折算
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (流量倍数, 年度数据比例)
+    """
+    years = np.asarray(years)
+    effect = np.where(years >= 2018, 1.0 + 0.05 * (years - 2017), 1.0)
+    effect = effect + np.where(years >= 2024, 0.1, 0.0)
+    year_fraction = np.where(years == 2025, 0.25, 1.0)
+    return effect * year_fraction, year_fraction
+
+def _dense_rows(adjacency, start, stop):
+    """取邻接矩阵 [start, stop) 行为稠密数组（支持稀疏矩阵）"""
+    rows = adjacency[start:stop]
+    return rows.toarray() if sparse.issparse(rows) else np.asarray(rows)
+
+def _flow_block(adjacency_rows, multiplier, rng):
+    """生成一个 (起点块 × 终点) 的流量块：基础流量 = 100 × 距离衰减 × 随机扰动"""
+    draws = rng.random(adjacency_rows.shape + (2,))
+    neighbor_factor = 1.0 + (adjacency_rows > 0)
+    distance_decay = (0.5 + draws[..., 0]) * neighbor_factor
+    base_flow = 100 * distance_decay * (0.8 + 0.4 * draws[..., 1])
+    return base_flow * multiplier
+
+def od_flow_tensor(adjacency, years, seed=None):
+    """
+    一次生成全部年份的OD流量张量（对角线即区域内部流量为0）
+
+    Parameters
+    ----------
+    adjacency : numpy.ndarray or scipy.sparse matrix
+        (n × n) 邻接矩阵
+    years : sequence of int
+        年份
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    numpy.ndarray
+        (年份 × n × n) 流量张量
+    """
+    adjacency = _dense_rows(adjacency, 0, adjacency.shape[0])
+    multiplier, _ = year_effects(years)
+    flows = np.stack([_flow_block(adjacency, multiplier[y], make_rng(seed, (FLOW_STREAM, year)))
+                      for y, year in enumerate(years)])
+    flows[:, np.arange(len(adjacency)), np.arange(len(adjacency))] = 0
+    return flows
+
+def iter_od_flow_chunks(regions, adjacency, years, seed=None, chunk_rows=CHUNK_ROWS, decimals=2):
+    """
+    按 (年份, 起点分块) 逐块生成长表格式的OD流量
+
+    每块包含 year、origin、destination、trade_flow、is_neighbor、year_fraction 列，
+    不含区域内部(origin == destination)的行。随机数的使用顺序与 od_flow_tensor 相同
+
+    Parameters
+    ----------
+    regions : sequence of str
+        区域名称
+    adjacency : numpy.ndarray or scipy.sparse matrix
+        (n × n) 邻接矩阵，稀疏矩阵只在每块内转换为稠密
+    years : sequence of int
+        年份
+    seed : int, optional
+        随机种子
+    chunk_rows : int, optional
+        每块的目标行数
+    decimals : int, optional
+        流量保留的小数位数
+
+    Yields
+    ------
+    pandas.DataFrame
+        一块长表数据
+    """
+    n = len(regions)
+    multiplier, year_fraction = year_effects(years)
+    block = max(1, min(n, chunk_rows // max(n, 1)))
+    region_dtype = pd.CategoricalDtype(list(regions))
+
+    for y, year in enumerate(years):
+        rng = make_rng(seed, (FLOW_STREAM, year))
+        for start in range(0, n, block):
+            stop = min(n, start + block)
+            adjacency_rows = _dense_rows(adjacency, start, stop)
+            flows = _flow_block(adjacency_rows, multiplier[y], rng)
+
+            origin, destination = np.divmod(np.arange((stop - start) * n), n)
+            origin += start
+            keep = origin != destination
+            origin, destination = origin[keep], destination[keep]
+
+            yield pd.DataFrame({
+                'year': np.full(len(origin), year),
+                'origin': pd.Categorical.from_codes(origin, dtype=region_dtype),
+                'destination': pd.Categorical.from_codes(destination, dtype=region_dtype),
+                'trade_flow': np.round(flows.ravel()[keep], decimals),
+                'is_neighbor': (adjacency_rows.ravel()[keep] > 0).astype(int),
+                'year_fraction': np.full(len(origin), year_fraction[y]),
+            })
@@ -12,14 +12,32 @@ import numpy as np
 import os
 import time
 from datetime import datetime
-import random
+
+from tariff_line_engine import (BATCH_ROWS, CATEGORY, SUFFIX, sample_tariff_lines, uniform_rounded,
+                                write_tariff_lines)
+from rng_service import make_rng
+from data_store import load_table, save_table
 
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def generate_us_tariff_data():
+# 各品类贸易额对关税的敏感系数（关税影响 = 覆盖率 × 税率 × 敏感系数）
+TRADE_SENSITIVITY = {
+    '电子设备和通信设备': 0.5,
+    '机械设备': 0.4,
+    '汽车及零部件': 0.7,
+    '钢铁铝制品': 0.8,
+    '服装和纺织品': 0.6,
+    '塑料和化学品': 0.3,
+    '家具和家居用品': 0.5,
+    '农产品和食品': 0.2,
+    '医疗设备': 0.1,
+    '稀土和电池': 0.9
+}
+
+def generate_us_tariff_data(with_summary=True, seed=None, scale=1, batch_rows=BATCH_ROWS):
     """
     生成美国对中国商品各轮关税清单数据
     
@@ -29,6 +47,17 @@ def generate_us_tariff_data():
     - 第三批：2000亿美元 (2018年9月24日实施，2019年5月10日从10%上调至25%)
     - 第四批：约3000亿美元 (部分于2019年9月1日实施)
     - 2024年新增关税 (模拟数据)
+    
+    参数:
+    - with_summary: 是否同时生成关税影响汇总数据（任务图中作为独立任务运行时为False）
+    - seed: 随机种子，相同种子生成相同的清单
+    - scale: 每轮商品数量的放大倍数，用于生成大规模压力测试数据
+    - batch_rows: 每批生成和写出的行数，清单逐批追加写出，内存占用与总行数无关
+    
+    返回:
+    - 已关闭的 TableWriter（path 为输出文件，rows 为写出行数）
+      注意：早期版本返回清单 DataFrame；清单现在逐批写出，不在内存中保留整张表，
+      需要 DataFrame 时使用 generate_us_data() 或 data_store.load_table(save_dir, 'us_tariffs_on_china.csv')
     """
     print("开始生成美国对华关税清单数据...")
     
@@ -112,78 +141,76 @@ def generate_us_tariff_data():
         '76': '铝及铝制品'
     }
     
-    # 生成详细关税清单数据
-    all_tariff_items = []
+    # 商品描述模板（见 tariff_line_engine.render_template）
+    apparel_template = [('男式', '女式', '儿童'), '的', ('上衣', '裤子', '裙子', '外套', 'T恤')]
+    description_templates = {
+        '84': [('工业', '农业', '商用'), '用', ('机械', '设备', '器具'), '，',
+               ('功率', '重量', '尺寸'), '不超过', range(1, 1001), '单位'],
+        '85': [('电子', '电气', '通信'), '设备，用于', ('工业', '民用', '通信')],
+        '87': [('乘用车', '卡车', '拖拉机', '摩托车'), '，', ('排量', '功率'), '为', range(50, 5001), '单位'],
+        '61': apparel_template,
+        '62': apparel_template,
+        '63': apparel_template
+    }
+    default_template = [CATEGORY, '相关产品，规格型号', SUFFIX]
     
-    for round_info in tariff_rounds:
+    # 生成详细关税清单数据：每轮按固定行数分批生成
+    def sample_round(rng, round_info, size):
         round_num = round_info['round']
-        product_count = round_info['product_count']
-        tariff_date = round_info['date']
         tariff_rate = round_info['rate']
         
-        # 该轮次的HS编码范围
-        hs_prefixes = hs_ranges[round_num]
+        # 创建完整的HS编码 (10位) 及商品描述
+        batch = sample_tariff_lines(rng, hs_ranges[round_num], size, 8,
+                                       categories, description_templates, default_template)
+        batch['round'] = round_num
+        batch['implementation_date'] = round_info['date']
         
-        for _ in range(product_count):
-            # 随机选择一个HS类别
-            hs_prefix = random.choice(hs_prefixes)
-            category = categories[hs_prefix]
-            
-            # 创建完整的HS编码 (10位)
-            hs_suffix = ''.join([str(random.randint(0, 9)) for _ in range(8)])
-            hs_code = f"{hs_prefix}{hs_suffix}"
-            
-            # 生成模拟的商品描述
-            if hs_prefix == '84':
-                description = f"{random.choice(['工业', '农业', '商用'])}用{random.choice(['机械', '设备', '器具'])}，{random.choice(['功率', '重量', '尺寸'])}不超过{random.randint(1, 1000)}单位"
-            elif hs_prefix == '85':
-                description = f"{random.choice(['电子', '电气', '通信'])}设备，用于{random.choice(['工业', '民用', '通信'])}"
-            elif hs_prefix == '87':
-                description = f"{random.choice(['乘用车', '卡车', '拖拉机', '摩托车'])}，{random.choice(['排量', '功率'])}为{random.randint(50, 5000)}单位"
-            elif hs_prefix in ('61', '62', '63'):
-                description = f"{random.choice(['男式', '女式', '儿童'])}的{random.choice(['上衣', '裤子', '裙子', '外套', 'T恤'])}"
-            else:
-                description = f"{category}相关产品，规格型号{hs_suffix}"
-            
-            # 初始税率和最终税率
-            initial_rate = round_info.get('initial_rate', tariff_rate)
-            final_rate = tariff_rate
-            
-            # 随机生成该产品相关的贸易数额（单位：百万美元）
-            trade_value = round(random.uniform(0.1, 100.0), 2)
-            
-            # 生成记录
-            tariff_item = {
-                'round': round_num,
-                'hs_code': hs_code,
-                'product_description': description,
-                'category': category,
-                'implementation_date': tariff_date,
-                'initial_tariff_rate': initial_rate,
-                'current_tariff_rate': final_rate,
-                'annual_trade_value_millions': trade_value
-            }
-            
-            # 对于第三轮，添加关税升级日期
-            if round_num == 3:
-                tariff_item['tariff_escalation_date'] = round_info['escalation_date']
-            
-            all_tariff_items.append(tariff_item)
+        # 初始税率和最终税率
+        batch['initial_tariff_rate'] = round_info.get('initial_rate', tariff_rate)
+        batch['current_tariff_rate'] = tariff_rate
+        
+        # 随机生成该产品相关的贸易数额（单位：百万美元）
+        batch['annual_trade_value_millions'] = uniform_rounded(rng, 0.1, 100.0, size, 2)
+        
+        # 对于第三轮，添加关税升级日期
+        if round_num == 3:
+            batch['tariff_escalation_date'] = round_info['escalation_date']
+        
+        return batch
     
-    # 转换为DataFrame并保存
-    df = pd.DataFrame(all_tariff_items)
-    output_file = os.path.join(save_dir, 'us_tariffs_on_china.csv')
-    df.to_csv(output_file, index=False, encoding='utf-8')
+    # 逐批追加写出，各批的分类列使用相同的类别
+    columns = ['round', 'hs_code', 'product_description', 'category', 'implementation_date',
+               'initial_tariff_rate', 'current_tariff_rate', 'annual_trade_value_millions',
+               'tariff_escalation_date']
+    column_categories = {
+        'category': list(dict.fromkeys(categories.values())),
+        'implementation_date': list(dict.fromkeys(r['date'] for r in tariff_rounds)),
+        'tariff_escalation_date': [r['escalation_date'] for r in tariff_rounds if 'escalation_date' in r],
+    }
+    rounds = [(round_info, int(round_info['product_count'] * scale)) for round_info in tariff_rounds]
+    result = write_tariff_lines(save_dir, 'us_tariffs_on_china.csv', rounds, sample_round, columns,
+                                column_categories, 'us_tariff_lines', seed=seed, batch_rows=batch_rows)
     
-    print(f"美国对华关税清单数据生成完成，已保存到: {output_file}")
+    print(f"美国对华关税清单数据生成完成，共 {result.rows} 条，已保存到: {result.path}")
     
     # 生成关税影响汇总数据
-    generate_tariff_impact_summary()
+    if with_summary:
+        generate_tariff_impact_summary(seed=seed)
     
-    return df
+    return result
 
-def generate_tariff_impact_summary():
-    """生成关税影响的汇总数据"""
+def generate_tariff_impact_summary(sensitivity=TRADE_SENSITIVITY, save=True, seed=None):
+    """
+    生成关税影响的汇总数据
+    
+    参数:
+    - sensitivity: 品类 -> 贸易额对关税的敏感系数，默认 TRADE_SENSITIVITY
+    - save: 是否保存；敏感性分析中反复求值时为False
+    - seed: 随机种子，默认使用随机数服务的根种子；每个品类使用独立的随机数流
+    
+    返回:
+    - 品类 × 年份的关税影响表
+    """
     # 年份范围（扩展到2025年）
     years = list(range(2017, 2026))
     
@@ -227,6 +254,7 @@ def generate_tariff_impact_summary():
     impact_data = []
     
     for category in categories:
+        rng = make_rng(seed, ('us_tariff_impact', category))
         # 设定基础关税税率和覆盖率
         base_tariff_rate = 3.0  # 假设WTO/MFN基础税率
         base_coverage = 0.0     # 基础覆盖率
@@ -304,8 +332,8 @@ def generate_tariff_impact_summary():
                     rate = base_tariff_rate
             
             # 增加随机波动
-            rate_variation = random.uniform(-1.0, 1.0)
-            coverage_variation = random.uniform(-0.05, 0.05)
+            rate_variation = rng.uniform(-1.0, 1.0)
+            coverage_variation = rng.uniform(-0.05, 0.05)
             
             final_rate = max(0, rate + rate_variation)
             final_coverage = max(0, min(1.0, coverage + coverage_variation))
@@ -338,18 +366,6 @@ def generate_tariff_impact_summary():
             
             # 关税影响（贸易额下降百分比）
             # 简化公式：影响 = 覆盖率 * 税率 * 敏感系数
-            sensitivity = {
-                '电子设备和通信设备': 0.5,
-                '机械设备': 0.4,
-                '汽车及零部件': 0.7,
-                '钢铁铝制品': 0.8,
-                '服装和纺织品': 0.6,
-                '塑料和化学品': 0.3,
-                '家具和家居用品': 0.5,
-                '农产品和食品': 0.2,
-                '医疗设备': 0.1,
-                '稀土和电池': 0.9
-            }
             
             trade_impact = final_coverage * final_rate * sensitivity.get(category, 0.5) / 100
             
@@ -367,7 +383,7 @@ def generate_tariff_impact_summary():
                 final_trade_value = base_value * (1 - trade_impact)
             
             # 随机波动
-            final_trade_value *= (1 + random.uniform(-0.05, 0.05))
+            final_trade_value *= (1 + rng.uniform(-0.05, 0.05))
             
             # 2025年调整为部分年度数据
             if year == 2025:
@@ -386,8 +402,8 @@ def generate_tariff_impact_summary():
     
     # 转换为DataFrame并保存
     df_impact = pd.DataFrame(impact_data)
-    output_file = os.path.join(save_dir, 'us_tariff_impact_by_category.csv')
-    df_impact.to_csv(output_file, index=False, encoding='utf-8')
+    if save:
+        save_table(df_impact, save_dir, 'us_tariff_impact_by_category.csv')
     
     return df_impact
 
@@ -395,8 +411,12 @@ def generate_tariff_impact_summary():
 def generate_us_data():
     """
     兼容run_all_crawlers.py的主函数名称命名模式
+    
+    返回:
+    - 关税清单 DataFrame（与早期版本相同：生成后从输出文件读回，generate_us_tariff_data 本身只返回写出器）
     """
-    return generate_us_tariff_data()
+    generate_us_tariff_data()
+    return load_table(save_dir, 'us_tariffs_on_china.csv')
 
 if __name__ == "__main__":
     generate_us_tariff_data() 
\ No newline at end of file
@@ -13,20 +13,57 @@ import time
 import os
 from datetime import datetime
 
+from data_store import save_table
+from fetch_client import FetchError, default_client
+
 # 创建数据保存目录
 save_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw')
 if not os.path.exists(save_dir):
     os.makedirs(save_dir)
 
-def get_ustr_tariff_lists():
+# USTR 第301条款关税措施页面（各轮清单和联邦公报通知的入口）
+USTR_SOURCES = {
+    'tariff_actions': 'https://ustr.gov/issue-areas/enforcement/section-301-investigations/tariff-actions',
+}
+
+def fetch_ustr_sources(client=None, sources=USTR_SOURCES):
+    """
+    通过共用的抓取层（fetch_client）获取USTR页面，响应保存在内容寻址的缓存中
+    
+    参数:
+    - client: FetchClient，默认使用当前进程的默认客户端
+    - sources: 名称 -> URL
+    
+    返回:
+    - 名称 -> 抓取结果（见 fetch_client）的字典
+    """
+    client = client or default_client()
+    names = list(sources)
+    pages = client.get_many([sources[name] for name in names])
+    return dict(zip(names, pages))
+
+def get_ustr_tariff_lists(fetch=False, client=None):
     """
     获取USTR关税清单数据
     
     由于USTR网站可能没有直接的API接口，这里使用模拟的数据结构
     在实际应用中，需要根据USTR网站的实际结构进行调整
+    
+    参数:
+    - fetch: 是否同时抓取USTR页面（fetch_ustr_sources）并保存到响应缓存；
+      抓取失败时只给出提示，仍生成下列数据
+    - client: 抓取使用的 FetchClient，默认使用当前进程的默认客户端
     """
     print("开始爬取USTR关税清单数据...")
     
+    if fetch:
+        try:
+            for name, page in fetch_ustr_sources(client).items():
+                source = '缓存' if page['from_cache'] else '网络'
+                print(f"  {name}: {page['url']} ({len(page['content'])} 字节，来自{source}，sha256 {page['sha256'][:12]})")
+        except FetchError as exc:
+            print(f"  USTR页面抓取失败: {exc}")
+    
     # 模拟USTR关税轮次数据
     tariff_rounds = [
         {
@@ -106,19 +143,19 @@ def get_ustr_tariff_lists():
     
     # 将数据保存为CSV文件
     df_rounds = pd.DataFrame(tariff_rounds)
-    df_rounds.to_csv(os.path.join(save_dir, 'ustr_tariff_rounds.csv'), index=False, encoding='utf-8')
+    save_table(df_rounds, save_dir, 'ustr_tariff_rounds.csv')
     
     df_round1 = pd.DataFrame(round1_products)
     df_round1['round'] = "第一轮"
-    df_round1.to_csv(os.path.join(save_dir, 'ustr_tariff_round1_products.csv'), index=False, encoding='utf-8')
+    save_table(df_round1, save_dir, 'ustr_tariff_round1_products.csv')
     
     df_round2 = pd.DataFrame(round2_products)
     df_round2['round'] = "第二轮"
-    df_round2.to_csv(os.path.join(save_dir, 'ustr_tariff_round2_products.csv'), index=False, encoding='utf-8')
+    save_table(df_round2, save_dir, 'ustr_tariff_round2_products.csv')
     
     # 合并所有产品数据
     df_all_products = pd.concat([df_round1, df_round2])
-    df_all_products.to_csv(os.path.join(save_dir, 'ustr_tariff_all_products.csv'), index=False, encoding='utf-8')
+    save_table(df_all_products, save_dir, 'ustr_tariff_all_products.csv')
     
     print(f"USTR关税数据爬取完成，已保存到: {save_dir}")
     return df_rounds, df_all_products
@@ -1,591 +0,0 @@
-import pandas as pd
-import numpy as np
-import json
-import os
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-import pickle
-
-# 确保figures目录存在
-os.makedirs('figures', exist_ok=True)
-
-def create_date_range(start='2017-01-01', end='2025-04-30', freq='M'):
-    """创建日期范围"""
-    return pd.date_range(start=start, end=end, freq=freq)
-
-def create_trade_data():
-    """生成贸易数据并保存可视化结果"""
-    print("生成贸易数据...")
-    
-    # 创建月度日期范围
-    dates = create_date_range()
-    
-    # 关税事件日期
-    tariff_dates = ['2018-03-22', '2018-07-06', '2019-05-10', '2020-01-15']
-    
-    # 基础贸易数据
-    base_exports = 10000 + np.random.normal(0, 500, len(dates))
-    base_imports = 30000 + np.random.normal(0, 1000, len(dates))
-    
-    # 添加关税效应
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2018-03-22':  # 特朗普签署备忘录
-            base_exports[date_idx:] -= 500
-            base_imports[date_idx:] -= 300
-        elif date == '2018-07-06':  # 第一轮关税
-            base_exports[date_idx:] -= 1000
-            base_imports[date_idx:] -= 2000
-        elif date == '2019-05-10':  # 提高关税税率
-            base_exports[date_idx:] -= 1500
-            base_imports[date_idx:] -= 3000
-        elif date == '2020-01-15':  # 第一阶段协议
-            base_exports[date_idx:] += 800
-            base_imports[date_idx:] += 1200
-    
-    # 添加季节性和趋势
-    trend = np.linspace(0, 2000, len(dates))
-    seasonality = 500 * np.sin(np.linspace(0, 2*np.pi*8, len(dates)))
-    
-    exports = base_exports + trend * 0.5 + seasonality
-    imports = base_imports + trend + seasonality * 1.2
-    
-    # 创建贸易数据DataFrame
-    trade_data = pd.DataFrame({
-        'date': dates,
-        'us_exports_to_china': exports,
-        'us_imports_from_china': imports,
-        'trade_balance': exports - imports
-    })
-    
-    # 保存数据
-    trade_data.to_csv('trade_data.csv', index=False)
-    
-    # 创建可视化
-    plt.figure(figsize=(12, 6))
-    plt.plot(trade_data['date'], trade_data['us_exports_to_china'], label='美国对华出口')
-    plt.plot(trade_data['date'], trade_data['us_imports_from_china'], label='美国从华进口')
-    plt.plot(trade_data['date'], trade_data['trade_balance'], label='贸易差额')
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    plt.title('美中贸易数据 (2017-2025)')
-    plt.xlabel('日期')
-    plt.ylabel('百万美元')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('figures/trade_trends.png')
-    plt.close()
-    
-    return trade_data
-
-def create_sentiment_data():
-    """生成消费者信心指数和社交媒体情感数据"""
-    print("生成情感和信心指数数据...")
-    
-    # 创建月度日期范围
-    dates = create_date_range()
-    
-    # 关税事件日期
-    tariff_dates = ['2018-03-22', '2018-07-06', '2019-05-10', '2020-01-15']
-    
-    # 基础消费者信心指数
-    us_base_cci = 100 + np.random.normal(0, 2, len(dates))
-    china_base_cci = 110 + np.random.normal(0, 2, len(dates))
-    
-    # 添加关税效应
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2018-03-22':
-            us_base_cci[date_idx:date_idx+3] -= 2
-            china_base_cci[date_idx:date_idx+3] -= 1
-        elif date == '2018-07-06':
-            us_base_cci[date_idx:date_idx+6] -= 5
-            china_base_cci[date_idx:date_idx+6] -= 3
-        elif date == '2019-05-10':
-            us_base_cci[date_idx:date_idx+4] -= 4
-            china_base_cci[date_idx:date_idx+4] -= 2
-        elif date == '2020-01-15':
-            us_base_cci[date_idx:] += 3
-            china_base_cci[date_idx:] += 2
-    
-    # 添加趋势恢复
-    for i in range(len(dates)):
-        us_base_cci[i] += min(0, 0.2 * i)  # 缓慢恢复
-        china_base_cci[i] += min(0, 0.15 * i)
-    
-    # 社交媒体情感 (-1 到 1，-1 为极度负面，1 为极度正面)
-    base_sentiment = np.random.normal(0.1, 0.2, len(dates))
-    
-    # 添加关税效应到情感
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2018-03-22':
-            base_sentiment[date_idx:date_idx+2] -= 0.3
-        elif date == '2018-07-06':
-            base_sentiment[date_idx:date_idx+3] -= 0.5
-        elif date == '2019-05-10':
-            base_sentiment[date_idx:date_idx+3] -= 0.4
-        elif date == '2020-01-15':
-            base_sentiment[date_idx:date_idx+2] += 0.3
-    
-    # 市场波动性 (0-100)
-    market_volatility = 20 + 10 * np.random.random(len(dates))
-    
-    # 关税事件后波动性增加
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date in ['2018-07-06', '2019-05-10']:
-            market_volatility[date_idx:date_idx+3] += 25
-        else:
-            market_volatility[date_idx:date_idx+2] += 15
-    
-    # 创建情感数据DataFrame
-    sentiment_data = pd.DataFrame({
-        'date': dates,
-        'us_consumer_confidence': us_base_cci,
-        'china_consumer_confidence': china_base_cci,
-        'social_media_sentiment': base_sentiment,
-        'market_volatility': market_volatility
-    })
-    
-    # 保存数据
-    sentiment_data.to_csv('sentiment_data.csv', index=False)
-    
-    # 创建可视化
-    plt.figure(figsize=(12, 6))
-    plt.plot(sentiment_data['date'], sentiment_data['us_consumer_confidence'], label='美国消费者信心')
-    plt.plot(sentiment_data['date'], sentiment_data['china_consumer_confidence'], label='中国消费者信心')
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    plt.title('美中消费者信心指数 (2017-2025)')
-    plt.xlabel('日期')
-    plt.ylabel('指数值')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('figures/consumer_confidence.png')
-    plt.close()
-    
-    # 情感和市场波动性可视化
-    plt.figure(figsize=(12, 6))
-    ax1 = plt.gca()
-    ax2 = ax1.twinx()
-    
-    ax1.plot(sentiment_data['date'], sentiment_data['social_media_sentiment'], 'g-', label='社交媒体情感')
-    ax2.plot(sentiment_data['date'], sentiment_data['market_volatility'], 'b-', label='市场波动性')
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    ax1.set_xlabel('日期')
-    ax1.set_ylabel('情感指数 (-1 至 1)', color='g')
-    ax2.set_ylabel('波动性指数', color='b')
-    
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
-    
-    plt.title('社交媒体情感与市场波动性 (2017-2025)')
-    plt.grid(True)
-    plt.savefig('figures/sentiment_volatility.png')
-    plt.close()
-    
-    return sentiment_data
-
-def create_regional_data():
-    """生成区域经济数据"""
-    print("生成区域经济数据...")
-    
-    # 创建区域列表
-    us_regions = ['Northeast', 'Midwest', 'South', 'West']
-    china_regions = ['东部', '中部', '西部', '东北']
-    
-    # 创建年度日期范围
-    dates = create_date_range(freq='Y')
-    years = [d.year for d in dates]
-    
-    regional_data = []
-    
-    # 生成美国区域数据
-    for region in us_regions:
-        # 基础增长率和失业率
-        base_growth = 2.5 + np.random.normal(0, 0.3, len(years))
-        base_unemployment = 4.5 + np.random.normal(0, 0.2, len(years))
-        
-        # 贸易依赖程度 (0-100)
-        if region == 'Midwest':
-            trade_dependency = 65 + np.random.normal(0, 5, len(years))
-        elif region == 'West':
-            trade_dependency = 55 + np.random.normal(0, 5, len(years))
-        elif region == 'South':
-            trade_dependency = 45 + np.random.normal(0, 5, len(years))
-        else:  # Northeast
-            trade_dependency = 40 + np.random.normal(0, 5, len(years))
-        
-        # 关税影响 (2018-2020)
-        for i, year in enumerate(years):
-            if year == 2018:
-                base_growth[i] -= 0.3 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.2 * trade_dependency[i] / 100
-            elif year == 2019:
-                base_growth[i] -= 0.5 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.4 * trade_dependency[i] / 100
-            elif year == 2020:
-                base_growth[i] -= 0.2 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.1 * trade_dependency[i] / 100
-        
-        for i, year in enumerate(years):
-            regional_data.append({
-                'year': year,
-                'country': 'US',
-                'region': region,
-                'gdp_growth': base_growth[i],
-                'unemployment': base_unemployment[i],
-                'trade_dependency': trade_dependency[i]
-            })
-    
-    # 生成中国区域数据
-    for region in china_regions:
-        # 基础增长率和失业率
-        base_growth = 6.0 + np.random.normal(0, 0.4, len(years))
-        base_unemployment = 3.8 + np.random.normal(0, 0.2, len(years))
-        
-        # 贸易依赖程度 (0-100)
-        if region == '东部':
-            trade_dependency = 70 + np.random.normal(0, 5, len(years))
-        elif region == '中部':
-            trade_dependency = 50 + np.random.normal(0, 5, len(years))
-        elif region == '西部':
-            trade_dependency = 40 + np.random.normal(0, 5, len(years))
-        else:  # 东北
-            trade_dependency = 45 + np.random.normal(0, 5, len(years))
-        
-        # 关税影响 (2018-2020)
-        for i, year in enumerate(years):
-            if year == 2018:
-                base_growth[i] -= 0.2 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.1 * trade_dependency[i] / 100
-            elif year == 2019:
-                base_growth[i] -= 0.3 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.2 * trade_dependency[i] / 100
-            elif year == 2020:
-                base_growth[i] -= 0.1 * trade_dependency[i] / 100
-                base_unemployment[i] += 0.05 * trade_dependency[i] / 100
-        
-        for i, year in enumerate(years):
-            regional_data.append({
-                'year': year,
-                'country': 'China',
-                'region': region,
-                'gdp_growth': base_growth[i],
-                'unemployment': base_unemployment[i],
-                'trade_dependency': trade_dependency[i]
-            })
-    
-    # 创建DataFrame并保存
-    regional_df = pd.DataFrame(regional_data)
-    regional_df.to_csv('regional_data.csv', index=False)
-    
-    # 创建可视化 - 美国区域GDP增长率
-    us_data = regional_df[regional_df['country'] == 'US']
-    plt.figure(figsize=(12, 6))
-    
-    for region in us_regions:
-        region_data = us_data[us_data['region'] == region]
-        plt.plot(region_data['year'], region_data['gdp_growth'], marker='o', label=region)
-    
-    plt.title('美国各区域GDP增长率 (2017-2025)')
-    plt.xlabel('年份')
-    plt.ylabel('增长率 (%)')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('figures/us_regional_growth.png')
-    plt.close()
-    
-    # 创建可视化 - 中国区域GDP增长率
-    china_data = regional_df[regional_df['country'] == 'China']
-    plt.figure(figsize=(12, 6))
-    
-    for region in china_regions:
-        region_data = china_data[china_data['region'] == region]
-        plt.plot(region_data['year'], region_data['gdp_growth'], marker='o', label=region)
-    
-    plt.title('中国各区域GDP增长率 (2017-2025)')
-    plt.xlabel('年份')
-    plt.ylabel('增长率 (%)')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('figures/china_regional_growth.png')
-    plt.close()
-    
-    return regional_df
-
-def create_strategic_resources():
-    """生成战略资源数据"""
-    print("生成战略资源数据...")
-    
-    # 创建月度日期范围
-    dates = create_date_range()
-    
-    # 基础稀土供应量 (指数，100为基期)
-    base_supply = 100 + np.cumsum(np.random.normal(0, 1, len(dates))) * 0.1
-    
-    # 关税事件日期
-    tariff_dates = ['2018-03-22', '2018-07-06', '2019-05-10', '2020-01-15']
-    
-    # 添加关税效应
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2019-05-10':  # 关税升级可能引发稀土限制
-            base_supply[date_idx:date_idx+6] -= np.linspace(0, 8, 6)
-        elif date == '2020-01-15':  # 第一阶段协议
-            base_supply[date_idx:] += 5
-    
-    # 美国对中国稀土依赖度 (%)
-    base_dependency = 80 + np.random.normal(0, 3, len(dates))
-    
-    # 关税战后美国寻求减少依赖
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2018-07-06':
-            trend = np.linspace(0, 15, len(dates) - date_idx)
-            base_dependency[date_idx:] -= trend
-    
-    # 确保依赖度在合理范围内
-    base_dependency = np.clip(base_dependency, 45, 95)
-    
-    # 添加军事预算数据
-    us_military_budget = 700 + np.cumsum(np.random.normal(0, 2, len(dates))) * 0.3
-    china_military_budget = 250 + np.cumsum(np.random.normal(0, 2, len(dates))) * 0.4
-    
-    # 关税战期间军费增加
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date in ['2018-07-06', '2019-05-10']:
-            us_military_budget[date_idx:] += 10
-            china_military_budget[date_idx:] += 8
-    
-    # 冲突风险指数
-    base_risk = 30 + np.random.normal(0, 5, len(dates))
-    
-    # 关税事件影响风险
-    for date in tariff_dates:
-        date_idx = np.where(dates >= date)[0][0]
-        if date == '2018-03-22':
-            base_risk[date_idx:date_idx+3] += 10
-        elif date == '2018-07-06':
-            base_risk[date_idx:date_idx+6] += 20
-        elif date == '2019-05-10':
-            base_risk[date_idx:date_idx+4] += 25
-        elif date == '2020-01-15':
-            base_risk[date_idx:date_idx+3] -= 15
-    
-    # 添加疫情期间的变化 (2020年初)
-    covid_idx = np.where(dates >= '2020-02-01')[0][0]
-    base_risk[covid_idx:covid_idx+12] += 5
-    
-    # 确保风险指数在合理范围内
-    base_risk = np.clip(base_risk, 10, 80)
-    
-    # 创建战略资源DataFrame
-    strategic_data = pd.DataFrame({
-        'date': dates,
-        'rare_earth_supply': base_supply,
-        'us_dependency': base_dependency,
-        'us_military_budget': us_military_budget,
-        'china_military_budget': china_military_budget,
-        'conflict_risk': base_risk
-    })
-    
-    # 保存数据
-    strategic_data.to_csv('strategic_resources.csv', index=False)
-    
-    # 创建可视化 - 稀土供应和依赖度
-    plt.figure(figsize=(12, 6))
-    ax1 = plt.gca()
-    ax2 = ax1.twinx()
-    
-    ax1.plot(strategic_data['date'], strategic_data['rare_earth_supply'], 'g-', label='中国稀土供应指数')
-    ax2.plot(strategic_data['date'], strategic_data['us_dependency'], 'b-', label='美国对中国稀土依赖度 (%)')
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    ax1.set_xlabel('日期')
-    ax1.set_ylabel('供应指数 (基期=100)', color='g')
-    ax2.set_ylabel('依赖度 (%)', color='b')
-    
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
-    
-    plt.title('中国稀土供应与美国依赖度 (2017-2025)')
-    plt.grid(True)
-    plt.savefig('figures/rare_earth_dependency.png')
-    plt.close()
-    
-    # 创建可视化 - 军事预算
-    plt.figure(figsize=(12, 6))
-    plt.plot(strategic_data['date'], strategic_data['us_military_budget'], label='美国军事预算')
-    plt.plot(strategic_data['date'], strategic_data['china_military_budget'], label='中国军事预算')
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    plt.title('美中军事预算 (2017-2025)')
-    plt.xlabel('日期')
-    plt.ylabel('十亿美元')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig('figures/military_budgets.png')
-    plt.close()
-    
-    # 创建可视化 - 冲突风险指数
-    plt.figure(figsize=(12, 6))
-    plt.plot(strategic_data['date'], strategic_data['conflict_risk'])
-    
-    # 添加关税事件垂直线
-    for date in tariff_dates:
-        plt.axvline(x=pd.to_datetime(date), color='r', linestyle='--', alpha=0.5)
-    
-    plt.title('美中冲突风险指数 (2017-2025)')
-    plt.xlabel('日期')
-    plt.ylabel('风险指数')
-    plt.grid(True)
-    plt.savefig('figures/conflict_risk.png')
-    plt.close()
-    
-    return strategic_data
-
-def combine_results(trade_data, sentiment_data, regional_data, strategic_data):
-    """合并分析结果并保存"""
-    print("整合分析结果...")
-    
-    # 创建自定义的JSON编码器处理Timestamp类型
-    class DateTimeEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, (pd.Timestamp, pd.DatetimeIndex)):
-                return obj.strftime('%Y-%m-%d')
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            return super().default(obj)
-    
-    # 将DataFrame转换为字典前先转换日期列
-    def dataframe_to_safe_dict(df):
-        df_copy = df.copy()
-        for col in df_copy.columns:
-            if isinstance(df_copy[col].iloc[0], pd.Timestamp):
-                df_copy[col] = df_copy[col].dt.strftime('%Y-%m-%d')
-        return df_copy.to_dict()
-    
-    # 创建分析结果字典
-    analysis_results = {
-        'trade_analysis': {
-            'data': dataframe_to_safe_dict(trade_data),
-            'figures': ['trade_trends.png'],
-            'key_findings': [
-                '关税实施后贸易额显著下降',
-                '第一阶段协议后贸易额部分恢复',
-                '贸易差额变化趋势明显'
-            ]
-        },
-        'sentiment_analysis': {
-            'data': dataframe_to_safe_dict(sentiment_data),
-            'figures': ['consumer_confidence.png', 'sentiment_volatility.png'],
-            'key_findings': [
-                '关税事件后消费者信心明显下降',
-                '社交媒体负面情绪与市场波动性呈正相关',
-                '美国消费者对关税冲击的敏感度高于中国消费者'
-            ]
-        },
-        'regional_analysis': {
-            'data': dataframe_to_safe_dict(regional_data),
-            'figures': ['us_regional_growth.png', 'china_regional_growth.png'],
-            'key_findings': [
-                '贸易依赖度高的地区受关税冲击更严重',
-                '美国中西部地区失业率受影响最大',
-                '中国东部沿海地区增长率下降幅度最大'
-            ]
-        },
-        'strategic_analysis': {
-            'data': dataframe_to_safe_dict(strategic_data),
-            'figures': ['rare_earth_dependency.png', 'military_budgets.png', 'conflict_risk.png'],
-            'key_findings': [
-                '关税战期间美国减少对中国稀土依赖的趋势明显',
-                '双方军事预算在贸易摩擦期间均有增长',
-                '冲突风险与资源依赖度存在相关性'
-            ]
-        },
-        'regression_results': {
-            'tariff_elasticity': {
-                'coefficient': -0.32,
-                'std_error': 0.05,
-                'p_value': 0.001,
-                'r_squared': 0.56
-            },
-            'supply_chain_model': {
-                'migration_cost_coef': 0.68,
-                'time_lag_effect': 0.22,
-                'regional_variance': 0.15,
-                'r_squared': 0.48
-            },
-            'sentiment_effect': {
-                'confidence_to_consumption': 0.42,
-                'social_media_to_volatility': 0.39,
-                'granger_causality_p': 0.003
-            },
-            'conflict_risk': {
-                'resource_dependency_coef': 0.53,
-                'military_budget_effect': 0.25,
-                'economic_interdependence': -0.41,
-                'model_accuracy': 0.72
-            }
-        }
-    }
-    
-    # 保存为JSON文件
-    with open('analysis_results.json', 'w', encoding='utf-8') as f:
-        json.dump(analysis_results, f, ensure_ascii=False, indent=2, cls=DateTimeEncoder)
-    
-    # 保存Pickle文件 (包含完整数据)
-    with open('analysis_results.pkl', 'wb') as f:
-        pickle.dump({
-            'trade_data': trade_data,
-            'sentiment_data': sentiment_data,
-            'regional_data': regional_data,
-            'strategic_data': strategic_data,
-            'regression_results': analysis_results['regression_results']
-        }, f)
-    
-    print("分析结果已保存到analysis_results.json和analysis_results.pkl")
-    return analysis_results
-
-def main():
-    """主函数"""
-    print("开始生成模拟数据...")
-    
-    # 生成各类数据
-    trade_data = create_trade_data()
-    sentiment_data = create_sentiment_data()
-    regional_data = create_regional_data()
-    strategic_data = create_strategic_resources()
-    
-    # 合并结果
-    combine_results(trade_data, sentiment_data, regional_data, strategic_data)
-    
-    print("所有模拟数据生成完成！")
-
-if __name__ == "__main__":
-    main() 
\ No newline at end of file
@@ -1,455 +1,518 @@
-import pandas as pd
-import numpy as np
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+模拟数据生成引擎
+贸易、情感与信心指数、区域经济、战略资源四类模拟数据由同一套向量化模型生成，
+通过配置（profile）选择模型成分和输出内容：
+- full：趋势、周期、关税事件效应，附加市场波动性、军事预算和美国区域数据，输出图表和分析结果汇总
+- simple：趋势、周期和关税事件效应，只输出数据文件
+- minimal：各序列只有基准水平加随机扰动
+每个序列都是 基准水平 + 趋势 + 周期 + Σ事件效应 + 噪声，事件效应窗口以月为单位，
+按所选频率换算为期数，因此同一模型可生成日度、周度、月度或季度数据。
+随机数来自 code/crawlers/rng_service 的命名流，同一种子下各序列与配置和频率无关地可复现
+
+用法示例：
+    python create_simulation_data.py --profile simple --freq W --start 2018-01-01 --format parquet
+"""
+
+import argparse
 import json
 import os
-from datetime import datetime, timedelta
 import pickle
-import matplotlib
-matplotlib.use('Agg')  # 设置非交互式后端
-import matplotlib.pyplot as plt
-
-def create_output_folders():
-    """创建必要的输出文件夹"""
-    folders = ['figures', 'data']
-    for folder in folders:
-        os.makedirs(folder, exist_ok=True)
-
-def generate_trade_data():
-    """生成美中贸易数据"""
-    print("生成贸易数据...")
-    start_date = datetime(2017, 1, 1)
-    end_date = datetime(2025, 4, 30)
-    
-    dates = pd.date_range(start=start_date, end=end_date, freq='M')
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CRAWLER_DIR = os.path.join(BASE_DIR, 'code', 'crawlers')
+if CRAWLER_DIR not in sys.path:
+    sys.path.insert(0, CRAWLER_DIR)
+
+import data_store  # noqa: E402
+from rng_service import make_rng  # noqa: E402
+
+DATA_DIR = 'data'
+FIGURES_DIR = 'figures'
+START_DATE = '2017-01-01'
+END_DATE = '2025-04-30'
+
+# 频率 -> (pandas 日期偏移, 每月期数)；日期取各期期末，周度为周日
+FREQUENCIES = {
+    'D': (pd.offsets.Day(), 365.25 / 12),
+    'W': (pd.offsets.Week(weekday=6), 365.25 / 7 / 12),
+    'M': (pd.offsets.MonthEnd(), 1.0),
+    'Q': (pd.offsets.QuarterEnd(), 1 / 3),
+}
+
+# 模型成分：trend 线性趋势，cycle 周期波动，events 关税事件效应，extras 附加序列和美国区域
+PROFILES = {
+    'full': {'components': {'trend', 'cycle', 'events', 'extras'}, 'figures': True, 'report': True},
+    'simple': {'components': {'trend', 'cycle', 'events'}, 'figures': False, 'report': False},
+    'minimal': {'components': set(), 'figures': False, 'report': False},
+}
+
+# 关税事件
+TARIFF_EVENTS = {
+    'memo': '2018-03-22',        # 特朗普签署备忘录
+    'round1': '2018-07-06',      # 第一轮关税
+    'escalation': '2019-05-10',  # 关税提高
+    'phase_one': '2020-01-15',   # 第一阶段协议
+}
+# 图中以绿色标出的缓和事件
+EASING_EVENTS = {'phase_one'}
+
+# 事件效应形状：(事件, 形状, 幅度, 参数)，参数为衰减率（每月）或窗口长度（月）
+# decay: 幅度按 exp(-率×期) 衰减；recover: 幅度 × (1 - exp(-率×期))；
+# fade: 窗口内由幅度线性减到0；rise: 窗口内由0线性增到幅度；window: 窗口内恒为幅度；step: 此后恒为幅度
+EFFECT_KINDS = ['decay', 'recover', 'fade', 'rise', 'window', 'step']
+
+# 各数据表的序列设定：level 基准水平，noise 噪声标准差，trend 每年变化，
+# cycle (振幅, 周期月数, 相位)，events 事件效应，bounds 取值范围，extra 只在 extras 成分中生成
+TABLES = {
+    'trade': {
+        'exports': {
+            'level': 10000, 'noise': 500, 'trend': 240, 'cycle': (500, 12, 0), 'bounds': (0, None),
+            'events': [('round1', 'decay', -1500, 0.05), ('escalation', 'decay', -1000, 0.06),
+                       ('phase_one', 'recover', 800, 0.07)],
+        },
+        'imports': {
+            'level': 30000, 'noise': 800, 'trend': 360, 'cycle': (600, 12, 0), 'bounds': (0, None),
+            'events': [('round1', 'decay', -2500, 0.04), ('escalation', 'decay', -1800, 0.05),
+                       ('phase_one', 'recover', 1200, 0.06)],
+        },
+    },
+    'sentiment': {
+        'us_confidence': {
+            'level': 100, 'noise': 3,
+            'events': [('memo', 'fade', -2, 6), ('round1', 'fade', -5, 8), ('escalation', 'fade', -4, 7),
+                       ('phase_one', 'rise', 3, 10)],
+        },
+        'china_confidence': {
+            'level': 110, 'noise': 2,
+            'events': [('memo', 'fade', -1.5, 6), ('round1', 'fade', -3, 8), ('escalation', 'fade', -2.5, 7),
+                       ('phase_one', 'rise', 2, 10)],
+        },
+        'positive_sentiment': {
+            'level': 0.5, 'noise': 0.05, 'cycle': (0.1, 50, 0), 'bounds': (0, 1),
+            'events': [('memo', 'fade', -0.15, 5), ('round1', 'fade', -0.15, 5), ('escalation', 'fade', -0.15, 5),
+                       ('phase_one', 'rise', 0.1, 5)],
+        },
+        'negative_sentiment': {
+            'level': 0.3, 'noise': 0.05, 'cycle': (0.1, 50, np.pi), 'bounds': (0, 1),
+            'events': [('memo', 'fade', 0.2, 5), ('round1', 'fade', 0.2, 5), ('escalation', 'fade', 0.2, 5),
+                       ('phase_one', 'rise', -0.1, 5)],
+        },
+        'market_volatility': {
+            'level': 25, 'noise': 3, 'bounds': (0, 100), 'extra': True,
+            'events': [('memo', 'window', 15, 2), ('round1', 'window', 25, 3), ('escalation', 'window', 25, 3),
+                       ('phase_one', 'window', 15, 2)],
+        },
+    },
+    'strategic': {
+        'rare_earth_supply': {
+            'level': 15000, 'noise': 500, 'trend': 360, 'bounds': (0, None),
+            'events': [('round1', 'fade', -800, 6), ('escalation', 'fade', -1200, 8), ('phase_one', 'rise', 600, 10)],
+        },
+        'us_dependency': {
+            'level': 0.85, 'noise': 0.05, 'trend': -0.03, 'bounds': (0, 1),
+            'events': [('round1', 'fade', -0.05, 12), ('escalation', 'fade', -0.08, 15),
+                       ('phase_one', 'rise', 0.03, 10)],
+        },
+        'conflict_risk': {
+            'level': 0.2, 'noise': 0.05, 'cycle': (0.1, 100, 0), 'bounds': (0, 1),
+            'events': [('round1', 'fade', 0.15, 10), ('escalation', 'fade', 0.25, 12), ('phase_one', 'fade', -0.1, 8)],
+        },
+        'us_military_budget': {
+            'level': 700, 'noise': 10, 'trend': 18, 'extra': True,
+            'events': [('round1', 'step', 10, 0), ('escalation', 'step', 10, 0), ('phase_one', 'step', 10, 0)],
+        },
+        'china_military_budget': {
+            'level': 180, 'noise': 5, 'trend': 14.4, 'extra': True,
+            'events': [('round1', 'step', 5, 0), ('escalation', 'step', 5, 0), ('phase_one', 'step', 5, 0)],
+        },
+    },
+}
+
+# 区域经济：国家 -> 区域 -> 受关税影响系数
+REGIONS = {
+    'China': {'东北': 1.2, '华北': 1.2, '华东': 1.5, '华南': 1.5, '西南': 0.8, '西北': 0.8, '中部': 0.8},
+    'US': {'Northeast': 0.8, 'Midwest': 1.5, 'South': 1.0, 'West': 1.2},
+}
+# 各指标的区域基准水平抽样范围和年度噪声标准差（按国家）
+REGIONAL_INDICATORS = {
+    'gdp_growth': {'China': (5, 8), 'US': (2, 3), 'noise': 0.3},
+    'unemployment': {'China': (3, 5), 'US': (4, 5), 'noise': 0.2},
+    'trade_dependency': {'China': (20, 50), 'US': (40, 65), 'noise': 1.0},
+}
+# 关税年份效应（乘以区域影响系数）：年份 -> (增长率, 失业率, 贸易依赖度)，2020年之后沿用 'after'
+YEAR_EFFECTS = {
+    2018: (-0.5, 0.3, -2.0),
+    2019: (-0.8, 0.5, -3.0),
+    2020: (-0.6, 0.4, -2.5),
+    'after': (-0.3, 0.2, -1.5),
+}
+
+# 分析结果汇总（full 配置）中的回归结果和主要结论
+REGRESSION_RESULTS = {
+    'tariff_elasticity': {'coefficient': -0.32, 'std_error': 0.05, 'p_value': 0.001, 'r_squared': 0.56},
+    'supply_chain_model': {'migration_cost_coef': 0.68, 'time_lag_effect': 0.22, 'regional_variance': 0.15,
+                           'r_squared': 0.48},
+    'sentiment_effect': {'confidence_to_consumption': 0.42, 'social_media_to_volatility': 0.39,
+                         'granger_causality_p': 0.003},
+    'conflict_risk': {'resource_dependency_coef': 0.53, 'military_budget_effect': 0.25,
+                      'economic_interdependence': -0.41, 'model_accuracy': 0.72},
+}
+KEY_FINDINGS = {
+    'trade_analysis': ['关税实施后贸易额显著下降', '第一阶段协议后贸易额部分恢复', '贸易差额变化趋势明显'],
+    'sentiment_analysis': ['关税事件后消费者信心明显下降', '社交媒体负面情绪与市场波动性呈正相关',
+                           '美国消费者对关税冲击的敏感度高于中国消费者'],
+    'regional_analysis': ['贸易依赖度高的地区受关税冲击更严重', '美国中西部地区失业率受影响最大',
+                          '中国东部沿海地区增长率下降幅度最大'],
+    'strategic_analysis': ['关税战期间美国减少对中国稀土依赖的趋势明显', '双方军事预算在贸易摩擦期间均有增长',
+                           '冲突风险与资源依赖度存在相关性'],
+}
+
+# 输出文件：数据表 -> (逻辑文件名, 附带的CSV导出文件名, 图表)
+OUTPUTS = {
+    'trade': ('trade_data.csv', 'trade_analysis.csv', ['trade_trends.png']),
+    'sentiment': ('sentiment_data.csv', 'sentiment_analysis.csv',
+                  ['consumer_confidence.png', 'sentiment_volatility.png']),
+    'regional': ('regional_data.csv', None, ['us_regional_growth.png', 'china_regional_growth.png']),
+    'strategic': ('strategic_resources.csv', 'strategic_resources_analysis.csv',
+                  ['rare_earth_dependency.png', 'military_budgets.png', 'conflict_risk.png']),
+}
+
+def simulation_dates(start=START_DATE, end=END_DATE, freq='M'):
+    """
+    模拟数据的日期序列
+
+    Returns
+    -------
+    tuple
+        (pandas.DatetimeIndex, 距第一期的月数 ndarray, 每月期数)
+    """
+    offset, per_month = FREQUENCIES[freq]
+    dates = pd.date_range(start=start, end=end, freq=offset)
+    if len(dates) == 0:
+        raise ValueError(f"日期范围 {start} 至 {end} 内没有 {freq} 频率的日期")
+    months = (dates - dates[0]).days.to_numpy() / (365.25 / 12)
+    return dates, months, per_month
+
+def event_positions(dates, per_month, events=TARIFF_EVENTS):
+    """各事件在日期序列中的位置（最近的一期，可为负或超出序列长度）"""
+    first = dates[0]
+    return {name: int(np.rint((pd.Timestamp(date) - first).days / (365.25 / 12) * per_month))
+            for name, date in events.items()}
+
+def event_effect(n, effects, positions, per_month):
+    """
+    事件效应之和，所有事件 × 期 一次计算
+
+    Parameters
+    ----------
+    n : int
+        期数
+    effects : list of tuple
+        (事件, 形状, 幅度, 参数)，见 EFFECT_KINDS
+    positions : dict
+        事件 -> 所在位置（event_positions）
+    per_month : float
+        每月期数，用于换算衰减率和窗口长度
+
+    Returns
+    -------
+    numpy.ndarray
+        长度为 n 的效应序列
+    """
+    if not effects:
+        return np.zeros(n)
+    names, kinds, magnitudes, params = zip(*effects)
+    kind = np.array([EFFECT_KINDS.index(k) for k in kinds])[:, None]
+    magnitude = np.asarray(magnitudes, dtype=float)[:, None]
+    param = np.asarray(params, dtype=float)[:, None]
+
+    elapsed = np.arange(n)[None, :] - np.array([positions[name] for name in names])[:, None]
+    active = elapsed >= 0
+    steps = np.maximum(elapsed, 0)
+    rate = param / per_month
+    length = np.maximum(np.rint(param * per_month), 1)
+    ramp = steps / np.maximum(length - 1, 1)
+    in_window = active & (steps < length)
+
+    shapes = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4],
+        [np.exp(-rate * steps) * active, (1 - np.exp(-rate * steps)) * active,
+         (1 - ramp) * in_window, ramp * in_window, 1.0 * in_window],
+        default=1.0 * active,
+    )
+    return (magnitude * shapes).sum(axis=0)
+
+def simulate_table(table, dates, months, per_month, components, seed=None):
+    """
+    按 TABLES 中的序列设定生成一张数据表
+
+    Parameters
+    ----------
+    table : str
+        数据表名称（TABLES 的键）
+    dates : pandas.DatetimeIndex
+        日期序列
+    months : numpy.ndarray
+        各期距第一期的月数
+    per_month : float
+        每月期数
+    components : set of str
+        启用的模型成分
+    seed : int, optional
+        随机种子，默认使用根种子
+
+    Returns
+    -------
+    pandas.DataFrame
+        date 列加各序列
+    """
     n = len(dates)
-    
-    # 基础趋势
-    base_exports = 10000 + np.linspace(0, 2000, n) + np.random.normal(0, 500, n)
-    base_imports = 30000 + np.linspace(0, 3000, n) + np.random.normal(0, 800, n)
-    
-    # 关税冲击
-    tariff_events = [
-        datetime(2018, 7, 6),   # 第一轮关税
-        datetime(2019, 5, 10),  # 关税提高
-        datetime(2020, 1, 15),  # 第一阶段协议
-    ]
-    
-    exports = base_exports.copy()
-    imports = base_imports.copy()
-    
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        
-        if event_date == datetime(2018, 7, 6):
-            exports[event_idx:] -= 1500 * np.exp(-0.05 * np.arange(len(exports) - event_idx))
-            imports[event_idx:] -= 2500 * np.exp(-0.04 * np.arange(len(imports) - event_idx))
-        elif event_date == datetime(2019, 5, 10):
-            exports[event_idx:] -= 1000 * np.exp(-0.06 * np.arange(len(exports) - event_idx))
-            imports[event_idx:] -= 1800 * np.exp(-0.05 * np.arange(len(imports) - event_idx))
-        elif event_date == datetime(2020, 1, 15):
-            exports[event_idx:] += 800 * (1 - np.exp(-0.07 * np.arange(len(exports) - event_idx)))
-            imports[event_idx:] += 1200 * (1 - np.exp(-0.06 * np.arange(len(imports) - event_idx)))
-    
-    # 确保数据有意义
-    exports = np.maximum(exports, 0)
-    imports = np.maximum(imports, 0)
-    
-    trade_balance = exports - imports
-    
-    # 创建DataFrame
-    df = pd.DataFrame({
-        'date': dates,
-        'exports': exports,
-        'imports': imports,
-        'trade_balance': trade_balance
-    })
-    
-    # 保存数据
-    df.to_csv('data/trade_data.csv', index=False)
-    
-    # 创建图表
-    plt.figure(figsize=(12, 8))
-    plt.plot(dates, exports, label='对华出口')
-    plt.plot(dates, imports, label='从华进口')
-    plt.plot(dates, trade_balance, label='贸易差额')
-    plt.axvline(x=tariff_events[0], color='r', linestyle='--', alpha=0.7)
-    plt.axvline(x=tariff_events[1], color='r', linestyle='--', alpha=0.7)
-    plt.axvline(x=tariff_events[2], color='g', linestyle='--', alpha=0.7)
-    plt.title('百万美元：美中贸易数据趋势')
-    plt.xlabel('日期')
-    plt.ylabel('金额')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/trade_trends.png')
-    plt.close()
-    
-    print("已生成贸易数据")
-    
+    positions = event_positions(dates, per_month)
+    data = {'date': dates}
+    for column, spec in TABLES[table].items():
+        if spec.get('extra') and 'extras' not in components:
+            continue
+        rng = make_rng(seed, ('simulation', table, column))
+        values = spec['level'] + rng.normal(0, spec['noise'], n)
+        if 'trend' in components:
+            values += spec.get('trend', 0) * months / 12
+        if 'cycle' in components and 'cycle' in spec:
+            amplitude, period, phase = spec['cycle']
+            values += amplitude * np.sin(2 * np.pi * months / period + phase)
+        if 'events' in components:
+            values += event_effect(n, spec.get('events', []), positions, per_month)
+        low, high = spec.get('bounds', (None, None))
+        data[column] = np.clip(values, low, high) if low is not None or high is not None else values
+    df = pd.DataFrame(data)
+    if table == 'trade':
+        df['trade_balance'] = df['exports'] - df['imports']
     return df
 
-def generate_sentiment_data():
-    """生成消费信心和社交媒体情感数据"""
-    print("生成情感和信心指数数据...")
-    start_date = datetime(2017, 1, 1)
-    end_date = datetime(2025, 4, 30)
-    
-    dates = pd.date_range(start=start_date, end=end_date, freq='M')
-    n = len(dates)
-    
-    # 基础消费信心指数
-    us_confidence = 100 + np.random.normal(0, 3, n)
-    china_confidence = 110 + np.random.normal(0, 2, n)
-    
-    # 关税事件影响
-    tariff_events = [
-        datetime(2018, 3, 22),  # 特朗普签署备忘录
-        datetime(2018, 7, 6),   # 第一轮关税
-        datetime(2019, 5, 10),  # 关税提高
-        datetime(2020, 1, 15),  # 第一阶段协议
-    ]
-    
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        
-        if event_date == datetime(2018, 3, 22):
-            us_confidence[event_idx:event_idx+6] -= np.linspace(2, 0, 6)
-            china_confidence[event_idx:event_idx+6] -= np.linspace(1.5, 0, 6)
-        elif event_date == datetime(2018, 7, 6):
-            us_confidence[event_idx:event_idx+8] -= np.linspace(5, 0, 8)
-            china_confidence[event_idx:event_idx+8] -= np.linspace(3, 0, 8)
-        elif event_date == datetime(2019, 5, 10):
-            us_confidence[event_idx:event_idx+7] -= np.linspace(4, 0, 7)
-            china_confidence[event_idx:event_idx+7] -= np.linspace(2.5, 0, 7)
-        elif event_date == datetime(2020, 1, 15):
-            us_confidence[event_idx:event_idx+10] += np.linspace(0, 3, 10)
-            china_confidence[event_idx:event_idx+10] += np.linspace(0, 2, 10)
-    
-    # 社交媒体情感
-    positive_sentiment = 0.5 + 0.1 * np.sin(np.linspace(0, 4*np.pi, n)) + np.random.normal(0, 0.05, n)
-    negative_sentiment = 0.3 + 0.1 * np.sin(np.linspace(0, 4*np.pi, n) + np.pi) + np.random.normal(0, 0.05, n)
-    
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        
-        if event_date == datetime(2018, 3, 22) or event_date == datetime(2018, 7, 6) or event_date == datetime(2019, 5, 10):
-            positive_sentiment[event_idx:event_idx+5] -= np.linspace(0.15, 0, 5)
-            negative_sentiment[event_idx:event_idx+5] += np.linspace(0.2, 0, 5)
-        elif event_date == datetime(2020, 1, 15):
-            positive_sentiment[event_idx:event_idx+5] += np.linspace(0, 0.1, 5)
-            negative_sentiment[event_idx:event_idx+5] -= np.linspace(0, 0.1, 5)
-    
-    # 确保数据有意义
-    positive_sentiment = np.clip(positive_sentiment, 0, 1)
-    negative_sentiment = np.clip(negative_sentiment, 0, 1)
-    
-    # 创建DataFrame
-    sentiment_df = pd.DataFrame({
-        'date': dates,
-        'us_confidence': us_confidence,
-        'china_confidence': china_confidence,
-        'positive_sentiment': positive_sentiment,
-        'negative_sentiment': negative_sentiment
-    })
-    
-    # 保存数据
-    sentiment_df.to_csv('data/sentiment_data.csv', index=False)
-    
-    # 创建消费者信心趋势图
-    plt.figure(figsize=(12, 6))
-    plt.plot(dates, us_confidence, label='美国消费者信心指数')
-    plt.plot(dates, china_confidence, label='中国消费者信心指数')
-    for event_date in tariff_events:
-        if event_date == datetime(2020, 1, 15):
-            plt.axvline(x=event_date, color='g', linestyle='--', alpha=0.7)
-        else:
-            plt.axvline(x=event_date, color='r', linestyle='--', alpha=0.7)
-    plt.title('消费者信心指数趋势')
-    plt.xlabel('日期')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/consumer_confidence.png')
-    plt.close()
-    
-    # 创建情感与市场波动关系图
-    plt.figure(figsize=(12, 6))
-    plt.plot(dates, positive_sentiment, label='积极情感')
-    plt.plot(dates, negative_sentiment, label='消极情感')
-    for event_date in tariff_events:
-        if event_date == datetime(2020, 1, 15):
-            plt.axvline(x=event_date, color='g', linestyle='--', alpha=0.7)
-        else:
-            plt.axvline(x=event_date, color='r', linestyle='--', alpha=0.7)
-    plt.title('社交媒体情感指数与市场波动性')
-    plt.xlabel('日期')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/sentiment_volatility.png')
-    plt.close()
-    
-    print("已生成情感数据")
-    
-    return sentiment_df
-
-def generate_regional_data():
-    """生成区域经济数据"""
-    print("生成区域经济数据...")
-    regions = ["东北", "华北", "华东", "华南", "西南", "西北", "中部"]
-    years = list(range(2017, 2026))
-    
-    gdp_growth = {}
-    unemployment = {}
-    trade_dependency = {}
-    
-    for region in regions:
-        base_growth = np.random.uniform(5, 8)
-        base_unemployment = np.random.uniform(3, 5)
-        base_dependency = np.random.uniform(20, 50)
-        
-        # 不同地区受关税影响程度不同
-        if region in ["华东", "华南"]:
-            impact_factor = 1.5
-        elif region in ["东北", "华北"]:
-            impact_factor = 1.2
-        else:
-            impact_factor = 0.8
-        
-        gdp_growth[region] = []
-        unemployment[region] = []
-        trade_dependency[region] = []
-        
-        for year in years:
-            if year == 2018:
-                growth = base_growth - impact_factor * 0.5 + np.random.normal(0, 0.3)
-                unemp = base_unemployment + impact_factor * 0.3 + np.random.normal(0, 0.2)
-                depend = base_dependency - impact_factor * 2 + np.random.normal(0, 1)
-            elif year == 2019:
-                growth = base_growth - impact_factor * 0.8 + np.random.normal(0, 0.3)
-                unemp = base_unemployment + impact_factor * 0.5 + np.random.normal(0, 0.2)
-                depend = base_dependency - impact_factor * 3 + np.random.normal(0, 1)
-            elif year == 2020:
-                growth = base_growth - impact_factor * 0.6 + np.random.normal(0, 0.3)
-                unemp = base_unemployment + impact_factor * 0.4 + np.random.normal(0, 0.2)
-                depend = base_dependency - impact_factor * 2.5 + np.random.normal(0, 1)
-            elif year > 2020:
-                growth = base_growth - impact_factor * 0.3 + np.random.normal(0, 0.3)
-                unemp = base_unemployment + impact_factor * 0.2 + np.random.normal(0, 0.2)
-                depend = base_dependency - impact_factor * 1.5 + np.random.normal(0, 1)
-            else:
-                growth = base_growth + np.random.normal(0, 0.3)
-                unemp = base_unemployment + np.random.normal(0, 0.2)
-                depend = base_dependency + np.random.normal(0, 1)
-            
-            gdp_growth[region].append(max(growth, 0))
-            unemployment[region].append(max(unemp, 0))
-            trade_dependency[region].append(max(depend, 0))
-    
-    # 创建字典格式的数据
-    regional_data = {
-        "regions": regions,
-        "years": years,
-        "gdp_growth": gdp_growth,
-        "unemployment": unemployment,
-        "trade_dependency": trade_dependency
-    }
-    
-    # 保存数据
-    with open('data/regional_data.json', 'w', encoding='utf-8') as f:
-        json.dump(regional_data, f, ensure_ascii=False, indent=2)
-    
-    # 创建美国区域增长图
-    plt.figure(figsize=(12, 8))
-    for i, region in enumerate(['东部', '中部', '西部', '南部']):
-        plt.plot(years, [5+i*0.2-0.3*int(year>2018)-0.5*int(year>2019)+0.2*int(year>2020) for year in years], 
-                 label=region)
-    plt.title('增长率：美国各区域')
-    plt.xlabel('年份')
-    plt.ylabel('GDP增长率(%)')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/us_regional_growth.png')
-    plt.close()
-    
-    # 创建中国区域增长图
-    plt.figure(figsize=(12, 8))
-    for region in regions:
-        plt.plot(years, gdp_growth[region], label=region)
-    plt.title('增长率：中国各区域')
-    plt.xlabel('年份')
-    plt.ylabel('GDP增长率(%)')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/china_regional_growth.png')
-    plt.close()
-    
-    print("已生成区域经济数据")
-    
-    return regional_data
-
-def generate_strategic_resources():
-    """生成战略资源数据"""
-    print("生成战略资源数据...")
-    start_date = datetime(2017, 1, 1)
-    end_date = datetime(2025, 4, 30)
-    
-    dates = pd.date_range(start=start_date, end=end_date, freq='M')
-    n = len(dates)
-    
-    # 中国稀土供应
-    base_supply = 15000 + np.linspace(0, 3000, n) + np.random.normal(0, 500, n)
-    
-    # 美国对中国依赖度
-    base_dependency = 0.85 - np.linspace(0, 0.25, n) + np.random.normal(0, 0.05, n)
-    
-    # 关税事件影响
-    tariff_events = [
-        datetime(2018, 7, 6),   # 第一轮关税
-        datetime(2019, 5, 10),  # 关税提高
-        datetime(2020, 1, 15),  # 第一阶段协议
-    ]
-    
-    supply = base_supply.copy()
-    dependency = base_dependency.copy()
-    
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        
-        if event_date == datetime(2018, 7, 6):
-            supply[event_idx:event_idx+6] -= np.linspace(800, 0, 6)
-            dependency[event_idx:event_idx+12] -= np.linspace(0.05, 0, 12)
-        elif event_date == datetime(2019, 5, 10):
-            supply[event_idx:event_idx+8] -= np.linspace(1200, 0, 8)
-            dependency[event_idx:event_idx+15] -= np.linspace(0.08, 0, 15)
-        elif event_date == datetime(2020, 1, 15):
-            supply[event_idx:event_idx+10] += np.linspace(0, 600, 10)
-            dependency[event_idx:event_idx+10] += np.linspace(0, 0.03, 10)
-    
-    # 冲突风险指数
-    base_risk = 0.2 + 0.1 * np.sin(np.linspace(0, 2*np.pi, n)) + np.random.normal(0, 0.05, n)
-    risk = base_risk.copy()
-    
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        
-        if event_date == datetime(2018, 7, 6):
-            risk[event_idx:event_idx+10] += np.linspace(0.15, 0, 10)
-        elif event_date == datetime(2019, 5, 10):
-            risk[event_idx:event_idx+12] += np.linspace(0.25, 0, 12)
-        elif event_date == datetime(2020, 1, 15):
-            risk[event_idx:event_idx+8] -= np.linspace(0.1, 0, 8)
-    
-    # 确保数据有意义
-    supply = np.maximum(supply, 0)
-    dependency = np.clip(dependency, 0, 1)
-    risk = np.clip(risk, 0, 1)
-    
-    # 创建DataFrame
-    strategic_df = pd.DataFrame({
-        'date': dates,
-        'rare_earth_supply': supply,
-        'us_dependency': dependency,
-        'conflict_risk': risk
-    })
-    
-    # 保存数据
-    strategic_df.to_csv('data/strategic_resources.csv', index=False)
-    
-    # 创建稀土依赖关系图
-    plt.figure(figsize=(12, 8))
-    plt.plot(dates, supply/1000, label='中国稀土供应(千吨)')
-    plt.plot(dates, dependency, label='美国对华依赖度')
-    for event_date in tariff_events:
-        if event_date == datetime(2020, 1, 15):
-            plt.axvline(x=event_date, color='g', linestyle='--', alpha=0.7)
-        else:
-            plt.axvline(x=event_date, color='r', linestyle='--', alpha=0.7)
-    plt.title('供应指数与依赖度')
-    plt.xlabel('日期')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/rare_earth_dependency.png')
-    plt.close()
-    
-    # 创建军事预算图
-    plt.figure(figsize=(12, 8))
-    us_budget = 700 + np.linspace(0, 150, len(dates)) + np.random.normal(0, 10, len(dates))
-    china_budget = 180 + np.linspace(0, 120, len(dates)) + np.random.normal(0, 5, len(dates))
-    for event_date in tariff_events:
-        event_idx = min(range(len(dates)), key=lambda i: abs(dates[i] - event_date))
-        us_budget[event_idx:] += 10
-        china_budget[event_idx:] += 5
-    
-    plt.plot(dates, us_budget, label='美国(十亿美元)')
-    plt.plot(dates, china_budget, label='中国')
-    plt.title('军事预算')
-    plt.xlabel('日期')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/military_budgets.png')
-    plt.close()
-    
-    # 创建冲突风险图
-    plt.figure(figsize=(12, 8))
-    plt.plot(dates, risk, label='美中冲突风险指数')
-    for event_date in tariff_events:
-        if event_date == datetime(2020, 1, 15):
-            plt.axvline(x=event_date, color='g', linestyle='--', alpha=0.7)
-        else:
-            plt.axvline(x=event_date, color='r', linestyle='--', alpha=0.7)
-    plt.title('风险指数')
-    plt.xlabel('日期')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.savefig('figures/conflict_risk.png')
-    plt.close()
-    
-    print("已生成战略资源数据")
-    
-    return strategic_df
-
-def save_to_pickle(trade_data, sentiment_data, regional_data, strategic_data):
-    """直接将数据保存到pickle文件"""
-    print("保存数据...")
-    
-    # 为CSV导出准备数据
-    trade_data_csv = trade_data.copy()
-    sentiment_data_csv = sentiment_data.copy()
-    strategic_data_csv = strategic_data.copy()
-    
-    trade_data_csv['date'] = trade_data_csv['date'].dt.strftime('%Y-%m-%d')
-    sentiment_data_csv['date'] = sentiment_data_csv['date'].dt.strftime('%Y-%m-%d')
-    strategic_data_csv['date'] = strategic_data_csv['date'].dt.strftime('%Y-%m-%d')
-    
-    trade_data_csv.to_csv('data/trade_analysis.csv', index=False)
-    sentiment_data_csv.to_csv('data/sentiment_analysis.csv', index=False)
-    strategic_data_csv.to_csv('data/strategic_resources_analysis.csv', index=False)
-    
-    # 保存pickle文件
-    with open('data/all_data.pkl', 'wb') as f:
+def simulate_regional(years, components, seed=None):
+    """
+    生成区域经济数据（区域 × 年份）
+
+    Parameters
+    ----------
+    years : list of int
+        年份
+    components : set of str
+        启用的模型成分；events 时加入关税年份效应，extras 时加入美国区域
+    seed : int, optional
+        随机种子
+
+    Returns
+    -------
+    pandas.DataFrame
+        year、country、region、gdp_growth、unemployment、trade_dependency 列
+    """
+    years = np.asarray(years)
+    keys = [key for key in YEAR_EFFECTS if key != 'after']
+    after = np.asarray(YEAR_EFFECTS['after'])
+    effects = np.array([YEAR_EFFECTS[y] if y in YEAR_EFFECTS else
+                        (after if y > max(keys) else np.zeros(3)) for y in years])
+    if 'events' not in components:
+        effects = np.zeros_like(effects)
+
+    frames = []
+    countries = ['China', 'US'] if 'extras' in components else ['China']
+    for country in countries:
+        regions = list(REGIONS[country])
+        impact = np.array([REGIONS[country][r] for r in regions])
+        rng = make_rng(seed, ('simulation', 'regional', country))
+        columns = {}
+        for i, (indicator, spec) in enumerate(REGIONAL_INDICATORS.items()):
+            low, high = spec[country]
+            base = rng.uniform(low, high, len(regions))[:, None]
+            noise = rng.normal(0, spec['noise'], (len(regions), len(years)))
+            columns[indicator] = np.maximum(base + impact[:, None] * effects[None, :, i] + noise, 0).ravel()
+        frames.append(pd.DataFrame({
+            'year': np.tile(years, len(regions)),
+            'country': country,
+            'region': np.repeat(regions, len(years)),
+            **columns,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def regional_dict(regional, country='China'):
+    """区域数据的字典格式（regional_data.json）：regions、years 和各指标 区域 -> 年度列表"""
+    table = regional[regional['country'] == country]
+    regions = list(dict.fromkeys(table['region']))
+    result = {'regions': regions, 'years': sorted(int(y) for y in table['year'].unique())}
+    for indicator in REGIONAL_INDICATORS:
+        wide = table.pivot(index='region', columns='year', values=indicator).loc[regions]
+        result[indicator] = {region: [float(v) for v in row] for region, row in zip(regions, wide.to_numpy())}
+    return result
+
+def generate(profile='full', start=START_DATE, end=END_DATE, freq='M', seed=None):
+    """
+    按配置生成全部模拟数据
+
+    Returns
+    -------
+    dict
+        trade、sentiment、regional、strategic 四张表
+    """
+    components = PROFILES[profile]['components']
+    dates, months, per_month = simulation_dates(start, end, freq)
+    data = {table: simulate_table(table, dates, months, per_month, components, seed=seed) for table in TABLES}
+    data['regional'] = simulate_regional(sorted(set(dates.year)), components, seed=seed)
+    return {table: data[table] for table in OUTPUTS}
+
+def save_outputs(data, data_dir=DATA_DIR):
+    """
+    保存数据文件：各表按当前存储格式保存，另导出日期为文本的CSV、
+    区域数据的字典格式 regional_data.json 和全部数据的 all_data.pkl
+
+    Returns
+    -------
+    list of str
+        写出的文件路径
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = []
+    for table, (artifact, export, _) in OUTPUTS.items():
+        df = data[table]
+        paths.append(data_store.save_table(df, data_dir, artifact))
+        if export is not None:
+            path = os.path.join(data_dir, export)
+            df.assign(date=df['date'].dt.strftime('%Y-%m-%d')).to_csv(path, index=False)
+            paths.append(path)
+
+    path = os.path.join(data_dir, 'regional_data.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(regional_dict(data['regional']), f, ensure_ascii=False, indent=2)
+    paths.append(path)
+
+    path = os.path.join(data_dir, 'all_data.pkl')
+    with open(path, 'wb') as f:
         pickle.dump({
-            'trade_data': trade_data,
-            'sentiment_data': sentiment_data,
-            'regional_data': regional_data,
-            'strategic_data': strategic_data
+            'trade_data': data['trade'],
+            'sentiment_data': data['sentiment'],
+            'regional_data': regional_dict(data['regional']),
+            'strategic_data': data['strategic'],
         }, f)
-    
-    print("所有数据已保存到 data/all_data.pkl")
-    print("各子分析CSV文件已保存到data目录")
+    paths.append(path)
+    return paths
+
+def save_report(data, data_dir=DATA_DIR):
+    """保存分析结果汇总 analysis_results.json 和 analysis_results.pkl（full 配置）"""
+    def records(df):
+        if 'date' in df.columns:
+            df = df.assign(date=df['date'].dt.strftime('%Y-%m-%d'))
+        return df.to_dict(orient='list')
+
+    results = {}
+    for table, key in (('trade', 'trade_analysis'), ('sentiment', 'sentiment_analysis'),
+                       ('regional', 'regional_analysis'), ('strategic', 'strategic_analysis')):
+        results[key] = {'data': records(data[table]), 'figures': OUTPUTS[table][2], 'key_findings': KEY_FINDINGS[key]}
+    results['regression_results'] = REGRESSION_RESULTS
+
+    json_path = os.path.join(data_dir, 'analysis_results.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    pkl_path = os.path.join(data_dir, 'analysis_results.pkl')
+    with open(pkl_path, 'wb') as f:
+        pickle.dump({**{f'{table}_data': data[table] for table in OUTPUTS},
+                     'regression_results': REGRESSION_RESULTS}, f)
+    return [json_path, pkl_path]
+
+def save_figures(data, figures_dir=FIGURES_DIR):
+    """绘制各数据表的趋势图（full 配置），关税事件以竖线标出"""
+    try:
+        import matplotlib
+    except ImportError:
+        raise ImportError("full 配置绘制图表需要安装 matplotlib: pip install matplotlib") from None
+    matplotlib.use('Agg')  # 设置非交互式后端
+    import matplotlib.pyplot as plt
 
-def main():
+    def line_chart(table, columns, title, filename, scale=None, ylabel=None):
+        df = data[table]
+        plt.figure(figsize=(12, 6))
+        for column, label in columns.items():
+            values = df[column] / scale[column] if scale and column in scale else df[column]
+            plt.plot(df['date'], values, label=label)
+        for name, date in TARIFF_EVENTS.items():
+            if df['date'].iloc[0] <= pd.Timestamp(date) <= df['date'].iloc[-1]:
+                plt.axvline(x=pd.Timestamp(date), color='g' if name in EASING_EVENTS else 'r',
+                            linestyle='--', alpha=0.7)
+        plt.title(title)
+        plt.xlabel('日期')
+        if ylabel:
+            plt.ylabel(ylabel)
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plt.savefig(os.path.join(figures_dir, filename))
+        plt.close()
+
+    def regional_chart(country, title, filename):
+        table = data['regional']
+        table = table[table['country'] == country]
+        if table.empty:
+            return
+        plt.figure(figsize=(12, 8))
+        for region, rows in table.groupby('region', sort=False):
+            plt.plot(rows['year'], rows['gdp_growth'], marker='o', label=region)
+        plt.title(title)
+        plt.xlabel('年份')
+        plt.ylabel('GDP增长率(%)')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plt.savefig(os.path.join(figures_dir, filename))
+        plt.close()
+
+    os.makedirs(figures_dir, exist_ok=True)
+    line_chart('trade', {'exports': '对华出口', 'imports': '从华进口', 'trade_balance': '贸易差额'},
+               '美中贸易数据趋势', 'trade_trends.png', ylabel='百万美元')
+    line_chart('sentiment', {'us_confidence': '美国消费者信心指数', 'china_confidence': '中国消费者信心指数'},
+               '消费者信心指数趋势', 'consumer_confidence.png')
+    line_chart('sentiment', {'positive_sentiment': '积极情感', 'negative_sentiment': '消极情感'},
+               '社交媒体情感指数与市场波动性', 'sentiment_volatility.png')
+    regional_chart('US', '美国各区域GDP增长率', 'us_regional_growth.png')
+    regional_chart('China', '中国各区域GDP增长率', 'china_regional_growth.png')
+    line_chart('strategic', {'rare_earth_supply': '中国稀土供应(千吨)', 'us_dependency': '美国对华依赖度'},
+               '稀土供应与依赖度', 'rare_earth_dependency.png', scale={'rare_earth_supply': 1000})
+    if 'us_military_budget' in data['strategic'].columns:
+        line_chart('strategic', {'us_military_budget': '美国', 'china_military_budget': '中国'},
+                   '美中军事预算', 'military_budgets.png', ylabel='十亿美元')
+    line_chart('strategic', {'conflict_risk': '美中冲突风险指数'}, '美中冲突风险指数', 'conflict_risk.png')
+
+def main(argv=None):
     """主函数"""
-    print("开始生成模拟数据...")
-    create_output_folders()
-    
-    # 生成各类数据并获取返回值
-    trade_data = generate_trade_data()
-    sentiment_data = generate_sentiment_data()
-    regional_data = generate_regional_data()
-    strategic_data = generate_strategic_resources()
-    
-    # 保存所有数据
-    save_to_pickle(trade_data, sentiment_data, regional_data, strategic_data)
-    
+    parser = argparse.ArgumentParser(description='生成中美关税战模拟数据')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='full', help='模拟配置（默认 full）')
+    parser.add_argument('--freq', choices=list(FREQUENCIES), default='M', help='日期频率（默认 M 月度）')
+    parser.add_argument('--start', default=START_DATE, help=f'开始日期（默认 {START_DATE}）')
+    parser.add_argument('--end', default=END_DATE, help=f'结束日期（默认 {END_DATE}）')
+    parser.add_argument('--format', choices=list(data_store.STORAGE_FORMATS), default='csv',
+                        help='数据表存储格式（默认 csv）')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--data-dir', default=DATA_DIR, help=f'数据输出目录（默认 {DATA_DIR}）')
+    parser.add_argument('--figures-dir', default=FIGURES_DIR, help=f'图表输出目录（默认 {FIGURES_DIR}）')
+    args = parser.parse_args(argv)
+
+    data_store.configure(format=args.format)
+    profile = PROFILES[args.profile]
+    print(f"开始生成模拟数据（配置: {args.profile}，频率: {args.freq}，{args.start} 至 {args.end}）...")
+
+    data = generate(args.profile, args.start, args.end, args.freq, seed=args.seed)
+    paths = save_outputs(data, args.data_dir)
+    if profile['report']:
+        paths += save_report(data, args.data_dir)
+    if profile['figures']:
+        save_figures(data, args.figures_dir)
+        print(f"图表已保存到 {args.figures_dir} 目录")
+
+    for path in paths:
+        print(f"  {path}")
     print("所有模拟数据生成完成！")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""测试公共设置：爬虫模块以 code/crawlers 为导入路径（与 run_all_crawlers 相同）"""
+
+import os
+import sys
+
+CRAWLER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'code', 'crawlers')
+if CRAWLER_DIR not in sys.path:
+    sys.path.insert(0, CRAWLER_DIR)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
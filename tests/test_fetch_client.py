@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+fetch_client 的离线测试：
+- 录制好的缓存目录（fixtures/http_cache）在 CRAWLER_OFFLINE=1 下直接作为数据源
+- 条件请求（304）、Retry-After 重试和 404 由本机 127.0.0.1 上的测试服务器应答，不访问外网
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import FIXTURE_DIR
+from fetch_client import FetchClient, FetchError, new_session
+
+FIXTURE_CACHE = os.path.join(FIXTURE_DIR, 'http_cache')
+FIXTURE_URL = 'https://ustr.gov/issue-areas/enforcement/section-301-investigations/tariff-actions'
+
+class Handler(BaseHTTPRequestHandler):
+    """/doc 带 ETag（验证器匹配时返回304）；/busy 第一次返回 503 + Retry-After；其他路径 404"""
+
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        if self.path == '/doc':
+            if self.headers.get('If-None-Match') == '"doc-v1"':
+                self._send(304)
+            else:
+                self._send(200, b'tariff list', {'ETag': '"doc-v1"'})
+        elif self.path == '/busy':
+            if self.server.hits[self.path] == 1:
+                self._send(503, b'busy', {'Retry-After': '0'})
+            else:
+                self._send(200, b'ready')
+        else:
+            self._send(404, b'not found')
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.hits = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.delenv('CRAWLER_OFFLINE', raising=False)
+    # 退避基数很大：若未遵循 Retry-After，重试前会等待数秒
+    session = new_session()
+    session.trust_env = False
+    with FetchClient(cache_dir=str(tmp_path), backoff=10.0, session=session) as client:
+        yield client
+
+def base_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+def test_offline_serves_fixture_cache(monkeypatch):
+    monkeypatch.setenv('CRAWLER_OFFLINE', '1')
+    client = FetchClient(cache_dir=FIXTURE_CACHE)
+    assert client.offline
+
+    page = client.get(FIXTURE_URL)
+    assert page['from_cache']
+    assert page['status'] == 200
+    assert b'2018-13248.pdf' in page['content']
+    assert page['headers']['ETag'] == '"list1-v1"'
+
+    with pytest.raises(FetchError):
+        client.get(FIXTURE_URL + '/missing')
+
+def test_revalidates_with_etag(server, client):
+    url = base_url(server) + '/doc'
+    first = client.get(url)
+    assert not first['from_cache']
+    assert first['content'] == b'tariff list'
+
+    second = client.get(url)
+    assert server.hits['/doc'] == 2
+    assert second['from_cache']
+    assert second['content'] == b'tariff list'
+    assert second['sha256'] == first['sha256']
+
+def test_retries_after_retry_after(server, client):
+    start = time.perf_counter()
+    page = client.get(base_url(server) + '/busy')
+    assert page['content'] == b'ready'
+    assert server.hits['/busy'] == 2
+    assert time.perf_counter() - start < 2.0
+
+def test_not_found_is_not_retried(server, client):
+    with pytest.raises(FetchError, match='404'):
+        client.get(base_url(server) + '/missing')
+    assert server.hits['/missing'] == 1
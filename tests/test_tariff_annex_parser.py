@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""tariff_annex_parser 对常见附件版式的解析：财政部 序号 / 税则号列 / 商品名称 三栏、USTR 带点税号和税率单元格"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tariff_annex_parser import HS_LINE, parse_annex, parse_rates
+
+def parse(path, **kwargs):
+    return pd.concat(list(parse_annex(str(path), **kwargs)), ignore_index=True)
+
+@pytest.mark.parametrize('line, code, rest', [
+    ('   1   02011000   牛肉', '02011000', '牛肉'),
+    ('  12   0201.10.00 整头及半头鲜或冷藏牛肉', '0201.10.00', '整头及半头鲜或冷藏牛肉'),
+    ('8414.59.10 Fans of a kind used for cooling', '8414.59.10', 'Fans of a kind used for cooling'),
+    ('8703.23.01 15 passenger motor vehicles', '8703.23.01', '15 passenger motor vehicles'),
+    ('8414 59 10   Fans', '8414 59 10', 'Fans'),
+    ('8414591000 Fans', '8414591000', 'Fans'),
+])
+def test_hs_line(line, code, rest):
+    assert HS_LINE.match(line).groups() == (code, rest)
+
+@pytest.mark.parametrize('line', ['2019', '  第 3 页', '8414 5910 Fans', '注：以上税号为2018年版'])
+def test_hs_line_rejects(line):
+    assert HS_LINE.match(line) is None
+
+def test_parse_rates():
+    rates = parse_rates(['25%（2019年6月1日起）', '10%→25%', '加征25%', '25％', '5%或10%', 0.25, '5', None, '另行公布'])
+    expected = [25, 25, 25, 25, 10, 25, 5, np.nan, np.nan]
+    np.testing.assert_array_equal(rates.to_numpy(dtype=float), np.array(expected, dtype=float))
+
+def test_mof_text_annex(tmp_path):
+    path = tmp_path / 'annex1.txt'
+    path.write_text('\n'.join([
+        '附件1',
+        '序号   税则号列     商品名称                          加征税率',
+        '   1   02011000     整头及半头鲜或冷藏牛肉            25%（2019年6月1日起）',
+        '   2   02012000     鲜或冷藏的带骨牛肉                25%',
+        '   3   0203.11.10   鲜或冷藏的整头及半头乳猪肉',
+        '                    （不含野猪）                      10%',
+        '   - 1 -',
+    ]), encoding='utf-8')
+    lines = parse(path, round=5, implementation_date='2019-06-01')
+    assert lines['hs_code'].tolist() == ['02011000', '02012000', '02031110']
+    assert lines['additional_tariff_rate'].tolist() == [25.0, 25.0, 10.0]
+    assert lines['product_description'].tolist() == ['整头及半头鲜或冷藏牛肉', '鲜或冷藏的带骨牛肉',
+                                                     '鲜或冷藏的整头及半头乳猪肉 （不含野猪）']
+    assert (lines['round'] == 5).all()
+
+def test_ustr_text_annex_keeps_description_numbers(tmp_path):
+    path = tmp_path / 'list3.txt'
+    path.write_text('\n'.join([
+        '8703.23.01 15 passenger motor vehicles',
+        '8414.59.10 Fans of a kind used for cooling 25%',
+    ]), encoding='utf-8')
+    lines = parse(path, rate=10)
+    assert lines['hs_code'].tolist() == ['87032301', '84145910']
+    assert lines['product_description'].tolist() == ['15 passenger motor vehicles', 'Fans of a kind used for cooling']
+    assert lines['additional_tariff_rate'].tolist() == [10.0, 25.0]
+
+def test_mof_csv_annex(tmp_path):
+    path = tmp_path / 'annex2.csv'
+    path.write_text('\n'.join([
+        '附件2：对原产于美国的部分进口商品加征关税清单',
+        '序号,税则号列,商品名称,加征税率',
+        '1,02011000,整头及半头鲜或冷藏牛肉,25%（2019年6月1日起）',
+        '2,1012100,改良种用马,10%',
+        '小计,,,',
+    ]), encoding='gb18030')
+    lines = parse(path, round=5)
+    assert lines['hs_code'].tolist() == ['02011000', '01012100']
+    assert lines['product_description'].tolist() == ['整头及半头鲜或冷藏牛肉', '改良种用马']
+    assert lines['additional_tariff_rate'].tolist() == [25.0, 10.0]